@@ -0,0 +1,99 @@
+from collections import OrderedDict
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import talib as ta
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IndicatorCache:
+    """LRU cache of TA-Lib results shared by strategies and analyzers."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory cap for cached indicator arrays.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(arrays: list) -> tuple:
+        """Hash the contents of the input arrays.
+
+        Args:
+            arrays: List of float64 NumPy arrays.
+
+        Returns:
+            Tuple of (length, digest) identifying the inputs.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).data)
+        return len(arrays[0]), digest.hexdigest()
+
+    def get(self, name: str, *inputs, **params):
+        """Return a TA-Lib indicator, computing it only on a cache miss.
+
+        Args:
+            name: TA-Lib function name (e.g., 'SMA', 'RSI', 'MACD').
+            *inputs: Input Series or arrays (e.g., high, low, close).
+            **params: Indicator parameters (e.g., timeperiod=14).
+
+        Returns:
+            Series (or tuple of Series for multi-output indicators) aligned with
+            the first input's index.
+        """
+        arrays = [np.asarray(x, dtype=np.float64) for x in inputs]
+        key = (name, self.fingerprint(arrays), tuple(sorted(params.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            result = entry[0]
+        else:
+            result = getattr(ta, name)(*arrays, **params)
+            outputs = result if isinstance(result, tuple) else (result,)
+            for output in outputs:
+                output.setflags(write=False)
+            self._store(key, result, sum(output.nbytes for output in outputs))
+        index = getattr(inputs[0], "index", None)
+        if isinstance(result, tuple):
+            return tuple(pd.Series(output, index=index) for output in result)
+        return pd.Series(result, index=index)
+
+    def _store(self, key: tuple, result, nbytes: int):
+        """Insert a result and evict least recently used entries over the cap."""
+        with self._lock:
+            self.misses += 1
+            if key in self._entries or nbytes > self.max_bytes:
+                return
+            self._entries[key] = (result, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        logger.debug("Cached %s (%d bytes, %d entries)", key[0], nbytes, len(self._entries))
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and memory usage."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._entries), "nbytes": self.nbytes}
+
+    def clear(self):
+        """Drop all cached results and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = self.hits = self.misses = 0
+
+indicator_cache = IndicatorCache()
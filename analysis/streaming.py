@@ -0,0 +1,170 @@
+from collections import deque
+import math
+
+class StreamingSMA:
+    """Simple moving average updated in O(1) per bar (matches ta.SMA)."""
+
+    def __init__(self, period: int):
+        """Initialize the window.
+
+        Args:
+            period: Number of bars in the average.
+        """
+        self.period = period
+        self.value = math.nan
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current average (NaN while warming up)."""
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(x)
+        self._sum += x
+        if len(self._window) == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+class StreamingEMA:
+    """Exponential moving average seeded with an SMA (matches ta.EMA)."""
+
+    def __init__(self, period: int):
+        """Initialize the average.
+
+        Args:
+            period: EMA period.
+        """
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.value = math.nan
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a value and return the current average (NaN while warming up)."""
+        self._count += 1
+        if self._count < self.period:
+            self._sum += x
+        elif self._count == self.period:
+            self.value = (self._sum + x) / self.period
+        else:
+            self.value += self.k * (x - self.value)
+        return self.value
+
+class StreamingRSI:
+    """Wilder's Relative Strength Index (matches ta.RSI)."""
+
+    def __init__(self, period: int = 14):
+        """Initialize the smoothed gain/loss state.
+
+        Args:
+            period: RSI period.
+        """
+        self.period = period
+        self.value = math.nan
+        self._prev = None
+        self._count = 0
+        self._gain = 0.0
+        self._loss = 0.0
+
+    def update(self, x: float) -> float:
+        """Add a close and return the current RSI (NaN while warming up)."""
+        if self._prev is None:
+            self._prev = x
+            return self.value
+        diff = x - self._prev
+        self._prev = x
+        gain, loss = max(diff, 0.0), max(-diff, 0.0)
+        self._count += 1
+        if self._count <= self.period:
+            self._gain += gain
+            self._loss += loss
+            if self._count < self.period:
+                return self.value
+            self._gain /= self.period
+            self._loss /= self.period
+        else:
+            self._gain = (self._gain * (self.period - 1) + gain) / self.period
+            self._loss = (self._loss * (self.period - 1) + loss) / self.period
+        total = self._gain + self._loss
+        self.value = 100.0 * self._gain / total if total else 0.0
+        return self.value
+
+class StreamingMACD:
+    """MACD line, signal and histogram (matches ta.MACD)."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        """Initialize the component EMAs.
+
+        Args:
+            fast_period: Fast EMA period.
+            slow_period: Slow EMA period.
+            signal_period: Signal line period.
+        """
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.k_fast = 2.0 / (fast_period + 1)
+        self.k_slow = 2.0 / (slow_period + 1)
+        self.signal = StreamingEMA(signal_period)
+        self.value = (math.nan, math.nan, math.nan)
+        self._fast = math.nan
+        self._slow = math.nan
+        self._count = 0
+        self._sum = 0.0
+        self._recent = deque(maxlen=fast_period)
+
+    def update(self, x: float) -> tuple:
+        """Add a close and return (macd, signal, hist), NaN while warming up."""
+        self._count += 1
+        if self._count < self.slow_period:
+            self._sum += x
+            self._recent.append(x)
+            return self.value
+        if self._count == self.slow_period:
+            # TA-Lib seeds both EMAs on the same bar: the fast one from its own
+            # trailing window rather than from the first fast_period closes.
+            self._recent.append(x)
+            self._slow = (self._sum + x) / self.slow_period
+            self._fast = sum(self._recent) / self.fast_period
+            self._recent.clear()
+        else:
+            self._fast += self.k_fast * (x - self._fast)
+            self._slow += self.k_slow * (x - self._slow)
+        macd = self._fast - self._slow
+        signal = self.signal.update(macd)
+        if not math.isnan(signal):
+            self.value = (macd, signal, macd - signal)
+        return self.value
+
+class StreamingATR:
+    """Wilder's Average True Range (matches ta.ATR)."""
+
+    def __init__(self, period: int = 14):
+        """Initialize the true range state.
+
+        Args:
+            period: ATR period.
+        """
+        self.period = period
+        self.value = math.nan
+        self._prev_close = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add a bar and return the current ATR (NaN while warming up)."""
+        if self._prev_close is None:
+            self._prev_close = close
+            return self.value
+        true_range = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._count += 1
+        if self._count < self.period:
+            self._sum += true_range
+        elif self._count == self.period:
+            self.value = (self._sum + true_range) / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
@@ -1,5 +1,5 @@
-import talib as ta
 import pandas as pd
+from .cache import indicator_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,7 +18,7 @@ class TechnicalAnalyzer:
             Series with ATR values.
         """
         try:
-            atr = ta.ATR(data["high"], data["low"], data["close"], timeperiod=period)
+            atr = indicator_cache.get("ATR", data["high"], data["low"], data["close"], timeperiod=period)
             logger.debug("Calculated ATR for %d periods", period)
             return atr
         except Exception as e:
@@ -36,7 +36,7 @@ class TechnicalAnalyzer:
             Series with RSI values.
         """
         try:
-            rsi = ta.RSI(data["close"], timeperiod=period)
+            rsi = indicator_cache.get("RSI", data["close"], timeperiod=period)
             logger.debug("Calculated RSI for %d periods", period)
             return rsi
         except Exception as e:
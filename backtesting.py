@@ -1,26 +1,256 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import backtrader as bt
+import numpy as np
+import pandas as pd
+from strategies.base import generate_signal_matrix
+import logging
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CASH = 10000.0
+COMMISSION = 0.000005  # Base Solana fee
+SLIPPAGE = 0.005  # 0.5% slippage
+ORDER_SIZE = 0.1
 
 class Backtester:
-    def __init__(self):
-        self.cerebro = bt.Cerebro()
-        self.cerebro.broker.set_cash(10000.0)
-        self.cerebro.broker.setcommission(commission=0.000005)  # Base Solana fee
-        self.cerebro.broker.set_slippage(perc=0.005)  # 0.5% slippage
+    def __init__(self, engine: str = "backtrader"):
+        """Initialize the backtester.
+
+        Args:
+            engine: 'backtrader' for the event-driven Cerebro path or 'vector'
+                for the NumPy array engine.
+        """
+        if engine not in ("backtrader", "vector"):
+            raise ValueError(f"Unknown backtest engine: {engine}")
+        self.engine = engine
+        if engine == "backtrader":
+            self.cerebro = bt.Cerebro()
+            self.cerebro.broker.set_cash(INITIAL_CASH)
+            self.cerebro.broker.setcommission(commission=COMMISSION)
+            self.cerebro.broker.set_slippage_perc(perc=SLIPPAGE)
 
     def run(self, data, strategy):
+        if self.engine == "vector":
+            return self._run_vector(data, strategy)
+
         class BTStrategy(bt.Strategy):
             def __init__(self):
                 self.strategy = strategy
-                self.signals = self.strategy.generate_signals(data)
+                self.signals = buy_signals(self.strategy, data)
                 self.signal_idx = 0
 
             def next(self):
                 if self.signal_idx < len(self.signals) and self.signals.iloc[self.signal_idx]:
-                    self.buy(size=0.1)
+                    self.buy(size=ORDER_SIZE)
                 self.signal_idx += 1
 
         bt_data = bt.feeds.PandasData(dataname=data)
         self.cerebro.adddata(bt_data)
         self.cerebro.addstrategy(BTStrategy)
         self.cerebro.run()
-        return {"final_value": self.cerebro.broker.getvalue()}
\ No newline at end of file
+        return {"final_value": self.cerebro.broker.getvalue()}
+
+    def _run_vector(self, data: pd.DataFrame, strategy) -> dict:
+        """Run the backtest as array operations over the whole frame.
+
+        Mirrors the backtrader path: a signal on bar i buys ORDER_SIZE at the
+        open of bar i+1 plus slippage (capped at that bar's high), pays the
+        percentage commission, and orders that would overdraw the cash left
+        after earlier accepted orders are dropped.
+
+        Args:
+            data: DataFrame with 'close' and optionally 'open'/'high' columns.
+            strategy: Strategy instance.
+
+        Returns:
+            Dictionary with the final value and the per-bar equity curve.
+        """
+        matrix = generate_signal_matrix(data, [strategy])
+        return simulate(matrix.buy[:, 0], data, matrix.size[:, 0])
+
+    def run_many(self, data: pd.DataFrame, strategies) -> pd.Series:
+        """Backtest several strategies on the same data in one vectorized pass.
+
+        Args:
+            data: DataFrame with 'close' and optionally 'open'/'high' columns.
+            strategies: Strategy instances.
+
+        Returns:
+            Series of final values, one per strategy in order, named by class.
+        """
+        matrix = generate_signal_matrix(data, strategies)
+        return pd.Series(simulate(matrix.buy, data, matrix.size)["final_value"], index=matrix.names)
+
+
+def buy_signals(strategy, data: pd.DataFrame) -> pd.Series:
+    """Return per-bar buy signals for a strategy.
+
+    Strategies whose generate_signals only scores the latest bar (such as
+    MomentumStrategy) expose the full series via generate_signal_series.
+    """
+    generate = getattr(strategy, "generate_signal_series", strategy.generate_signals)
+    return generate(data)
+
+def simulate(signals: np.ndarray, data: pd.DataFrame, size: np.ndarray = None) -> dict:
+    """Compute fills, costs and the equity curve for a buy-signal array.
+
+    Args:
+        signals: Boolean buy signals, positionally aligned with data. A 2-D
+            (bars, strategies) matrix simulates every column at once.
+        data: DataFrame with 'close' and optionally 'open'/'high' columns.
+        size: Order size multipliers shaped like signals (1 if None).
+
+    Returns:
+        Dictionary with 'final_value', 'equity_curve' (Series on data.index)
+        and 'trades' (number of accepted fills). For 2-D signals these are
+        arrays with one value per strategy and a DataFrame with one column
+        per strategy.
+    """
+    n = len(data)
+    signals = np.asarray(signals, dtype=bool)
+    columns = signals.reshape(len(signals), -1)
+    close = data["close"].to_numpy(dtype=np.float64)[:, None]
+    opens = data["open"].to_numpy(dtype=np.float64)[:, None] if "open" in data else close
+    highs = data["high"].to_numpy(dtype=np.float64)[:, None] if "high" in data else None
+
+    sig = np.zeros((n, columns.shape[1]), dtype=bool)
+    m = min(n, len(columns))
+    sig[:m] = columns[:m]
+    units = np.full(sig.shape, ORDER_SIZE)
+    if size is not None:
+        units[:m] *= np.asarray(size, dtype=np.float64).reshape(len(columns), -1)[:m]
+
+    # Orders submitted on bar i fill on bar i+1; the last bar's order never fills.
+    filled = np.zeros_like(sig)
+    filled[1:] = sig[:-1]
+    order_units = np.zeros_like(units)
+    order_units[1:] = units[:-1]
+    price = opens * (1 + SLIPPAGE)
+    if highs is not None:
+        price = np.minimum(price, highs)
+    cost = np.where(filled, order_units * price * (1 + COMMISSION), 0.0)
+    accepted = filled.copy()
+    if (cost.sum(axis=0) > INITIAL_CASH).any():
+        # Some order is unaffordable: scan the fill bars, deducting only accepted orders from cash
+        remaining = np.full(cost.shape[1], INITIAL_CASH)
+        for i in np.flatnonzero(filled.any(axis=1)):
+            accepted[i] &= cost[i] <= remaining
+            remaining -= np.where(accepted[i], cost[i], 0.0)
+    cost = np.where(accepted, cost, 0.0)
+
+    cash = INITIAL_CASH - np.cumsum(cost, axis=0)
+    position = np.cumsum(np.where(accepted, order_units, 0.0), axis=0)
+    equity = cash + position * close
+    final_value = equity[-1] if n else np.full(columns.shape[1], INITIAL_CASH)
+    trades = accepted.sum(axis=0)
+    if signals.ndim == 2:
+        return {"final_value": final_value, "equity_curve": pd.DataFrame(equity, index=data.index),
+                "trades": trades}
+    return {"final_value": float(final_value[0]), "equity_curve": pd.Series(equity[:, 0], index=data.index),
+            "trades": int(trades[0])}
+
+def _backtest_token(token: str, data: pd.DataFrame, strategies: dict, engine: str) -> list:
+    """Run every strategy on one token's data (executed in a worker process)."""
+    rows = []
+    for name, strategy in strategies.items():
+        row = {"token": token, "strategy": name}
+        try:
+            # A fresh Backtester per pair: Cerebro accumulates data and strategies
+            result = Backtester(engine=engine).run(data, strategy)
+            row["final_value"] = result["final_value"]
+            row["profit"] = result["final_value"] - INITIAL_CASH
+            if "equity_curve" in result:
+                equity = result["equity_curve"].to_numpy()
+                row["max_drawdown"] = float((1 - equity / np.maximum.accumulate(equity)).max())
+            row["error"] = None
+        except Exception as e:
+            row["error"] = repr(e)
+        rows.append(row)
+    return rows
+
+class BatchBacktester:
+    """Backtests many tokens against many strategies on a process pool.
+
+    Workers are spawned rather than forked, so callers with running threads
+    (e.g. the token monitor) can use the pool safely. A single pending token
+    is backtested in-process, where the vector engine beats pool startup.
+    """
+
+    COLUMNS = ["token", "strategy", "final_value", "profit", "max_drawdown", "error"]
+
+    def __init__(self, engine: str = "vector", max_workers: int = None, checkpoint: str = None):
+        """Initialize the runner.
+
+        Args:
+            engine: Backtest engine for every pair ('vector' or 'backtrader').
+            max_workers: Number of worker processes (defaults to all cores).
+            checkpoint: CSV file results are appended to as tokens finish; pairs
+                already in it are skipped, so an interrupted run resumes.
+        """
+        if engine not in ("backtrader", "vector"):
+            raise ValueError(f"Unknown backtest engine: {engine}")
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count()
+        self.checkpoint = checkpoint
+
+    def run(self, datasets: dict, strategies, progress=None) -> pd.DataFrame:
+        """Backtest every token against every strategy.
+
+        Each task covers one token, so its data is sent to a worker once and
+        reused for all strategies.
+
+        Args:
+            datasets: Mapping of token address to historical data.
+            strategies: Strategy instances, as a list or a mapping of name to
+                instance (list entries are named after their class).
+            progress: Callable invoked with (tokens done, tokens total).
+
+        Returns:
+            DataFrame with one row per (token, strategy) pair and columns
+            token, strategy, final_value, profit, max_drawdown and error.
+        """
+        if not isinstance(strategies, dict):
+            strategies = {type(strategy).__name__: strategy for strategy in strategies}
+        done = self._load_checkpoint()
+        finished = set(zip(done["token"], done["strategy"]))
+        pending = {token: {name: s for name, s in strategies.items() if (token, name) not in finished}
+                   for token in datasets}
+        pending = {token: todo for token, todo in pending.items() if todo}
+        total = len(pending)
+        logger.info("Backtesting %d tokens x %d strategies on %d workers (%d pairs already done)",
+                    total, len(strategies), self.max_workers, len(finished))
+        frames = [done]
+        if total == 1 or (pending and self.max_workers == 1):
+            for count, (token, todo) in enumerate(pending.items(), 1):
+                frames.append(self._finish(_backtest_token(token, datasets[token], todo, self.engine)))
+                if progress:
+                    progress(count, total)
+        elif pending:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, total),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(_backtest_token, token, datasets[token], todo, self.engine)
+                           for token, todo in pending.items()]
+                for count, future in enumerate(as_completed(futures), 1):
+                    frames.append(self._finish(future.result()))
+                    if progress:
+                        progress(count, total)
+        results = pd.concat(frames, ignore_index=True)
+        results = results[results["token"].isin(list(datasets)) & results["strategy"].isin(list(strategies))]
+        return results.sort_values(["token", "strategy"], ignore_index=True)
+
+    def _finish(self, rows: list) -> pd.DataFrame:
+        rows = pd.DataFrame(rows, columns=self.COLUMNS)
+        self._save_checkpoint(rows)
+        return rows
+
+    def _load_checkpoint(self) -> pd.DataFrame:
+        if self.checkpoint and os.path.exists(self.checkpoint):
+            return pd.read_csv(self.checkpoint, dtype={"token": str, "strategy": str, "error": object})
+        return pd.DataFrame(columns=self.COLUMNS)
+
+    def _save_checkpoint(self, rows: pd.DataFrame):
+        if self.checkpoint:
+            header = not os.path.exists(self.checkpoint)
+            rows.to_csv(self.checkpoint, mode="a", header=header, index=False)
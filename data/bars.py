@@ -0,0 +1,120 @@
+import math
+import numpy as np
+import pandas as pd
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+def _bar_ids(kind: str, size, timestamps: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Assign each trade to a bar.
+
+    Time bars bucket trades by timestamp, tick bars by trade count and volume
+    bars by the cumulative volume traded before each trade.
+    """
+    if kind == "time":
+        return timestamps // pd.Timedelta(size).value
+    if kind == "tick":
+        return np.arange(len(timestamps)) // int(size)
+    if kind == "volume":
+        volume_before = np.r_[0.0, np.cumsum(volume)[:-1]]
+        return np.floor(volume_before / size).astype(np.int64)
+    raise ValueError(f"Unknown bar type: {kind}")
+
+def aggregate_trades(trades: pd.DataFrame, kind: str = "time", size="1min") -> pd.DataFrame:
+    """Aggregate raw trades into OHLCV bars in one vectorized pass.
+
+    Args:
+        trades: DataFrame indexed by timestamp with 'close' (trade price) and
+            'volume' columns, e.g. from HistoricalDataFetcher.
+        kind: 'time', 'tick' or 'volume'.
+        size: Bar length for time bars (e.g. '1s', '1min', '5min'), trades per
+            bar for tick bars, or volume per bar for volume bars.
+
+    Returns:
+        DataFrame of bars indexed by each bar's opening timestamp with
+        open/high/low/close/volume columns; intervals without trades are skipped.
+    """
+    if trades.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], name="timestamp"))
+    trades = trades.sort_index(kind="stable")
+    index = pd.DatetimeIndex(trades.index)
+    price = trades["close"].to_numpy(dtype=np.float64)
+    volume = trades["volume"].to_numpy(dtype=np.float64)
+    ids = _bar_ids(kind, size, index.as_unit("ns").asi8, volume)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)] - 1
+    if kind == "time":
+        labels = pd.DatetimeIndex(ids[starts] * pd.Timedelta(size).value)
+        if index.tz is not None:
+            labels = labels.tz_localize("UTC").tz_convert(index.tz)
+    else:
+        labels = index[starts]
+    bars = pd.DataFrame({
+        "open": price[starts],
+        "high": np.maximum.reduceat(price, starts),
+        "low": np.minimum.reduceat(price, starts),
+        "close": price[ends],
+        "volume": np.add.reduceat(volume, starts),
+    }, index=pd.DatetimeIndex(labels, name="timestamp"))
+    return bars
+
+class BarAggregator:
+    """Incremental trade-to-bar aggregator for live ticks.
+
+    Produces the same bars as aggregate_trades fed with the same trades.
+    """
+
+    def __init__(self, kind: str = "time", size="1min"):
+        """Initialize the aggregator.
+
+        Args:
+            kind: 'time', 'tick' or 'volume'.
+            size: Bar size as in aggregate_trades.
+        """
+        if kind not in ("time", "tick", "volume"):
+            raise ValueError(f"Unknown bar type: {kind}")
+        self.kind = kind
+        self.size = pd.Timedelta(size).value if kind == "time" else size
+        self.current = None
+        self._bar_id = None
+        self._count = 0
+        self._cum_volume = 0.0
+
+    def update(self, timestamp, price: float, volume: float) -> dict:
+        """Add one trade in O(1).
+
+        Args:
+            timestamp: Trade timestamp.
+            price: Trade price.
+            volume: Trade volume.
+
+        Returns:
+            The bar completed by this trade as a dict, or None if the current bar
+            is still open.
+        """
+        timestamp = pd.Timestamp(timestamp)
+        if self.kind == "time":
+            bar_id = timestamp.value // self.size
+        elif self.kind == "tick":
+            bar_id = self._count // int(self.size)
+        else:
+            bar_id = math.floor(self._cum_volume / self.size)
+        self._count += 1
+        self._cum_volume += volume
+        completed = None
+        if bar_id != self._bar_id:
+            completed = self.current
+            label = pd.Timestamp(bar_id * self.size, tz=timestamp.tz) if self.kind == "time" else timestamp
+            self.current = {"timestamp": label, "open": price, "high": price, "low": price,
+                            "close": price, "volume": 0.0}
+            self._bar_id = bar_id
+        bar = self.current
+        bar["high"] = max(bar["high"], price)
+        bar["low"] = min(bar["low"], price)
+        bar["close"] = price
+        bar["volume"] += volume
+        return completed
+
+    def flush(self) -> dict:
+        """Close and return the open bar (None if there is none)."""
+        completed, self.current, self._bar_id = self.current, None, None
+        return completed
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+class PriceBuffer:
+    """Fixed-capacity ring buffer of price bars backed by NumPy arrays.
+
+    Every bar is written twice, at slot i and i + capacity, so the most recent
+    bars always occupy one contiguous slice and can be returned without copying.
+    """
+
+    FIELDS = ("close", "high", "low", "volume")
+
+    def __init__(self, capacity: int = 1440):
+        """Preallocate storage.
+
+        Args:
+            capacity: Maximum number of bars kept (older bars are overwritten).
+        """
+        self.capacity = capacity
+        self._values = np.full((2 * capacity, len(self.FIELDS)), np.nan)
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def append(self, timestamp, close: float, high: float = None, low: float = None, volume: float = 0.0):
+        """Add one bar, overwriting the oldest once full.
+
+        Args:
+            timestamp: Bar timestamp.
+            close: Close price.
+            high: High price (defaults to close).
+            low: Low price (defaults to close).
+            volume: Traded volume.
+        """
+        row = (close, close if high is None else high, close if low is None else low, volume)
+        ts = pd.Timestamp(timestamp).value
+        for slot in (self._head, self._head + self.capacity):
+            self._values[slot] = row
+            self._timestamps[slot] = ts
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, data: pd.DataFrame):
+        """Append every row of a DataFrame with a timestamp index.
+
+        Args:
+            data: DataFrame with 'close' and optional 'high', 'low', 'volume' columns.
+        """
+        close = data["close"].to_numpy(dtype=np.float64)
+        high = data["high"].to_numpy(dtype=np.float64) if "high" in data else close
+        low = data["low"].to_numpy(dtype=np.float64) if "low" in data else close
+        volume = data["volume"].to_numpy(dtype=np.float64) if "volume" in data else np.zeros(len(data))
+        for i, timestamp in enumerate(data.index[-self.capacity:], start=max(len(data) - self.capacity, 0)):
+            self.append(timestamp, close[i], high[i], low[i], volume[i])
+
+    def _window(self, n: int = None) -> slice:
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        return slice(end - n, end)
+
+    def array(self, field: str, n: int = None) -> np.ndarray:
+        """Return a read-only view of one field for the last n bars.
+
+        Args:
+            field: One of FIELDS.
+            n: Number of bars (all stored bars if None).
+
+        Returns:
+            1-D NumPy view, oldest first.
+        """
+        view = self._values[self._window(n), self.FIELDS.index(field)]
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.array(field)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """Timestamps of all stored bars, oldest first."""
+        return pd.DatetimeIndex(self._timestamps[self._window()].view("datetime64[ns]"))
+
+    def view(self, n: int = None) -> pd.DataFrame:
+        """Return the last n bars as a DataFrame sharing the buffer's memory.
+
+        Args:
+            n: Number of bars (all stored bars if None).
+
+        Returns:
+            DataFrame indexed by timestamp with FIELDS as columns.
+        """
+        window = self._window(n)
+        index = pd.DatetimeIndex(self._timestamps[window].view("datetime64[ns]"), name="timestamp")
+        return pd.DataFrame(self._values[window], index=index, columns=list(self.FIELDS), copy=False)
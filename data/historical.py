@@ -1,32 +1,58 @@
+import asyncio
 import pandas as pd
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
 from config import Config
+from .bars import aggregate_trades
+from .store import TradeStore
+from .transport import AsyncHTTPClient, default_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+TRADES_QUERY = """
+query($token: String!, $dex: String!, $since: DateTime!, $till: DateTime!, $offset: Int!) {
+    Solana {
+        DEXTrades(
+            where: { Trade: { Currency: { MintAddress: { is: $token } }, Dex: { ProtocolName: { is: $dex } } },
+                     Block: { Time: { since: $since, before: $till } } }
+            orderBy: { %s: Block_Time }
+            limit: { count: 1000, offset: $offset }
+        ) {
+            Block { Time }
+            Transaction { Signature }
+            Instruction { Index }
+            Trade { Price Amount }
+        }
+    }
+}
+"""
+
 class HistoricalDataFetcher:
     """Fetches historical market data for Solana tokens from Bitquery."""
     
-    def __init__(self, config: Config):
+    PAGE_SIZE = 1000  # Matches the limit in TRADES_QUERY
+    
+    def __init__(self, config: Config, http: AsyncHTTPClient = None, store: TradeStore = None):
         """Initialize fetcher with configuration.
         
         Args:
             config: Config object with BITQUERY_API_KEY.
+            http: Shared async HTTP client (a rate-limited one is created if None).
+            store: Local trade store for incremental fetches (optional).
         """
         self.config = config
-        self.bitquery_url = "[invalid url, do not cite]
-        self.transport = RequestsHTTPTransport(
-            url=self.bitquery_url,
-            headers={"X-API-KEY": self.config.BITQUERY_API_KEY}
-        )
-        self.client = Client(transport=self.transport)
+        self.bitquery_url = "https://streaming.bitquery.io/eap"
+        self.headers = {"X-API-KEY": self.config.BITQUERY_API_KEY}
+        self.http = http or default_client()
+        self.store = store
         logger.info("Initialized Bitquery client for historical data")
     
-    def get_data(self, token_address: str, dex: str = "raydium") -> pd.DataFrame:
+    async def get_data(self, token_address: str, dex: str = "raydium") -> pd.DataFrame:
         """Fetch historical trade data for a Solana token.
         
+        With a store configured, only trades from the stored high-water mark on
+        are downloaded (oldest first, so repeated calls catch up without gaps)
+        and the merged stored history is returned.
+        
         Args:
             token_address: Token mint address.
             dex: DEX name ('raydium' or 'pump').
@@ -34,34 +60,136 @@ class HistoricalDataFetcher:
         Returns:
             DataFrame with historical price and volume data.
         """
-        query = gql("""
-        query($token: String!, $dex: String!) {
-            Solana {
-                DEXTrades(
-                    where: { Trade: { Currency: { MintAddress: { is: $token } }, Dex: { ProtocolName: { is: $dex } } } }
-                    orderBy: { descending: Block_Time }
-                    limit: { count: 1000 }
-                ) {
-                    Block { Time }
-                    Trade { Price Amount }
-                }
-            }
-        }
-        """)
+        if self.store is None:
+            return await self._fetch_trades(token_address, dex)
+        since = self.store.high_water(token_address, dex)
+        df = await self._fetch_trades(token_address, dex, since)
+        self.store.write(token_address, dex, df)
+        stored = self.store.read(token_address, dex)
+        logger.info("Loaded %d stored trades for token %s on %s (%d new)", len(stored), token_address, dex, len(df))
+        return stored
+    
+    async def get_bars(self, token_address: str, dex: str = "raydium", kind: str = "time", size="1min") -> pd.DataFrame:
+        """Fetch historical trades and aggregate them into OHLCV bars.
+        
+        Args:
+            token_address: Token mint address.
+            dex: DEX name ('raydium' or 'pump').
+            kind: 'time', 'tick' or 'volume' bars.
+            size: Bar size (see data.bars.aggregate_trades).
+        
+        Returns:
+            DataFrame with open/high/low/close/volume bars.
+        """
+        return aggregate_trades(await self.get_data(token_address, dex), kind, size)
+    
+    async def iter_pages(self, token_address: str, dex: str = "raydium", start=None, end=None,
+                         window: pd.Timedelta = pd.Timedelta(hours=1), concurrency: int = 4):
+        """Stream trades for a time range page by page.
+        
+        The range is split into windows fetched concurrently (the shared HTTP
+        client enforces the Bitquery rate limit); each window is paged by offset.
+        Pages are yielded as they arrive, so at most a few are held in memory.
+        
+        Args:
+            token_address: Token mint address.
+            dex: DEX name ('raydium' or 'pump').
+            start: Start of the range (defaults to one day before end).
+            end: End of the range, exclusive (defaults to now).
+            window: Length of each concurrently fetched window.
+            concurrency: Maximum windows fetched at once.
+        
+        Yields:
+            DataFrames of up to PAGE_SIZE trades, oldest first within each window.
+        """
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz="UTC")
+        start = pd.Timestamp(start) if start is not None else end - pd.Timedelta(days=1)
+        edges = list(pd.date_range(start, end, freq=window))
+        if edges[-1] < end:
+            edges.append(end)
+        queue = asyncio.Queue(maxsize=2 * concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_window(since, till):
+            async with semaphore:
+                offset = 0
+                while True:
+                    page = await self._fetch_page(token_address, dex, since, till, "ascending", offset)
+                    if not page.empty:
+                        await queue.put(page)
+                    if len(page) < self.PAGE_SIZE:
+                        return
+                    offset += self.PAGE_SIZE
+        
+        windows = [asyncio.create_task(fetch_window(since, till)) for since, till in zip(edges, edges[1:])]
+        
+        async def fetch_all():
+            try:
+                await asyncio.gather(*windows)
+                await queue.put(None)
+            except Exception as e:
+                for task in windows:  # gather leaves the other windows running
+                    task.cancel()
+                await queue.put(e)
+        
+        producer = asyncio.create_task(fetch_all())
+        try:
+            while (page := await queue.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            for task in windows + [producer]:
+                task.cancel()
+            await asyncio.gather(*windows, producer, return_exceptions=True)
+    
+    async def backfill(self, token_address: str, dex: str = "raydium", start=None, end=None, **kwargs) -> int:
+        """Download a time range of trades straight into the store.
+        
+        Args:
+            token_address: Token mint address.
+            dex: DEX name ('raydium' or 'pump').
+            start: Start of the range.
+            end: End of the range (defaults to now).
+            **kwargs: Passed to iter_pages (window, concurrency).
+        
+        Returns:
+            Number of trades downloaded.
+        """
+        if self.store is None:
+            raise ValueError("backfill requires a TradeStore")
+        count = 0
+        async for page in self.iter_pages(token_address, dex, start, end, **kwargs):
+            self.store.write(token_address, dex, page)
+            count += len(page)
+        logger.info("Backfilled %d trades for token %s on %s", count, token_address, dex)
+        return count
+    
+    async def _fetch_trades(self, token_address: str, dex: str, since: pd.Timestamp = None) -> pd.DataFrame:
+        """Fetch one page of trades: the latest ones, or the first ones from since."""
         try:
-            result = self.client.execute(query, variable_values={"token": token_address, "dex": dex})
-            trades = result["Solana"]["DEXTrades"]
-            df = pd.DataFrame([
-                {
-                    "timestamp": pd.to_datetime(trade["Block"]["Time"]),
-                    "close": trade["Trade"]["Price"],
-                    "volume": trade["Trade"]["Amount"]
-                }
-                for trade in trades
-            ])
-            df.set_index("timestamp", inplace=True)
+            order = "ascending" if since is not None else "descending"
+            since = since if since is not None else pd.Timestamp(0, tz="UTC")
+            df = await self._fetch_page(token_address, dex, since, pd.Timestamp.now(tz="UTC"), order)
             logger.info("Fetched %d historical trades for token %s on %s", len(df), token_address, dex)
             return df
         except Exception as e:
             logger.error("Failed to fetch historical data for %s: %s", token_address, e)
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+    
+    async def _fetch_page(self, token_address: str, dex: str, since: pd.Timestamp, till: pd.Timestamp,
+                          order: str, offset: int = 0) -> pd.DataFrame:
+        """Fetch up to PAGE_SIZE trades in [since, till)."""
+        variables = {"token": token_address, "dex": dex, "since": since.isoformat(),
+                     "till": till.isoformat(), "offset": offset}
+        result = await self.http.graphql(self.bitquery_url, TRADES_QUERY % order, variables, headers=self.headers)
+        trades = result["Solana"]["DEXTrades"]
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime([trade["Block"]["Time"] for trade in trades], utc=True),
+            "close": [trade["Trade"]["Price"] for trade in trades],
+            "volume": [trade["Trade"]["Amount"] for trade in trades],
+            # A swap is identified by its transaction and instruction, not its time/price/size
+            "trade_id": ["%s:%s" % (trade["Transaction"]["Signature"], trade["Instruction"]["Index"])
+                         for trade in trades],
+        })
+        return df.set_index("timestamp")
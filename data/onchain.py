@@ -1,7 +1,9 @@
-from solana.rpc.async_api import AsyncClient
-from solana.publickey import PublicKey
+import asyncio
+from collections import OrderedDict
 import pandas as pd
 from config import Config
+from .bars import aggregate_trades
+from .transport import AsyncHTTPClient
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,19 +11,32 @@ logger = logging.getLogger(__name__)
 class OnchainDataFetcher:
     """Fetches on-chain data from Solana blockchain."""
     
-    def __init__(self, config: Config):
-        """Initialize fetcher with Solana RPC client.
+    def __init__(self, config: Config, http: AsyncHTTPClient = None, batch_size: int = 20,
+                 concurrency: int = 4, cache_size: int = 10000):
+        """Initialize fetcher with Solana RPC settings.
         
         Args:
-            config: Config object with Solana RPC settings.
+            config: Config object with SOLANA_RPC_URL.
+            http: Shared async HTTP client (one is created if None).
+            batch_size: Transactions requested per JSON-RPC batch.
+            concurrency: Maximum batches in flight at once.
+            cache_size: Number of parsed signatures kept in the LRU cache.
         """
         self.config = config
-        self.client = AsyncClient("https://api.mainnet-beta.solana.com")
+        self.rpc_url = config.SOLANA_RPC_URL
+        self.http = http or AsyncHTTPClient()
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.cache_size = cache_size
+        self._parsed = OrderedDict()
         logger.info("Initialized Solana RPC client")
     
     async def get_data(self, token_address: str) -> pd.DataFrame:
         """Fetch recent transaction data for a Solana token.
         
+        Transactions already parsed by an earlier poll come from the LRU cache;
+        the rest are requested in concurrent JSON-RPC batches.
+        
         Args:
             token_address: Token mint address.
         
@@ -29,24 +44,67 @@ class OnchainDataFetcher:
             DataFrame with transaction data (timestamp, price, volume).
         """
         try:
-            token_pubkey = PublicKey(token_address)
-            signatures = await self.client.get_signatures_for_address(token_pubkey, limit=100)
-            data = []
-            for sig in signatures["result"]:
-                tx = await self.client.get_transaction(sig["signature"])
-                if tx["result"]:
-                    amount = tx["result"]["meta"]["postTokenBalances"][0]["uiTokenAmount"]["uiAmount"] if tx["result"]["meta"]["postTokenBalances"] else 0
-                    data.append({
-                        "timestamp": pd.to_datetime(sig["blockTime"], unit="s"),
-                        "close": amount,  # Simplified; needs price conversion
-                        "high": amount,
-                        "low": amount,
-                        "volume": amount
-                    })
+            signatures, = await self.http.json_rpc(
+                self.rpc_url, [("getSignaturesForAddress", [token_address, {"limit": 100}])])
+            amounts = {}
+            missing = []
+            for sig in signatures:
+                if sig["signature"] in self._parsed:
+                    self._parsed.move_to_end(sig["signature"])
+                    amounts[sig["signature"]] = self._parsed[sig["signature"]]
+                else:
+                    missing.append(sig["signature"])
+            batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            for fetched in await asyncio.gather(*(self._fetch_batch(batch) for batch in batches)):
+                amounts.update(fetched)
+            data = [
+                {
+                    "timestamp": pd.to_datetime(sig["blockTime"], unit="s"),
+                    "close": amounts[sig["signature"]],  # Simplified; needs price conversion
+                    "high": amounts[sig["signature"]],
+                    "low": amounts[sig["signature"]],
+                    "volume": amounts[sig["signature"]]
+                }
+                for sig in signatures if sig["signature"] in amounts
+            ]
             df = pd.DataFrame(data)
             df.set_index("timestamp", inplace=True)
-            logger.info("Fetched %d on-chain transactions for %s", len(df), token_address)
+            logger.info("Fetched %d on-chain transactions for %s (%d from cache)",
+                        len(df), token_address, len(signatures) - len(missing))
             return df
         except Exception as e:
             logger.error("Failed to fetch on-chain data for %s: %s", token_address, e)
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+    
+    async def _fetch_batch(self, signatures: list) -> dict:
+        """Fetch and parse one batch of transactions, caching the results."""
+        calls = [("getTransaction", [sig, {"encoding": "json", "maxSupportedTransactionVersion": 0}])
+                 for sig in signatures]
+        try:
+            async with self.semaphore:
+                results = await self.http.json_rpc(self.rpc_url, calls)
+        except Exception as e:
+            logger.warning("Failed to fetch %d transactions: %s", len(signatures), e)
+            return {}
+        parsed = {}
+        for sig, tx in zip(signatures, results):
+            if tx:  # Not yet available transactions are retried on the next poll
+                balances = tx["meta"]["postTokenBalances"]
+                parsed[sig] = balances[0]["uiTokenAmount"]["uiAmount"] if balances else 0
+                self._parsed[sig] = parsed[sig]
+        while len(self._parsed) > self.cache_size:
+            self._parsed.popitem(last=False)
+        return parsed
+    
+    async def get_bars(self, token_address: str, kind: str = "time", size="1min") -> pd.DataFrame:
+        """Fetch recent transactions and aggregate them into OHLCV bars.
+        
+        Args:
+            token_address: Token mint address.
+            kind: 'time', 'tick' or 'volume' bars.
+            size: Bar size (see data.bars.aggregate_trades).
+        
+        Returns:
+            DataFrame with open/high/low/close/volume bars.
+        """
+        return aggregate_trades(await self.get_data(token_address), kind, size)
@@ -1,8 +1,7 @@
-import requests
+import asyncio
 import pandas as pd
 from config import Config
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+from .transport import AsyncHTTPClient, default_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,39 +9,59 @@ logger = logging.getLogger(__name__)
 class RealtimeDataFetcher:
     """Fetches real-time market data for Solana tokens using Jupiter API and Bitquery."""
     
-    def __init__(self, config: Config):
+    MAX_IDS_PER_REQUEST = 100  # Jupiter price API limit on the 'ids' list
+    
+    def __init__(self, config: Config, http: AsyncHTTPClient = None):
         """Initialize fetcher with Jupiter API and Bitquery client.
         
         Args:
             config: Config object with BITQUERY_API_KEY.
+            http: Shared async HTTP client (a rate-limited one is created if None).
         """
-        self.jupiter_url = "[invalid url, do not cite]
-        self.bitquery_url = "[invalid url, do not cite]
-        self.transport = RequestsHTTPTransport(
-            url=self.bitquery_url,
-            headers={"X-API-KEY": config.BITQUERY_API_KEY}
-        )
-        self.client = Client(transport=self.transport)
+        self.jupiter_url = "https://price.jup.ag/v6/price"
+        self.bitquery_url = "https://streaming.bitquery.io/eap"
+        self.headers = {"X-API-KEY": config.BITQUERY_API_KEY}
+        self.http = http or default_client()
         logger.info("Initialized Jupiter API and Bitquery for real-time data")
     
-    def get_data(self, token_address: str) -> pd.DataFrame:
+    async def get_prices(self, tokens) -> dict:
+        """Fetch current prices for many tokens from Jupiter.
+        
+        Tokens are sent in comma-separated chunks of MAX_IDS_PER_REQUEST, fetched
+        concurrently over the pooled client.
+        
+        Args:
+            tokens: Iterable of token mint addresses.
+        
+        Returns:
+            Dictionary mapping token address to price; tokens Jupiter does not
+            price are omitted.
+        """
+        tokens = list(dict.fromkeys(tokens))
+        chunks = [tokens[i:i + self.MAX_IDS_PER_REQUEST] for i in range(0, len(tokens), self.MAX_IDS_PER_REQUEST)]
+        responses = await asyncio.gather(*(self.http.get_json(self.jupiter_url, params={"ids": ",".join(chunk)})
+                                           for chunk in chunks))
+        prices = {token: entry["price"] for response in responses for token, entry in response["data"].items()}
+        logger.debug("Fetched %d Jupiter prices in %d requests", len(prices), len(chunks))
+        return prices
+    
+    async def get_data(self, token_address: str, price: float = None) -> pd.DataFrame:
         """Fetch current price from Jupiter and recent volume from Bitquery.
         
         Args:
             token_address: Token mint address.
+            price: Price already fetched in bulk (queried from Jupiter if None).
         
         Returns:
             DataFrame with latest price and volume data.
         """
         try:
             # Get price from Jupiter
-            response = requests.get(f"{self.jupiter_url}?ids={token_address}")
-            response.raise_for_status()
-            price_data = response.json()
-            price = price_data['data'][token_address]['price']
+            if price is None:
+                price = (await self.get_prices([token_address]))[token_address]
             
             # Get recent volume from Bitquery (last 1 hour)
-            query = gql("""
+            query = """
             query($token: String!) {
                 Solana {
                     DEXTrades(
@@ -53,8 +72,8 @@ class RealtimeDataFetcher:
                     }
                 }
             }
-            """ % (pd.Timestamp.now() - pd.Timedelta(hours=1)).isoformat())
-            result = self.client.execute(query, variable_values={"token": token_address})
+            """ % (pd.Timestamp.now() - pd.Timedelta(hours=1)).isoformat()
+            result = await self.http.graphql(self.bitquery_url, query, {"token": token_address}, headers=self.headers)
             trades = result["Solana"]["DEXTrades"]
             volume = sum(trade["Trade"]["Amount"] for trade in trades)
             
@@ -68,4 +87,49 @@ class RealtimeDataFetcher:
             return df
         except Exception as e:
             logger.error("Failed to fetch real-time data for %s: %s", token_address, e)
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+class PriceBatcher:
+    """Coalesces concurrent per-token price requests into bulk Jupiter calls."""
+    
+    def __init__(self, fetch_prices, window: float = 0.05):
+        """Initialize the batcher.
+        
+        Args:
+            fetch_prices: Coroutine function mapping a token list to {token: price},
+                e.g. RealtimeDataFetcher.get_prices.
+            window: Seconds to collect requests before issuing one bulk call.
+        """
+        self.fetch_prices = fetch_prices
+        self.window = window
+        self._pending = {}
+        self._flush_task = None
+    
+    async def get(self, token_address: str) -> float:
+        """Return the token's price from the next bulk fetch.
+        
+        Args:
+            token_address: Token mint address.
+        
+        Returns:
+            Latest price, or None if Jupiter has no price for the token.
+        """
+        future = self._pending.get(token_address)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[token_address] = future
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await asyncio.shield(future)
+    
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        pending, self._pending, self._flush_task = self._pending, {}, None
+        try:
+            prices = await self.fetch_prices(list(pending))
+        except Exception as e:
+            logger.error("Failed to fetch prices for %d tokens: %s", len(pending), e)
+            prices = {}
+        for token, future in pending.items():
+            if not future.done():
+                future.set_result(prices.get(token))
@@ -0,0 +1,144 @@
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _utc_naive(timestamp) -> pd.Timestamp:
+    """Convert a timestamp to naive UTC (naive inputs are assumed to be UTC)."""
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_convert(None) if timestamp.tz is not None else timestamp
+
+class TradeStore:
+    """On-disk trade history partitioned by token, DEX and UTC day.
+
+    Each day is a structured .npy file that is memory-mapped on read; a small
+    meta.json per token records the high-water mark of stored trades. Trades
+    are deduplicated on a 64-bit hash of their trade id, so distinct trades
+    with the same time, price and size are all kept.
+    """
+
+    DTYPE = np.dtype([("timestamp", "i8"), ("close", "f8"), ("volume", "f8"), ("trade_id", "u8")])
+    NS_PER_DAY = 86400 * 10**9
+
+    def __init__(self, root: str = "cache/trades"):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the partitions.
+        """
+        self.root = root
+
+    def _dir(self, token_address: str, dex: str) -> str:
+        return os.path.join(self.root, dex, token_address)
+
+    def _meta_path(self, token_address: str, dex: str) -> str:
+        return os.path.join(self._dir(token_address, dex), "meta.json")
+
+    def high_water(self, token_address: str, dex: str) -> pd.Timestamp:
+        """Return the timestamp of the newest stored trade, or None if empty.
+
+        Args:
+            token_address: Token mint address.
+            dex: DEX name.
+        """
+        try:
+            with open(self._meta_path(token_address, dex)) as f:
+                return pd.Timestamp(json.load(f)["high_water"])
+        except FileNotFoundError:
+            return None
+
+    def write(self, token_address: str, dex: str, data: pd.DataFrame):
+        """Merge trades into their day partitions and advance the high-water mark.
+
+        Trades whose id is already stored are dropped, so overlapping fetches
+        can be written safely.
+
+        Args:
+            token_address: Token mint address.
+            dex: DEX name.
+            data: DataFrame with a timestamp index and 'close', 'volume' and
+                'trade_id' (e.g., '<signature>:<instruction index>') columns.
+
+        Raises:
+            ValueError: If data has no 'trade_id' column.
+        """
+        if data.empty:
+            return
+        if "trade_id" not in data:
+            raise ValueError("TradeStore.write needs a 'trade_id' column to deduplicate trades")
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is not None:
+            index = index.tz_convert(None)
+        rows = np.empty(len(data), dtype=self.DTYPE)
+        rows["timestamp"] = index.as_unit("ns").asi8
+        rows["close"] = data["close"].to_numpy(dtype=np.float64)
+        rows["volume"] = data["volume"].to_numpy(dtype=np.float64)
+        rows["trade_id"] = [self.hash_id(trade_id) for trade_id in data["trade_id"]]
+        directory = self._dir(token_address, dex)
+        os.makedirs(directory, exist_ok=True)
+        days = rows["timestamp"] // self.NS_PER_DAY
+        for day in np.unique(days):
+            path = os.path.join(directory, "%s.npy" % pd.Timestamp(day * self.NS_PER_DAY).date())
+            new = rows[days == day]
+            if os.path.exists(path):
+                new = np.concatenate([np.load(path), new])
+            _, first = np.unique(new["trade_id"], return_index=True)  # Stored rows come first and win
+            new = new[np.sort(first)]
+            new = new[np.argsort(new["timestamp"], kind="stable")]
+            with self._replace(path, "wb") as f:
+                np.save(f, new)
+        high_water = self.high_water(token_address, dex)
+        newest = int(rows["timestamp"].max())
+        if high_water is None or newest > high_water.value:
+            with self._replace(self._meta_path(token_address, dex), "w") as f:
+                json.dump({"high_water": pd.Timestamp(newest, tz="UTC").isoformat()}, f)
+        logger.debug("Stored %d trades for %s on %s", len(rows), token_address, dex)
+
+    @staticmethod
+    def hash_id(trade_id: str) -> int:
+        """Hash a trade id to the 64-bit key stored with each trade."""
+        return int.from_bytes(hashlib.blake2b(str(trade_id).encode(), digest_size=8).digest(), "little")
+
+    @staticmethod
+    @contextmanager
+    def _replace(path: str, mode: str):
+        # Write to a temporary file first so readers never see a partial file.
+        tmp = path + ".tmp"
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, path)
+
+    def read(self, token_address: str, dex: str, start=None, end=None) -> pd.DataFrame:
+        """Load stored trades, oldest first.
+
+        Args:
+            token_address: Token mint address.
+            dex: DEX name.
+            start: Earliest timestamp to include (optional).
+            end: Latest timestamp to include (optional).
+
+        Returns:
+            DataFrame indexed by UTC timestamp with 'close' and 'volume' columns.
+        """
+        directory = self._dir(token_address, dex)
+        files = sorted(f for f in os.listdir(directory) if f.endswith(".npy")) if os.path.isdir(directory) else []
+        start, end = (_utc_naive(ts) if ts is not None else None for ts in (start, end))
+        if start is not None:
+            files = [f for f in files if f[:-4] >= str(start.date())]
+        if end is not None:
+            files = [f for f in files if f[:-4] <= str(end.date())]
+        parts = [np.load(os.path.join(directory, f), mmap_mode="r") for f in files]
+        rows = np.concatenate(parts) if parts else np.empty(0, dtype=self.DTYPE)
+        mask = np.ones(len(rows), dtype=bool)
+        if start is not None:
+            mask &= rows["timestamp"] >= start.value
+        if end is not None:
+            mask &= rows["timestamp"] <= end.value
+        rows = rows[mask]
+        index = pd.DatetimeIndex(rows["timestamp"].astype("datetime64[ns]"), name="timestamp").tz_localize("UTC")
+        return pd.DataFrame({"close": rows["close"], "volume": rows["volume"]}, index=index)
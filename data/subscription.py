@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LogSubscriber:
+    """Push notifications of new transactions mentioning a set of wallets.
+
+    Opens one Solana RPC websocket with a logsSubscribe subscription per wallet.
+    After every (re)connect the backfill callback runs to catch transactions
+    missed while disconnected, and it keeps running on a timer while the
+    websocket is unavailable so monitoring degrades to polling. Notifications
+    are handled by a pool of worker tasks, so a slow handler never holds up
+    reading the socket; each wallet is pinned to one worker, so its
+    notifications are handled one at a time and in order.
+    """
+
+    def __init__(self, url: str, wallets: list, on_signature, backfill, commitment: str = "confirmed",
+                 reconnect_delay: float = 1.0, max_delay: float = 30.0, heartbeat: float = 30.0,
+                 workers: int = 8, queue_size: int = 1000):
+        """Initialize the subscriber.
+
+        Args:
+            url: Solana RPC websocket URL (ws:// or wss://).
+            wallets: Wallet addresses to subscribe to.
+            on_signature: Coroutine function called with (wallet, signature,
+                slot) for every successful transaction notification.
+            backfill: Coroutine function that fetches transactions missed
+                since the last seen signatures (polling fallback).
+            commitment: Commitment level of the notifications.
+            reconnect_delay: Initial delay before reconnecting, doubled on every
+                failed attempt.
+            max_delay: Maximum delay between reconnects (and polls while down).
+            heartbeat: Seconds between websocket pings.
+            workers: Notifications handled concurrently (for different wallets).
+            queue_size: Notifications buffered per worker while it is busy;
+                reading pauses when a buffer is full.
+        """
+        self.url = url
+        self.wallets = list(wallets)
+        self.on_signature = on_signature
+        self.backfill = backfill
+        self.commitment = commitment
+        self.reconnect_delay = reconnect_delay
+        self.max_delay = max_delay
+        self.heartbeat = heartbeat
+        self.workers = workers
+        self.queue_size = queue_size
+        self.connected = False
+        self._queues = []
+        self._routes = {wallet: i % workers for i, wallet in enumerate(self.wallets)}
+
+    async def run(self):
+        """Stream notifications until cancelled, reconnecting as needed."""
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        workers = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+        try:
+            await self._connect()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _connect(self):
+        """Keep the subscription open, backfilling around every disconnect."""
+        delay = self.reconnect_delay
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=self.heartbeat) as ws:
+                        subscriptions = await self._subscribe(ws)
+                        self.connected = True
+                        delay = self.reconnect_delay
+                        logger.info("Subscribed to logs of %d wallets", len(subscriptions))
+                        await self._backfill()
+                        await self._listen(ws, subscriptions)
+                    logger.warning("Log subscription closed, reconnecting in %.1fs", delay)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+                    logger.warning("Log subscription failed (%s), polling and retrying in %.1fs", e, delay)
+                finally:
+                    self.connected = False
+                await self._backfill()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+
+    async def _subscribe(self, ws) -> dict:
+        """Subscribe to every wallet and map subscription ids to wallets."""
+        ids = itertools.count(1)
+        pending = {}
+        for wallet in self.wallets:
+            request_id = next(ids)
+            pending[request_id] = wallet
+            await ws.send_json({"jsonrpc": "2.0", "id": request_id, "method": "logsSubscribe",
+                                "params": [{"mentions": [wallet]}, {"commitment": self.commitment}]})
+        subscriptions = {}
+        while pending:
+            message = await ws.receive_json(timeout=self.heartbeat)
+            wallet = pending.pop(message.get("id"), None)
+            if wallet is None:
+                continue
+            if "error" in message:
+                raise ConnectionError("logsSubscribe failed for %s: %s" % (wallet, message["error"]))
+            subscriptions[message["result"]] = wallet
+        return subscriptions
+
+    async def _listen(self, ws, subscriptions: dict):
+        """Dispatch notifications until the socket closes."""
+        async for message in ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            body = message.json()
+            if body.get("method") != "logsNotification":
+                continue
+            wallet = subscriptions.get(body["params"]["subscription"])
+            result = body["params"]["result"]
+            value = result["value"]
+            if wallet is None or value.get("err"):
+                continue
+            slot = result.get("context", {}).get("slot")
+            await self._queues[self._routes[wallet]].put((wallet, value["signature"], slot))
+
+    async def _work(self, queue: asyncio.Queue):
+        """Handle one worker's queued notifications one at a time."""
+        while True:
+            wallet, signature, slot = await queue.get()
+            try:
+                await self.on_signature(wallet, signature, slot)
+            except Exception as e:
+                logger.error("Failed to handle %s for wallet %s: %s", signature, wallet, e)
+            finally:
+                queue.task_done()
+
+    async def _backfill(self):
+        try:
+            await self.backfill()
+        except Exception as e:
+            logger.error("Backfill failed: %s", e)
+
+class WalletCursor:
+    """Per-wallet polling cursors plus a retry set of failed signatures.
+
+    A cursor is the newest signature handled for a wallet and is what
+    getSignaturesForAddress(until=...) resumes from. Cursors only move to
+    signatures from the same or a later slot, so they never go backwards
+    however handlers interleave. Signatures whose handler fails are kept for
+    retry() instead of being lost behind the cursor.
+    """
+
+    def __init__(self, wallets: list, max_attempts: int = 5):
+        """Initialize empty cursors.
+
+        Args:
+            wallets: Wallet addresses.
+            max_attempts: Handler attempts per signature before it is dropped.
+        """
+        self.signatures = {wallet: None for wallet in wallets}
+        self.max_attempts = max_attempts
+        self.failed = {}  # (wallet, signature) -> failed attempts
+        self._slots = {wallet: -1 for wallet in wallets}
+
+    def advance(self, wallet: str, signature: str, slot: int = None):
+        """Move a wallet's cursor to signature unless that would move it back.
+
+        Args:
+            wallet: Wallet address.
+            signature: Handled signature.
+            slot: Slot of the signature (None if unknown, which only sets an
+                empty cursor).
+        """
+        if slot is None:
+            if self.signatures[wallet] is None:
+                self.signatures[wallet] = signature
+            return
+        if slot >= self._slots[wallet]:
+            self.signatures[wallet] = signature
+            self._slots[wallet] = slot
+
+    async def process(self, handler, wallet: str, signature: str, slot: int = None) -> bool:
+        """Run a handler for a signature and advance the cursor past it.
+
+        The cursor advances even if the handler fails: the signature is then
+        kept in the retry set, so nothing is skipped.
+
+        Args:
+            handler: Coroutine function called with (wallet, signature).
+            wallet: Wallet address.
+            signature: Transaction signature.
+            slot: Slot of the signature (the cursor is not moved if None and
+                already set).
+
+        Returns:
+            True if the handler succeeded.
+        """
+        try:
+            await handler(wallet, signature)
+            self.failed.pop((wallet, signature), None)
+            return True
+        except Exception as e:
+            attempts = self.failed.get((wallet, signature), 0) + 1
+            if attempts >= self.max_attempts:
+                self.failed.pop((wallet, signature), None)
+                logger.error("Giving up on %s for wallet %s after %d attempts: %s", signature, wallet, attempts, e)
+            else:
+                self.failed[(wallet, signature)] = attempts
+                logger.warning("Failed to handle %s for wallet %s (attempt %d), will retry: %s",
+                               signature, wallet, attempts, e)
+            return False
+        finally:
+            self.advance(wallet, signature, slot)
+
+    async def retry(self, handler) -> int:
+        """Run the handler again for every failed signature.
+
+        Args:
+            handler: Coroutine function called with (wallet, signature).
+
+        Returns:
+            Number of signatures that succeeded.
+        """
+        succeeded = 0
+        for wallet, signature in list(self.failed):
+            succeeded += await self.process(handler, wallet, signature)
+        return succeeded
@@ -0,0 +1,157 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlparse
+import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
+
+BITQUERY_HOST = "streaming.bitquery.io"
+BITQUERY_RATE_LIMIT = 5  # Requests per second allowed by our Bitquery plan
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL response contains errors."""
+
+class RPCError(Exception):
+    """Raised when a JSON-RPC call returns an error."""
+
+class TokenBucket:
+    """Async token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum burst size (defaults to rate).
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until the requested number of tokens is available and take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+class AsyncHTTPClient:
+    """Keep-alive aiohttp client with per-host limits, retries and rate limiting."""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20, timeout: float = 10.0,
+                 retries: int = 3, backoff: float = 0.5, rate_limits: dict = None):
+        """Initialize client settings (the session is created on first use).
+
+        Args:
+            limit: Maximum open connections overall.
+            limit_per_host: Maximum concurrent connections per host.
+            timeout: Total timeout per request in seconds.
+            retries: Retries after a connection error, timeout or retryable status.
+            backoff: Base delay in seconds, doubled on every retry.
+            rate_limits: Mapping of hostname to TokenBucket.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limits = rate_limits or {}
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> dict:
+        """Send a request and return the decoded JSON body.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Passed to aiohttp (params, json, headers, ...).
+
+        Returns:
+            Decoded JSON response.
+        """
+        bucket = self.rate_limits.get(urlparse(url).hostname)
+        for attempt in range(self.retries + 1):
+            if bucket:
+                await bucket.acquire()
+            delay = self.backoff * 2 ** attempt * (1 + random.random() * 0.1)
+            try:
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    if response.status in self.RETRY_STATUSES and attempt < self.retries:
+                        retry_after = response.headers.get("Retry-After", "")
+                        delay = float(retry_after) if retry_after.isdigit() else delay
+                        logger.warning("%s %s returned %d, retrying in %.2fs", method, url, response.status, delay)
+                    else:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning("%s %s failed (%s), retrying in %.2fs", method, url, e, delay)
+            await asyncio.sleep(delay)
+
+    async def get_json(self, url: str, params: dict = None, headers: dict = None) -> dict:
+        """GET a URL and return the decoded JSON body."""
+        return await self.request("GET", url, params=params, headers=headers)
+
+    async def graphql(self, url: str, query: str, variables: dict = None, headers: dict = None) -> dict:
+        """Run a GraphQL query and return its 'data' member.
+
+        Raises:
+            GraphQLError: If the response reports errors.
+        """
+        body = await self.request("POST", url, json={"query": query, "variables": variables or {}}, headers=headers)
+        if body.get("errors"):
+            raise GraphQLError(body["errors"])
+        return body["data"]
+
+    async def json_rpc(self, url: str, calls: list, headers: dict = None) -> list:
+        """Send JSON-RPC calls as a single batch request.
+
+        Args:
+            url: RPC endpoint.
+            calls: List of (method, params) tuples.
+            headers: Extra request headers.
+
+        Returns:
+            Results in the order of calls, whatever order the server replied in.
+
+        Raises:
+            RPCError: If any call returns an error or is missing from the reply.
+        """
+        payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                   for i, (method, params) in enumerate(calls)]
+        body = await self.request("POST", url, json=payload, headers=headers)
+        replies = {reply.get("id"): reply for reply in (body if isinstance(body, list) else [body])}
+        results = []
+        for i, (method, _) in enumerate(calls):
+            reply = replies.get(i)
+            if reply is None or "error" in reply:
+                raise RPCError("%s failed: %s" % (method, reply["error"] if reply else "no reply"))
+            results.append(reply["result"])
+        return results
+
+    async def close(self):
+        """Close the underlying session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+
+def default_client() -> AsyncHTTPClient:
+    """Create a client with the Bitquery rate limit applied."""
+    return AsyncHTTPClient(rate_limits={BITQUERY_HOST: TokenBucket(BITQUERY_RATE_LIMIT)})
@@ -1,4 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+import atexit
+import queue
+import threading
+import time
+import pandas as pd
+from sqlalchemy import (create_engine, event, inspect, insert, select, union_all, Column, Integer, String,
+                        Float, DateTime, Index, MetaData, Table)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import Config
@@ -8,6 +14,16 @@ logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+_STOP = object()  # Tells the writer thread to flush and exit
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers no longer block the writer thread
+    "synchronous": "NORMAL",  # fsync at checkpoints rather than every commit; safe with WAL
+    "temp_store": "MEMORY",
+    "cache_size": -64000,  # 64 MB page cache
+    "mmap_size": 268435456,
+}
+
 class TradeLog(Base):
     """Database model for trade logs."""
     __tablename__ = "trades"
@@ -18,30 +34,73 @@ class TradeLog(Base):
     price = Column(Float)
     order_id = Column(String)
     timestamp = Column(DateTime, default=pd.Timestamp.now)
+    __table_args__ = (Index("ix_trades_asset_timestamp", "asset", "timestamp"),)
 
 class PortfolioValue(Base):
     """Database model for portfolio value logs."""
     __tablename__ = "portfolio_values"
     id = Column(Integer, primary_key=True)
     value = Column(Float)
-    timestamp = Column(DateTime, default=pd.Timestamp.now)
+    timestamp = Column(DateTime, default=pd.Timestamp.now, index=True)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute("PRAGMA %s=%s" % (name, value))
+    cursor.close()
 
 class DatabaseManager:
-    """Manages database interactions."""
+    """Manages database interactions.
     
-    def __init__(self, config: Config):
-        """Initialize database connection.
+    Writes are queued and inserted in bulk by a background thread, so logging
+    from the trading loop never waits on the database. Failed writes are kept
+    and retried with exponential backoff, and queued rows are written at
+    interpreter exit.
+    """
+    
+    def __init__(self, config: Config, flush_interval: float = 1.0, batch_size: int = 500,
+                 partition_by_month: bool = False, retry_delay: float = 0.5, max_retry_delay: float = 30.0,
+                 close_retries: int = 5):
+        """Initialize database connection and start the writer thread.
         
         Args:
             config: Config object with database settings.
+            flush_interval: Maximum seconds a queued row waits before being written.
+            batch_size: Rows that trigger a write without waiting for the interval.
+            partition_by_month: Write trades to one trades_YYYY_MM table per month
+                instead of the single trades table.
+            retry_delay: Seconds before retrying a failed write, doubled on
+                every consecutive failure.
+            max_retry_delay: Maximum seconds between retries.
+            close_retries: Retries of a failing write on close before the
+                remaining rows are given up.
         """
         self.engine = create_engine(config.DATABASE_URL)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
+        # create_all skips existing tables along with their indexes, so add any
+        # index missing from a database created by an older schema
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+        self.partition_by_month = partition_by_month
+        self._partitions = MetaData()
+        self._partition_lock = threading.Lock()
         self.Session = sessionmaker(bind=self.engine)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.close_retries = close_retries
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
         logger.info("Database initialized with URL: %s", config.DATABASE_URL)
     
     def log_trade(self, asset: str, side: str, quantity: float, price: float, order_id: str):
-        """Log a trade to the database.
+        """Queue a trade for the database.
         
         Args:
             asset: Asset symbol.
@@ -50,22 +109,202 @@ class DatabaseManager:
             price: Trade price.
             order_id: Unique order identifier.
         """
-        session = self.Session()
-        trade = TradeLog(asset=asset, side=side, quantity=quantity, price=price, order_id=order_id)
-        session.add(trade)
-        session.commit()
-        session.close()
+        self._queue.put((TradeLog, {"asset": asset, "side": side, "quantity": quantity, "price": price,
+                                    "order_id": order_id, "timestamp": pd.Timestamp.now().to_pydatetime()}))
         logger.info("Logged trade: %s - %s %f at $%.2f", asset, side, quantity, price)
     
     def log_portfolio_value(self, value: float):
-        """Log portfolio value to the database.
+        """Queue a portfolio value for the database.
         
         Args:
             value: Current portfolio value.
         """
-        session = self.Session()
-        portfolio_value = PortfolioValue(value=value)
-        session.add(portfolio_value)
-        session.commit()
-        session.close()
-        logger.debug("Logged portfolio value: $%.2f", value)
\ No newline at end of file
+        self._queue.put((PortfolioValue, {"value": value, "timestamp": pd.Timestamp.now().to_pydatetime()}))
+        logger.debug("Logged portfolio value: $%.2f", value)
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every row queued so far has been written.
+        
+        Args:
+            timeout: Maximum seconds to wait (forever if None).
+        
+        Returns:
+            True if the rows were written within the timeout.
+        
+        Raises:
+            RuntimeError: If the writer thread has stopped (e.g., after close()).
+        """
+        if not self._writer.is_alive():
+            raise RuntimeError("Database writer is closed")
+        done = threading.Event()
+        self._queue.put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.1 if deadline is None else min(0.1, max(0.0, deadline - time.monotonic()))):
+            if not self._writer.is_alive():
+                raise RuntimeError("Database writer stopped before the rows were written")
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+    
+    def close(self):
+        """Write all queued rows and stop the writer thread."""
+        atexit.unregister(self.close)
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self.engine.dispose()
+    
+    def get_trades(self, asset: str = None, start=None, end=None, chunk_size: int = 10000):
+        """Stream trades in time order as DataFrame chunks.
+        
+        Range queries are served by the (asset, timestamp) index; with monthly
+        partitions only the tables overlapping [start, end] are read. Queued
+        trades are written first (while the writer runs) so the result
+        includes them.
+        
+        Args:
+            asset: Only trades of this asset (all assets if None).
+            start: Earliest timestamp to include (optional).
+            end: Latest timestamp to include (optional).
+            chunk_size: Rows per yielded DataFrame.
+        
+        Yields:
+            DataFrames of at most chunk_size trades, oldest first.
+        """
+        if self._writer.is_alive():
+            self.flush()
+        start = pd.Timestamp(start).to_pydatetime() if start is not None else None
+        end = pd.Timestamp(end).to_pydatetime() if end is not None else None
+        selects = []
+        for table in self._trade_tables(start, end):
+            query = select(*(table.c[column.name] for column in TradeLog.__table__.columns))
+            if asset is not None:
+                query = query.where(table.c.asset == asset)
+            if start is not None:
+                query = query.where(table.c.timestamp >= start)
+            if end is not None:
+                query = query.where(table.c.timestamp <= end)
+            selects.append(query)
+        columns = [column.name for column in TradeLog.__table__.columns]
+        if not selects:
+            return
+        query = selects[0] if len(selects) == 1 else union_all(*selects).subquery().select()
+        query = query.order_by(query.selected_columns.timestamp)
+        with self.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(query)
+            for rows in result.partitions(chunk_size):
+                yield pd.DataFrame(rows, columns=columns)
+    
+    def get_trades_df(self, asset: str = None, start=None, end=None) -> pd.DataFrame:
+        """Load trades as a single DataFrame.
+        
+        Args:
+            asset: Only trades of this asset (all assets if None).
+            start: Earliest timestamp to include (optional).
+            end: Latest timestamp to include (optional).
+        
+        Returns:
+            DataFrame with one row per trade, oldest first.
+        """
+        chunks = list(self.get_trades(asset, start, end))
+        if not chunks:
+            return pd.DataFrame(columns=[column.name for column in TradeLog.__table__.columns])
+        return pd.concat(chunks, ignore_index=True)
+    
+    def _trade_tables(self, start=None, end=None) -> list:
+        """Return the trade tables that may hold trades in [start, end]."""
+        if not self.partition_by_month:
+            return [TradeLog.__table__]
+        first = start.strftime("%Y_%m") if start is not None else ""
+        last = end.strftime("%Y_%m") if end is not None else "9999_99"
+        names = inspect(self.engine).get_table_names()
+        return [self._partition(name[len("trades_"):]) for name in sorted(names)
+                if name.startswith("trades_") and first <= name[len("trades_"):] <= last]
+    
+    def _partition(self, month: str) -> Table:
+        """Return the trades table for a YYYY_MM month, creating it if needed."""
+        name = "trades_%s" % month
+        with self._partition_lock:
+            table = self._partitions.tables.get(name)
+            return table if table is not None else self._create_partition(name)
+    
+    def _create_partition(self, name: str) -> Table:
+        table = Table(
+            name, self._partitions,
+            Column("id", Integer, primary_key=True),
+            Column("asset", String),
+            Column("side", String),
+            Column("quantity", Float),
+            Column("price", Float),
+            Column("order_id", String),
+            Column("timestamp", DateTime),
+            Index("ix_%s_asset_timestamp" % name, "asset", "timestamp"),
+        )
+        table.create(self.engine, checkfirst=True)
+        return table
+    
+    def _write_loop(self):
+        pending = []
+        waiters = []  # flush() events, set once everything before them is written
+        deadline = None
+        failures = 0
+        stopping = False
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Flush interval or retry delay elapsed
+            if isinstance(item, tuple):
+                pending.append(item)
+                deadline = deadline or time.monotonic() + self.flush_interval
+                if (len(pending) < self.batch_size or failures) and time.monotonic() < deadline:
+                    continue
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is _STOP:
+                stopping = True
+            if failures and time.monotonic() < deadline:
+                continue  # Flushes and close wait out the retry backoff too
+            if self._write(pending):
+                pending, deadline, failures = [], None, 0
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+            else:
+                failures += 1
+                if stopping and failures > self.close_retries:
+                    logger.error("Giving up on %d rows after %d failed writes", len(pending), failures)
+                    return
+                delay = min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay)
+                logger.warning("Retrying %d rows in %.1fs", len(pending), delay)
+                deadline = time.monotonic() + delay
+            if stopping and not pending:
+                return
+    
+    def _write(self, pending: list) -> bool:
+        """Bulk insert queued rows, one executemany per table.
+        
+        Returns:
+            True if the rows were written (or there were none).
+        """
+        if not pending:
+            return True
+        try:
+            self._insert(pending)
+            logger.debug("Wrote %d rows to the database", len(pending))
+            return True
+        except Exception as e:
+            logger.error("Failed to write %d rows to the database: %s", len(pending), e)
+            return False
+    
+    def _insert(self, pending: list):
+        with self.Session.begin() as session:
+            tables = {}
+            for model, row in pending:
+                table = model.__table__
+                if model is TradeLog and self.partition_by_month:
+                    table = self._partition(row["timestamp"].strftime("%Y_%m"))
+                tables.setdefault(table, []).append(row)
+            for table, rows in tables.items():
+                session.execute(insert(table), rows)
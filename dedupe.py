@@ -0,0 +1,60 @@
+from collections import OrderedDict
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ExpiringDedupe:
+    """Bounded, time-expiring set of seen keys.
+
+    Keys map to their expiry time in insertion order, so expired keys are
+    dropped from the front in O(1) each. Memory is fixed by max_size however
+    long the process runs.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 100000, clock=time.monotonic):
+        """Initialize an empty dedupe set.
+
+        Args:
+            ttl: Seconds a key is remembered.
+            max_size: Maximum keys held (oldest evicted first).
+            clock: Time source in seconds.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._expiry = OrderedDict()
+
+    def _expire(self, now: float):
+        while self._expiry and next(iter(self._expiry.values())) <= now:
+            self._expiry.popitem(last=False)
+
+    def add(self, key: str) -> bool:
+        """Record a key.
+
+        Args:
+            key: Key such as a transaction signature or token mint.
+
+        Returns:
+            True if the key is new (or its previous sighting expired), False if
+            it is a duplicate within the TTL.
+        """
+        now = self.clock()
+        self._expire(now)
+        if key in self._expiry:
+            return False
+        self._expiry[key] = now + self.ttl
+        if len(self._expiry) > self.max_size:
+            self._expiry.popitem(last=False)
+        return True
+
+    def discard(self, key: str):
+        """Forget a key, e.g. when handling it failed and it should be retried."""
+        self._expiry.pop(key, None)
+
+    def __contains__(self, key: str) -> bool:
+        self._expire(self.clock())
+        return key in self._expiry
+
+    def __len__(self) -> int:
+        return len(self._expiry)
@@ -3,7 +3,9 @@ import asyncio
 import logging
 from config import Config
 from data.historical import HistoricalDataFetcher
-from data.realtime import RealtimeDataFetcher
+from data.store import TradeStore
+from data.realtime import RealtimeDataFetcher, PriceBatcher
+from data.transport import default_client
 from strategies.momentum_strategy import MomentumStrategy
 from tracker import Tracker
 from analyzer import Analyzer
@@ -21,20 +23,35 @@ async def main():
     parser.add_argument("--ca", help="Token Contract Address (optional for monitoring)")
     parser.add_argument("--strategies", nargs="+", default=["momentum"], help="List of strategies")
     parser.add_argument("--track-hours", type=int, default=24, help="Hours to track tokens")
+    parser.add_argument("--ws-url", help="Solana RPC websocket URL (defaults to the RPC URL over ws)")
+    parser.add_argument("--poll", action="store_true", help="Poll trusted wallets instead of subscribing")
+    parser.add_argument("--backfill-days", type=float, default=0, help="Days of trade history to backfill for --ca")
     args = parser.parse_args()
 
     # Initialize components
     config = Config()
-    historical_fetcher = HistoricalDataFetcher(config)
-    realtime_fetcher = RealtimeDataFetcher(config)
+    http = default_client()  # One connection pool and Bitquery quota for all fetchers
+    historical_fetcher = HistoricalDataFetcher(config, http, store=TradeStore())
+    realtime_fetcher = RealtimeDataFetcher(config, http)
     strategies = [MomentumStrategy()] if "momentum" in args.strategies else []
-    tracker = Tracker(realtime_fetcher)
+    tracker = Tracker(realtime_fetcher, price_batcher=PriceBatcher(realtime_fetcher.get_prices))
     analyzer = Analyzer()
-    monitor = TokenMonitor(config, historical_fetcher, realtime_fetcher, strategies, tracker, analyzer)
+    monitor = TokenMonitor(config, historical_fetcher, realtime_fetcher, strategies, tracker, analyzer,
+                           track_hours=args.track_hours,
+                           ws_url=None if args.poll else args.ws_url or config.SOLANA_RPC_URL.replace("http", "ws", 1))
 
+    try:
+        await run(args, monitor, historical_fetcher, tracker, analyzer, strategies)
+    finally:
+        await http.close()
+
+async def run(args, monitor, historical_fetcher, tracker, analyzer, strategies):
     if args.ca:
         # Single token mode
-        historical_data = historical_fetcher.get_data(args.ca)
+        if args.backfill_days:
+            start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=args.backfill_days)
+            await historical_fetcher.backfill(args.ca, start=start)
+        historical_data = await historical_fetcher.get_bars(args.ca)
         if historical_data.empty:
             logger.error("No historical data for token %s", args.ca)
             return
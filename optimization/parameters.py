@@ -1,20 +1,143 @@
+import itertools
 import logging
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from backtesting import simulate
+from strategies.base import generate_signal_matrix
+from strategies.ma_crossover import MACrossoverStrategy
+from strategies.rsi import RSIStrategy
+from strategies.macd import MACDStrategy
+from strategies.momentum_strategy import MomentumStrategy
 
 logger = logging.getLogger(__name__)
 
+PARAM_GRIDS = {
+    MACrossoverStrategy: {
+        "short_period": [5, 10, 20, 50],
+        "long_period": [20, 50, 100, 200],
+    },
+    RSIStrategy: {
+        "period": [7, 14, 21],
+        "overbought": [65, 70, 75, 80],
+        "oversold": [20, 25, 30, 35],
+    },
+    MACDStrategy: {
+        "fast_period": [8, 12, 16],
+        "slow_period": [21, 26, 34],
+        "signal_period": [5, 9, 12],
+    },
+    MomentumStrategy: {
+        "lookback_period": [3, 5, 10, 20],
+        "threshold": [0.02, 0.05, 0.1, 0.2],
+    },
+}
+
+CONSTRAINTS = {
+    MACrossoverStrategy: lambda p: p["short_period"] < p["long_period"],
+    MACDStrategy: lambda p: p["fast_period"] < p["slow_period"],
+}
+
+# Per-worker view of the shared price frame, set by _attach_frame.
+_shm = None
+_frame = None
+
+def _attach_frame(name: str, shape: tuple, columns: list):
+    """Attach a worker process to the shared price block."""
+    global _shm, _frame
+    _shm = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_shm.buf)
+    _frame = pd.DataFrame(values, columns=columns, copy=False)
+
+def _score_chunk(strategy_class, chunk: list) -> list:
+    """Score a chunk of parameter combinations against the shared frame.
+
+    The chunk's signals form one matrix that is simulated in a single pass.
+    One-off parameter combinations bypass the signal cache.
+    """
+    matrix = generate_signal_matrix(_frame, [strategy_class(**params) for params in chunk], cache=None)
+    result = simulate(matrix.buy, _frame, matrix.size)
+    final_values, trades = result["final_value"], result["trades"]
+    return [{**params, "final_value": float(final_values[j]), "trades": int(trades[j])}
+            for j, params in enumerate(chunk)]
+
 class ParameterOptimizer:
-    """Optimizes strategy parameters (placeholder)."""
-    
-    def optimize(self, data: pd.DataFrame, strategy_class) -> dict:
-        """Optimize strategy parameters using grid search.
-        
+    """Optimizes strategy parameters with a parallel grid or random search."""
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 32):
+        """Initialize the worker pool settings.
+
         Args:
-            data: Historical data.
+            max_workers: Number of worker processes (defaults to all cores).
+            chunk_size: Parameter combinations scored per task.
+        """
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunk_size = chunk_size
+
+    def candidates(self, strategy_class, param_grid: dict = None, n_iter: int = None, seed: int = None) -> list:
+        """Expand a parameter grid into valid combinations.
+
+        Args:
+            strategy_class: Strategy class to optimize.
+            param_grid: Mapping of constructor argument to candidate values.
+            n_iter: Sample this many combinations at random instead of the full grid.
+            seed: Random seed for sampling.
+
+        Returns:
+            List of parameter dictionaries.
+        """
+        grid = param_grid or PARAM_GRIDS[strategy_class]
+        keys = list(grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+        valid = CONSTRAINTS.get(strategy_class)
+        if valid:
+            combos = [p for p in combos if valid(p)]
+        if n_iter is not None and n_iter < len(combos):
+            combos = random.Random(seed).sample(combos, n_iter)
+        return combos
+
+    def optimize(self, data: pd.DataFrame, strategy_class, param_grid: dict = None,
+                 n_iter: int = None, seed: int = None) -> pd.DataFrame:
+        """Optimize strategy parameters using grid or random search.
+
+        The numeric columns of data are copied once into shared memory; workers
+        attach to that block instead of receiving the frame with every task.
+
+        Args:
+            data: Historical data with 'close' and optional 'open'/'high'/'low'/'volume'.
             strategy_class: Strategy class to optimize.
-        
+            param_grid: Mapping of constructor argument to candidate values
+                (defaults to PARAM_GRIDS).
+            n_iter: Number of random combinations to try (full grid if None).
+            seed: Random seed for sampling.
+
         Returns:
-            Dictionary with optimal parameters.
+            DataFrame with one row per combination, ranked by final value.
         """
-        # Placeholder for grid search
-        logger.info("Optimizing parameters for %s", strategy_class.__name__)
-        return {"short_period": 50, "long_period": 200}
\ No newline at end of file
+        combos = self.candidates(strategy_class, param_grid, n_iter, seed)
+        logger.info("Optimizing %d parameter sets for %s on %d workers",
+                    len(combos), strategy_class.__name__, self.max_workers)
+        numeric = data.select_dtypes("number")
+        values = numeric.to_numpy(dtype=np.float64)
+        chunks = [combos[i:i + self.chunk_size] for i in range(0, len(combos), self.chunk_size)]
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+            initargs = (shm.name, values.shape, list(numeric.columns))
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_attach_frame, initargs=initargs,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                rows = [row for chunk in pool.map(_score_chunk, itertools.repeat(strategy_class), chunks)
+                        for row in chunk]
+        finally:
+            shm.close()
+            shm.unlink()
+        results = pd.DataFrame(rows)
+        if not results.empty:
+            results = results.sort_values("final_value", ascending=False, ignore_index=True)
+            logger.info("Best parameters for %s: %s", strategy_class.__name__,
+                        results.iloc[0][list(combos[0])].to_dict())
+        return results
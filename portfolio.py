@@ -1,52 +1,195 @@
-from typing import Dict
+from typing import Dict, List, NamedTuple
+import numpy as np
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+class Fill(NamedTuple):
+    """One executed trade in the portfolio's fill log."""
+    asset: str
+    quantity: float
+    price: float
+    timestamp: pd.Timestamp
+
 class Portfolio:
-    """Manages trading portfolio, positions, and value."""
-    
-    def __init__(self, initial_capital: float):
+    """Manages trading portfolio, positions, and value.
+
+    Positions live in NumPy arrays indexed through an asset-id map. Value,
+    exposure and unrealized PnL are kept as running totals so a price tick
+    updates them in O(1); mark() reprices the whole book in one vectorized
+    pass. Every fill is appended to an immutable log that replay() rebuilds
+    the state from.
+    """
+
+    def __init__(self, initial_capital: float, capacity: int = 64):
         """Initialize portfolio with starting capital.
-        
+
         Args:
             initial_capital: Initial cash balance.
+            capacity: Initial number of asset slots (grows as needed).
         """
+        self.initial_capital = initial_capital
         self.capital = initial_capital
-        self.positions: Dict[str, float] = {}
-    
-    def update(self, asset: str, quantity: float, price: float):
+        self.realized_pnl = 0.0
+        self.fills: List[Fill] = []
+        self.assets: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.quantities = np.zeros(capacity)
+        self.costs = np.zeros(capacity)  # Entry cost of each open position
+        self.last_prices = np.full(capacity, np.nan)
+        self._market_value = 0.0
+        self._exposure = 0.0
+        self._priced_cost = 0.0  # Entry cost of positions that have a price
+
+    @classmethod
+    def replay(cls, initial_capital: float, fills: List[Fill]) -> "Portfolio":
+        """Rebuild a portfolio from a fill log.
+
+        Args:
+            initial_capital: Initial cash balance.
+            fills: Fills in execution order.
+
+        Returns:
+            Portfolio in the state reached after the fills.
+        """
+        portfolio = cls(initial_capital)
+        for fill in fills:
+            portfolio.update(fill.asset, fill.quantity, fill.price, fill.timestamp)
+        return portfolio
+
+    @property
+    def positions(self) -> Dict[str, float]:
+        """Open positions by asset."""
+        return {asset: float(self.quantities[i]) for asset, i in self._ids.items() if self.quantities[i]}
+
+    @property
+    def value(self) -> float:
+        """Cash plus the marked value of all priced positions."""
+        return self.capital + self._market_value
+
+    @property
+    def exposure(self) -> float:
+        """Gross marked value of all priced positions."""
+        return self._exposure
+
+    @property
+    def unrealized_pnl(self) -> float:
+        """Marked value minus entry cost of all priced positions."""
+        return self._market_value - self._priced_cost
+
+    def asset_id(self, asset: str) -> int:
+        """Return an asset's slot in the position arrays, assigning one if new.
+
+        Args:
+            asset: Asset symbol.
+        """
+        i = self._ids.get(asset)
+        if i is None:
+            i = self._ids[asset] = len(self.assets)
+            self.assets.append(asset)
+            if i == len(self.quantities):
+                self.quantities = np.concatenate([self.quantities, np.zeros(i)])
+                self.costs = np.concatenate([self.costs, np.zeros(i)])
+                self.last_prices = np.concatenate([self.last_prices, np.full(i, np.nan)])
+        return i
+
+    def update(self, asset: str, quantity: float, price: float, timestamp=None):
         """Update portfolio after a trade.
-        
+
+        Reducing a position realizes PnL against its average entry price; the
+        fill price also becomes the asset's latest mark.
+
         Args:
             asset: Asset symbol (e.g., 'bitcoin').
             quantity: Amount bought/sold (positive for buy, negative for sell).
             price: Trade price.
+            timestamp: Fill time (defaults to now).
+        """
+        self.fills.append(Fill(asset, quantity, price, pd.Timestamp.now() if timestamp is None else pd.Timestamp(timestamp)))
+        i = self.asset_id(asset)
+        self._unmark(i)
+        held, cost = self.quantities[i], self.costs[i]
+        closed = 0.0
+        if held and np.sign(held) != np.sign(quantity):
+            closed = np.sign(quantity) * min(abs(quantity), abs(held))
+            average = cost / held
+            self.realized_pnl -= closed * (price - average)
+            cost += closed * average
+        self.quantities[i] = held + quantity
+        self.costs[i] = cost + (quantity - closed) * price if self.quantities[i] else 0.0
+        self.capital -= quantity * price
+        self.last_prices[i] = price
+        self._remark(i)
+        logger.debug("Portfolio updated: %s - %f units at $%.2f, new capital $%.2f",
+                     asset, quantity, price, self.capital)
+
+    def on_tick(self, asset: str, price: float) -> float:
+        """Mark one asset to a new price in O(1).
+
+        Args:
+            asset: Asset symbol.
+            price: Latest price.
+
+        Returns:
+            Total portfolio value.
         """
-        cost = quantity * price
-        if asset in self.positions:
-            self.positions[asset] += quantity
-        else:
-            self.positions[asset] = quantity
-        self.capital -= cost
-        logger.info("Portfolio updated: %s - %f units at $%.2f, new capital $%.2f", 
-                    asset, quantity, price, self.capital)
-    
+        i = self._ids.get(asset)
+        if i is not None:
+            self._unmark(i)
+            self.last_prices[i] = price
+            self._remark(i)
+        return self.value
+
+    def mark(self, prices) -> float:
+        """Mark the whole book to new prices in one vectorized pass.
+
+        Args:
+            prices: Mapping or Series of asset to latest price; assets the
+                portfolio has never traded are ignored.
+
+        Returns:
+            Total portfolio value.
+        """
+        prices = pd.Series(prices, dtype=np.float64)
+        known = prices[prices.index.isin(self.assets)]
+        if len(known):
+            ids = np.fromiter((self._ids[asset] for asset in known.index), dtype=np.int64, count=len(known))
+            self.last_prices[ids] = known.to_numpy()
+        n = len(self.assets)
+        priced = ~np.isnan(self.last_prices[:n])
+        values = self.quantities[:n][priced] * self.last_prices[:n][priced]
+        self._market_value = float(values.sum())
+        self._exposure = float(np.abs(values).sum())
+        self._priced_cost = float(self.costs[:n][priced].sum())
+        return self.value
+
     def calculate_value(self, prices: pd.DataFrame) -> float:
         """Calculate total portfolio value.
-        
+
         Args:
             prices: DataFrame with latest prices ('close' column per asset).
-        
+
         Returns:
             Total portfolio value (cash + positions).
         """
-        total_value = self.capital
-        for asset, quantity in self.positions.items():
-            if asset in prices.columns:
-                total_value += quantity * prices[asset].iloc[-1]
-            else:
-                logger.warning("Price data missing for %s, excluding from value calculation.", asset)
-        logger.debug("Calculated portfolio value: $%.2f", total_value)
-        return total_value
\ No newline at end of file
+        total_value = self.mark(prices.iloc[-1]) if len(prices) else self.value
+        missing = [asset for asset in self.positions if asset not in prices.columns]
+        if missing:
+            logger.warning("Price data missing for %s, using last known price.", ", ".join(missing))
+        return total_value
+
+    def _unmark(self, i: int):
+        # Remove an asset's contribution from the running totals
+        if not np.isnan(self.last_prices[i]):
+            value = self.quantities[i] * self.last_prices[i]
+            self._market_value -= value
+            self._exposure -= abs(value)
+            self._priced_cost -= self.costs[i]
+
+    def _remark(self, i: int):
+        if not np.isnan(self.last_prices[i]):
+            value = self.quantities[i] * self.last_prices[i]
+            self._market_value += value
+            self._exposure += abs(value)
+            self._priced_cost += self.costs[i]
@@ -1,4 +1,5 @@
 import talib as ta
+import numpy as np
 import pandas as pd
 import logging
 
@@ -7,15 +8,99 @@ logger = logging.getLogger(__name__)
 class RiskManager:
     """Manages trading risk with dynamic sizing and stop-loss."""
     
-    def __init__(self, max_drawdown: float = 0.2, risk_per_trade: float = 0.01):
+    def __init__(self, max_drawdown: float = 0.2, risk_per_trade: float = 0.01,
+                 stop_atr_multiple: float = 2.0, var_confidence: float = 0.95):
         """Initialize risk parameters.
         
         Args:
-            max_drawdown: Maximum allowable portfolio drawdown.
+            max_drawdown: Maximum allowable portfolio drawdown; reaching it halts
+                trading until reset() is called.
             risk_per_trade: Risk percentage per trade.
+            stop_atr_multiple: Stop-loss distance from entry in ATRs (below
+                entry for longs, above for shorts).
+            var_confidence: Confidence level of the historical VaR.
         """
         self.max_drawdown = max_drawdown
         self.risk_per_trade = risk_per_trade
+        self.stop_atr_multiple = stop_atr_multiple
+        self.var_confidence = var_confidence
+        self.peak_equity = None
+        self.halted = False
+    
+    def reset(self):
+        """Clear the drawdown peak and re-enable trading after a kill-switch halt."""
+        self.peak_equity = None
+        self.halted = False
+    
+    def check_drawdown(self, equity: float) -> float:
+        """Update the running drawdown and trip the kill-switch if it is too deep.
+        
+        Args:
+            equity: Current portfolio value.
+        
+        Returns:
+            Drawdown from the equity peak as a fraction.
+        """
+        self.peak_equity = equity if self.peak_equity is None else max(self.peak_equity, equity)
+        drawdown = 1 - equity / self.peak_equity if self.peak_equity > 0 else 0.0
+        if drawdown >= self.max_drawdown and not self.halted:
+            self.halted = True
+            logger.error("Drawdown %.1f%% reached the %.1f%% limit, halting trading",
+                         drawdown * 100, self.max_drawdown * 100)
+        return drawdown
+    
+    def evaluate(self, equity: float, prices, quantities, entry_prices, atr, returns=None) -> dict:
+        """Evaluate risk for all open positions in one vectorized pass.
+        
+        Args:
+            equity: Current portfolio value.
+            prices: Latest price per position.
+            quantities: Units held per position (negative for shorts).
+            entry_prices: Entry price per position.
+            atr: Average True Range per position.
+            returns: Recent per-bar returns of shape (bars, positions) for the
+                correlation-adjusted exposure and VaR (skipped if None).
+        
+        Returns:
+            Dictionary with per-position 'sizes', 'stops' and 'stop_hit' arrays
+            and portfolio 'drawdown', 'exposure', 'adjusted_exposure', 'var' and
+            'halted' values. Sizes are zero while the kill-switch is tripped.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        atr = np.asarray(atr, dtype=np.float64)
+        entry_prices = np.asarray(entry_prices, dtype=np.float64)
+        drawdown = self.check_drawdown(equity)
+        sizes = np.where(atr > 0, equity * self.risk_per_trade / np.where(atr > 0, atr, 1.0), 0.01)
+        if self.halted:
+            sizes = np.zeros_like(sizes)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        direction = np.where(quantities < 0, -1.0, 1.0)  # Shorts stop out above entry
+        stops = entry_prices - direction * atr * self.stop_atr_multiple
+        positions = quantities * prices
+        report = {
+            "sizes": sizes,
+            "stops": stops,
+            "stop_hit": np.where(direction > 0, prices <= stops, prices >= stops),
+            "drawdown": drawdown,
+            "exposure": float(np.abs(positions).sum()),
+            "adjusted_exposure": float(np.abs(positions).sum()),
+            "var": 0.0,
+            "halted": self.halted,
+        }
+        if returns is not None and len(returns) > 1:
+            returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+            # Scenario PnL of the current book under each historical bar
+            pnl = returns @ positions
+            report["var"] = float(max(0.0, -np.quantile(pnl, 1 - self.var_confidence)))
+            # sqrt(x' C x) with C the return correlation matrix, without forming C:
+            # x' C x = |Z (x / sigma)|^2 / (n - 1) for the centered returns Z
+            centered = returns - returns.mean(axis=0)
+            sigma = np.sqrt((centered ** 2).sum(axis=0) / (len(returns) - 1))
+            scaled = np.divide(positions, sigma, out=np.zeros_like(positions), where=sigma > 0)
+            combined = centered @ scaled
+            idle = positions[sigma == 0]  # No price history yet: treat as uncorrelated
+            report["adjusted_exposure"] = float(np.sqrt(combined @ combined / (len(returns) - 1) + idle @ idle))
+        return report
     
     def calculate_position_size(self, capital: float, atr: float) -> float:
         """Calculate position size based on risk and volatility.
@@ -34,16 +119,18 @@ class RiskManager:
         logger.debug("Calculated position size: %f for capital $%.2f and ATR %.4f", size, capital, atr)
         return size
     
-    def set_stop_loss(self, entry_price: float, atr: float) -> float:
+    def set_stop_loss(self, entry_price: float, atr: float, quantity: float = 1.0) -> float:
         """Set stop-loss level based on ATR.
         
         Args:
             entry_price: Entry price of the trade.
             atr: Average True Range for volatility.
+            quantity: Position size; negative for a short, whose stop is above entry.
         
         Returns:
             Stop-loss price.
         """
-        stop_loss = entry_price - (atr * 2)  # 2x ATR below entry
+        direction = -1.0 if quantity < 0 else 1.0
+        stop_loss = entry_price - direction * atr * self.stop_atr_multiple
         logger.debug("Set stop-loss at $%.2f for entry $%.2f with ATR %.4f", stop_loss, entry_price, atr)
         return stop_loss
\ No newline at end of file
@@ -0,0 +1,108 @@
+import asyncio
+from collections import OrderedDict
+import random
+import numpy as np
+from tracker import Tracker
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TrackingScheduler:
+    """Tracks many tokens concurrently on one event loop."""
+
+    def __init__(self, tracker: Tracker, max_concurrency: int = 50, min_interval: float = 10,
+                 max_interval: float = 120, jitter: float = 0.1, hot_change: float = 0.05,
+                 max_results: int = 1000):
+        """Initialize scheduling limits.
+
+        Args:
+            tracker: Tracker instance used for every token.
+            max_concurrency: Maximum number of polls in flight at once.
+            min_interval: Poll interval in seconds for the most active tokens.
+            max_interval: Poll interval in seconds for tokens close to 'dead'.
+            jitter: Random fraction added to or removed from each interval.
+            hot_change: Absolute price change over the last bars that counts as fully 'hot'.
+            max_results: Trade lists kept for the most recently finished tokens;
+                the full results are also the value of each tracking task.
+        """
+        self.tracker = tracker
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.hot_change = hot_change
+        self.max_results = max_results
+        self.tasks = {}
+        self.results = OrderedDict()
+
+    def poll_interval(self, data, volume_ma: float) -> float:
+        """Choose the next poll delay from recent activity.
+
+        Args:
+            data: PriceBuffer with the token's recent bars.
+            volume_ma: Current 24-bar volume mean.
+
+        Returns:
+            Delay in seconds before the next poll.
+        """
+        close = np.asarray(data['close'])[-5:]
+        if len(close) < 2 or volume_ma < 10:
+            heat = 0.0
+        else:
+            heat = min(abs(close[-1] - close[0]) / close[0] / self.hot_change, 1.0)
+        interval = self.max_interval - (self.max_interval - self.min_interval) * heat
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def track(self, token_address: str, strategies, duration_hours: int, entry_price: float = None) -> asyncio.Task:
+        """Start tracking a token unless it is already tracked.
+
+        Args:
+            token_address: Token mint address.
+            strategies: List of strategy instances.
+            duration_hours: Maximum hours to track.
+            entry_price: Entry price for tracking profit/loss (optional).
+
+        Returns:
+            The tracking task.
+        """
+        if token_address in self.tasks:
+            return self.tasks[token_address]
+        task = asyncio.create_task(self._run(token_address, strategies, duration_hours, entry_price))
+        self.tasks[token_address] = task
+        logger.info("Scheduled tracking for %s (%d tokens active)", token_address, len(self.tasks))
+        return task
+
+    async def _run(self, token_address: str, strategies, duration_hours: int, entry_price: float):
+        # Stagger start times so tokens added together do not poll in lockstep.
+        await asyncio.sleep(random.uniform(0, self.min_interval))
+        try:
+            trades = await self.tracker.track_token(
+                token_address, strategies, duration_hours, entry_price,
+                semaphore=self.semaphore, poll_interval=self.poll_interval)
+            self.results.pop(token_address, None)
+            self.results[token_address] = trades
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
+            return trades
+        except asyncio.CancelledError:
+            logger.info("Cancelled tracking for %s", token_address)
+            raise
+        finally:
+            self.tasks.pop(token_address, None)
+
+    def cancel(self, token_address: str):
+        """Stop tracking a token.
+
+        Args:
+            token_address: Token mint address.
+        """
+        task = self.tasks.get(token_address)
+        if task:
+            task.cancel()
+
+    async def shutdown(self):
+        """Cancel all tracking tasks and wait for them to finish."""
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
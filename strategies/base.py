@@ -1,9 +1,104 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+import threading
+from typing import List, NamedTuple
+import numpy as np
 import pandas as pd
+from analysis.cache import IndicatorCache
+
+class SignalMatrix(NamedTuple):
+    """Signals of several strategies over the same bars, one column per strategy."""
+    buy: np.ndarray  # bool, shape (bars, strategies)
+    sell: np.ndarray  # bool, shape (bars, strategies)
+    size: np.ndarray  # float32 order size multiplier, shape (bars, strategies)
+    names: List[str]
+
+    def votes(self) -> np.ndarray:
+        """Return +1 for buy, -1 for sell and 0 otherwise as an int8 matrix."""
+        return self.buy.astype(np.int8) - self.sell.astype(np.int8)
+
+class SignalCache:
+    """LRU cache of strategy signal channels shared by every ensemble.
+
+    Entries are keyed by the strategy's parameters and the content of the
+    frame, so identical components evaluated on the same bars are computed once.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory cap for cached signal arrays.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def frame_key(data: pd.DataFrame) -> tuple:
+        """Hash the numeric contents of a frame."""
+        numeric = data.select_dtypes("number")
+        return tuple(numeric.columns), IndicatorCache.fingerprint(
+            [numeric[column].to_numpy(dtype=np.float64) for column in numeric.columns] or [np.empty(0)])
+
+    def channels(self, strategy, data: pd.DataFrame, frame_key: tuple = None) -> tuple:
+        """Return a strategy's signal channels, computing them only on a miss.
+
+        Args:
+            strategy: Strategy instance.
+            data: DataFrame with price data.
+            frame_key: Precomputed frame_key(data), to hash a frame only once.
+
+        Returns:
+            Tuple of read-only (buy, sell, size) arrays.
+        """
+        strategy_key = strategy.cache_key()
+        if strategy_key is None:
+            return strategy.signal_channels(data)
+        key = (strategy_key, frame_key or self.frame_key(data))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        channels = tuple(np.asarray(channel) for channel in strategy.signal_channels(data))
+        for channel in channels:
+            channel.setflags(write=False)
+        self._store(key, channels, sum(channel.nbytes for channel in channels))
+        return channels
+
+    def _store(self, key: tuple, channels: tuple, nbytes: int):
+        """Insert channels and evict least recently used entries over the cap."""
+        with self._lock:
+            self.misses += 1
+            if key in self._entries or nbytes > self.max_bytes:
+                return
+            self._entries[key] = (channels, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self):
+        """Drop all cached signals."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+signal_cache = SignalCache()
 
 class Strategy(ABC):
     """Abstract base class for trading strategies."""
     
+    # Signals depend only on the scalar parameters and the input bars
+    cacheable = False
+    # Bars the default update keeps to re-evaluate generate_signals
+    update_window = 500
+    
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate buy/sell signals based on input data.
@@ -14,4 +109,93 @@ class Strategy(ABC):
         Returns:
             Series of boolean signals (True for buy, False otherwise).
         """
-        pass
\ No newline at end of file
+        pass
+
+    def update(self, bar) -> bool:
+        """Update streaming indicators with one new bar and return its signal.
+        
+        The default keeps the last update_window bars and re-evaluates the
+        buy channel on them; strategies with streaming indicators override it
+        with an O(1) update.
+        
+        Args:
+            bar: Mapping with price fields for the newest bar (e.g., a DataFrame row).
+        
+        Returns:
+            True for buy, False otherwise.
+        """
+        if getattr(self, "_update_bars", None) is None:
+            self._update_bars = deque(maxlen=self.update_window)
+        self._update_bars.append(bar)
+        buy = self.signal_channels(pd.DataFrame(list(self._update_bars)))[0]
+        return bool(buy[-1]) if len(buy) else False
+
+    def exit_signal(self, price: float, entry_price: float) -> bool:
+        """Decide whether to close a position opened at entry_price.
+        
+        Args:
+            price: Latest price.
+            entry_price: Entry price of the open position.
+        
+        Returns:
+            True to sell; the default never exits.
+        """
+        return False
+
+    def signal_channels(self, data: pd.DataFrame) -> tuple:
+        """Return buy, sell and size arrays for every bar.
+        
+        The default derives buy from generate_signals with no sell signals and
+        a size multiplier of 1.
+        
+        Args:
+            data: DataFrame with price data.
+        
+        Returns:
+            Tuple of (buy bool array, sell bool array, size float32 array).
+        """
+        buy = np.asarray(self.generate_signals(data), dtype=bool)
+        return buy, np.zeros(len(buy), dtype=bool), np.ones(len(buy), dtype=np.float32)
+
+    def cache_key(self):
+        """Identify the strategy's signals for the shared signal cache.
+        
+        Returns:
+            Class name and public parameters for cacheable strategies, None if
+            the strategy is not cacheable or a parameter is not hashable.
+        """
+        if not self.cacheable:
+            return None
+        params = tuple(sorted((name, value.item() if isinstance(value, np.generic) else value)
+                              for name, value in vars(self).items() if not name.startswith("_")))
+        try:
+            hash(params)
+        except TypeError:
+            return None
+        return type(self).__name__, params
+
+def generate_signal_matrix(data: pd.DataFrame, strategies, cache: SignalCache = signal_cache) -> SignalMatrix:
+    """Evaluate several strategies into one columnar signal matrix.
+    
+    Channels shorter than data (strategies that drop warm-up bars) are aligned
+    to the newest bar and padded with no signal.
+    
+    Args:
+        data: DataFrame with price data.
+        strategies: Strategy instances, one column each.
+        cache: Signal cache for cacheable strategies (None to always recompute).
+    
+    Returns:
+        SignalMatrix with (bars, strategies) buy, sell and size arrays.
+    """
+    n, k = len(data), len(strategies)
+    buy = np.zeros((n, k), dtype=bool)
+    sell = np.zeros((n, k), dtype=bool)
+    size = np.ones((n, k), dtype=np.float32)
+    frame_key = cache.frame_key(data) if cache is not None and any(s.cacheable for s in strategies) else None
+    for j, strategy in enumerate(strategies):
+        channels = cache.channels(strategy, data, frame_key) if cache is not None else strategy.signal_channels(data)
+        for out, channel in zip((buy, sell, size), channels):
+            channel = np.asarray(channel)[-n:] if n else np.asarray(channel)[:0]
+            out[n - len(channel):, j] = channel
+    return SignalMatrix(buy, sell, size, [type(strategy).__name__ for strategy in strategies])
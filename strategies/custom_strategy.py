@@ -1,19 +1,260 @@
+import ast
+import numpy as np
 import pandas as pd
+from analysis.cache import indicator_cache
 from .base import Strategy
 
+MAX_LENGTH = 1000  # Characters per expression
+MAX_NODES = 200  # Distinct subexpressions per expression
+MAX_PERIOD = 10000
+
+SERIES = ("open", "high", "low", "close", "volume")
+
+# name: (TA-Lib function, (parameter name, minimum) pairs, output index, inputs); inputs
+# None means one source series (close unless the first argument names another). The
+# minimums are TA-Lib's, which rejects smaller periods with TA_BAD_PARAM.
+FUNCTIONS = {
+    "sma": ("SMA", (("timeperiod", 2),), None, None),
+    "ema": ("EMA", (("timeperiod", 2),), None, None),
+    "rsi": ("RSI", (("timeperiod", 2),), None, None),
+    "roc": ("ROC", (("timeperiod", 1),), None, None),
+    "highest": ("MAX", (("timeperiod", 2),), None, None),
+    "lowest": ("MIN", (("timeperiod", 2),), None, None),
+    "macd": ("MACD", (("fastperiod", 2), ("slowperiod", 2), ("signalperiod", 1)), 0, None),
+    "macd_signal": ("MACD", (("fastperiod", 2), ("slowperiod", 2), ("signalperiod", 1)), 1, None),
+    "atr": ("ATR", (("timeperiod", 1),), None, ("high", "low", "close")),
+}
+
+COMPARISONS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+ARITHMETIC = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+class ExpressionError(ValueError):
+    """Raised when a strategy expression is invalid."""
+
+    def __init__(self, message: str, node: ast.AST = None):
+        column = getattr(node, "col_offset", None)
+        super().__init__(message if column is None else "%s (at column %d)" % (message, column + 1))
+
+class CompiledExpression:
+    """A strategy expression compiled to a straight-line program.
+
+    Every distinct subexpression becomes one step, so shared terms such as the
+    sma(10) in 'sma(10) > sma(50) and close > sma(10)' are computed once per
+    evaluation. Indicator steps go through the shared indicator cache.
+    """
+
+    def __init__(self, expression: str):
+        """Parse, validate and compile an expression.
+
+        Args:
+            expression: Boolean expression, e.g. 'rsi(14) < 30 and sma(10) > sma(50)'.
+
+        Raises:
+            ExpressionError: If the expression is invalid or uses anything
+                outside the whitelisted grammar.
+        """
+        if not isinstance(expression, str):
+            raise ExpressionError("Expression must be a string")
+        if len(expression) > MAX_LENGTH:
+            raise ExpressionError("Expression is longer than %d characters" % MAX_LENGTH)
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError("Syntax error: %s" % e.msg) from None
+        self.expression = expression
+        self.steps = []  # (operation, arguments) in evaluation order
+        self._index = {}  # Step key -> register, for common subexpression elimination
+        output, kind = self._compile(tree.body)
+        if kind != "bool":
+            raise ExpressionError("Expression must be a condition, e.g. 'rsi(14) < 30'")
+        self.output = output
+
+    def _emit(self, key: tuple, kind: str) -> tuple:
+        register = self._index.get(key)
+        if register is None:
+            if len(self.steps) >= MAX_NODES:
+                raise ExpressionError("Expression has more than %d terms" % MAX_NODES)
+            register = self._index[key] = len(self.steps)
+            self.steps.append(key)
+        return register, kind
+
+    def _compile(self, node: ast.AST) -> tuple:
+        """Compile a node and return its (register, kind), kind being 'num' or 'bool'."""
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return self._emit(("const", float(node.value)), "num")
+        if isinstance(node, ast.Name):
+            if node.id not in SERIES:
+                raise ExpressionError("Unknown name '%s'" % node.id, node)
+            return self._emit(("series", node.id), "num")
+        if isinstance(node, ast.Call):
+            return self._compile_call(node)
+        if isinstance(node, ast.UnaryOp):
+            operand, kind = self._compile(node.operand)
+            if isinstance(node.op, ast.Not) and kind == "bool":
+                return self._emit(("not", operand), "bool")
+            if isinstance(node.op, ast.USub) and kind == "num":
+                return self._emit(("neg", operand), "num")
+            raise ExpressionError("Invalid use of unary operator", node)
+        if isinstance(node, ast.BinOp) and type(node.op) in ARITHMETIC:
+            left, right = self._operands([node.left, node.right], "num")
+            return self._emit(("arith", type(node.op), left, right), "num")
+        if isinstance(node, ast.Compare):
+            operands = self._operands([node.left] + node.comparators, "num")
+            result = None
+            for op, left, right in zip(node.ops, operands, operands[1:]):
+                if type(op) not in COMPARISONS:
+                    raise ExpressionError("Unsupported comparison", node)
+                term, _ = self._emit(("compare", type(op), left, right), "bool")
+                result = term if result is None else self._emit(("and", result, term), "bool")[0]
+            return result, "bool"
+        if isinstance(node, ast.BoolOp):
+            operands = self._operands(node.values, "bool")
+            name = "and" if isinstance(node.op, ast.And) else "or"
+            result = operands[0]
+            for operand in operands[1:]:
+                result, _ = self._emit((name, result, operand), "bool")
+            return result, "bool"
+        raise ExpressionError("Unsupported syntax '%s'" % type(node).__name__, node)
+
+    def _operands(self, nodes: list, expected: str) -> list:
+        registers = []
+        for node in nodes:
+            register, kind = self._compile(node)
+            if kind != expected:
+                raise ExpressionError("Expected a %s" % ("number" if expected == "num" else "condition"), node)
+            registers.append(register)
+        return registers
+
+    def _compile_call(self, node: ast.Call) -> tuple:
+        name = getattr(node.func, "id", None)
+        if not isinstance(node.func, ast.Name) or name not in FUNCTIONS:
+            raise ExpressionError("Unknown function '%s'" % (name or ast.unparse(node.func)), node)
+        if node.keywords:
+            raise ExpressionError("%s() takes positional arguments only" % name, node)
+        function, param_specs, output, inputs = FUNCTIONS[name]
+        args = list(node.args)
+        if inputs is None:
+            source = "close"
+            if args and isinstance(args[0], ast.Name):
+                if args[0].id not in SERIES:
+                    raise ExpressionError("Unknown series '%s'" % args[0].id, args[0])
+                source = args.pop(0).id
+            inputs = (source,)
+        if len(args) != len(param_specs):
+            raise ExpressionError("%s() takes %d period argument(s)" % (name, len(param_specs)), node)
+        params = []
+        for arg, (param, minimum) in zip(args, param_specs):
+            if not (isinstance(arg, ast.Constant) and type(arg.value) is int and minimum <= arg.value <= MAX_PERIOD):
+                raise ExpressionError("%s() %s must be an integer from %d to %d" % (name, param, minimum, MAX_PERIOD),
+                                      arg)
+            params.append((param, arg.value))
+        return self._emit(("indicator", function, inputs, tuple(params), output), "num")
+
+    def evaluate(self, data: pd.DataFrame) -> np.ndarray:
+        """Run the program over a frame.
+
+        Args:
+            data: DataFrame with the series the expression uses.
+
+        Returns:
+            Boolean array, one value per bar. Bars where any series or
+            indicator operand is undefined (e.g., indicator warm-up) are False,
+            so 'not' and 'or' cannot turn missing inputs into signals.
+        """
+        registers = []
+        defined = np.ones(len(data), dtype=bool)
+        for step in self.steps:
+            operation = step[0]
+            if operation == "const":
+                value = step[1]
+            elif operation == "series":
+                if step[1] not in data:
+                    raise ExpressionError("Data has no '%s' column" % step[1])
+                value = data[step[1]].to_numpy(dtype=np.float64)
+                defined &= np.isfinite(value)
+            elif operation == "indicator":
+                _, function, inputs, params, output = step
+                missing = [column for column in inputs if column not in data]
+                if missing:
+                    raise ExpressionError("Data has no '%s' column" % missing[0])
+                result = indicator_cache.get(function, *(data[column] for column in inputs), **dict(params))
+                value = (result[output] if output is not None else result).to_numpy()
+                defined &= np.isfinite(value)
+            elif operation == "neg":
+                value = -registers[step[1]]
+            elif operation == "not":
+                value = ~registers[step[1]]
+            elif operation == "arith":
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    value = ARITHMETIC[step[1]](registers[step[2]], registers[step[3]])
+            elif operation == "compare":
+                with np.errstate(invalid="ignore"):
+                    value = COMPARISONS[step[1]](registers[step[2]], registers[step[3]])
+            elif operation == "and":
+                value = registers[step[1]] & registers[step[2]]
+            else:
+                value = registers[step[1]] | registers[step[2]]
+            registers.append(value)
+        return np.broadcast_to(registers[self.output], (len(data),)) & defined
+
+def validate_expression(expression: str) -> str:
+    """Check an expression without evaluating it.
+
+    Args:
+        expression: Strategy expression.
+
+    Returns:
+        None if the expression is valid, otherwise the error message.
+    """
+    try:
+        CompiledExpression(expression)
+        return None
+    except ExpressionError as e:
+        return str(e)
+
 class CustomStrategy(Strategy):
     """User-defined custom trading strategy."""
-    
+
+    cacheable = True
+
+    def __init__(self, expression: str = "roc(1) > 0"):
+        """Compile a user expression.
+
+        Expressions combine price series (open, high, low, close, volume),
+        indicators (sma, ema, rsi, roc, highest, lowest, macd, macd_signal,
+        atr), arithmetic, comparisons and and/or/not, for example
+        'rsi(14) < 30 and sma(10) > sma(50)'. They are compiled from a
+        whitelisted syntax tree and never passed to eval.
+
+        Args:
+            expression: Buy condition.
+
+        Raises:
+            ExpressionError: If the expression is invalid.
+        """
+        self.expression = expression
+        self._program = CompiledExpression(expression)
+
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
-        """Generate custom signals (placeholder for UI/script input).
-        
+        """Generate signals by evaluating the compiled expression.
+
         Args:
             data: DataFrame with price data.
-        
+
         Returns:
             Series of boolean signals (True for buy, False for no action).
         """
-        # Example: Simple momentum strategy
-        returns = data['close'].pct_change()
-        signals = (returns > 0).astype(bool)
-        return signals
\ No newline at end of file
+        return pd.Series(self._program.evaluate(data), index=data.index)
@@ -1,10 +1,13 @@
-import talib as ta
 import pandas as pd
+from analysis.cache import indicator_cache
+from analysis.streaming import StreamingSMA
 from .base import Strategy
 
 class MACrossoverStrategy(Strategy):
     """Moving Average Crossover strategy using short and long MAs."""
     
+    cacheable = True
+    
     def __init__(self, short_period: int = 50, long_period: int = 200):
         """Initialize the strategy with MA periods.
         
@@ -14,6 +17,7 @@ class MACrossoverStrategy(Strategy):
         """
         self.short_period = short_period
         self.long_period = long_period
+        self._stream = None
     
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate signals based on MA crossover.
@@ -24,7 +28,21 @@ class MACrossoverStrategy(Strategy):
         Returns:
             Series of boolean signals (True for buy, False for sell/no action).
         """
-        short_ma = ta.SMA(data['close'], timeperiod=self.short_period)
-        long_ma = ta.SMA(data['close'], timeperiod=self.long_period)
+        short_ma = indicator_cache.get("SMA", data['close'], timeperiod=self.short_period)
+        long_ma = indicator_cache.get("SMA", data['close'], timeperiod=self.long_period)
         signals = (short_ma > long_ma).astype(bool)
-        return signals
\ No newline at end of file
+        return signals
+    
+    def update(self, bar) -> bool:
+        """Update streaming MAs with a new bar in O(1).
+        
+        Args:
+            bar: Mapping with a 'close' value.
+        
+        Returns:
+            True for buy, False for sell/no action.
+        """
+        if self._stream is None:
+            self._stream = (StreamingSMA(self.short_period), StreamingSMA(self.long_period))
+        short_ma, long_ma = (ma.update(bar['close']) for ma in self._stream)
+        return bool(short_ma > long_ma)
\ No newline at end of file
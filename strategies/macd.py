@@ -1,10 +1,13 @@
-import talib as ta
 import pandas as pd
+from analysis.cache import indicator_cache
+from analysis.streaming import StreamingMACD
 from .base import Strategy
 
 class MACDStrategy(Strategy):
     """MACD-based trading strategy."""
     
+    cacheable = True
+    
     def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
         """Initialize MACD strategy parameters.
         
@@ -16,6 +19,7 @@ class MACDStrategy(Strategy):
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.signal_period = signal_period
+        self._stream = None
     
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate signals based on MACD crossover.
@@ -26,7 +30,21 @@ class MACDStrategy(Strategy):
         Returns:
             Series of boolean signals (True for buy, False for no action).
         """
-        macd, signal, _ = ta.MACD(data['close'], fastperiod=self.fast_period, 
-                                slowperiod=self.slow_period, signalperiod=self.signal_period)
+        macd, signal, _ = indicator_cache.get("MACD", data['close'], fastperiod=self.fast_period,
+                                              slowperiod=self.slow_period, signalperiod=self.signal_period)
         signals = (macd > signal).astype(bool)
-        return signals
\ No newline at end of file
+        return signals
+    
+    def update(self, bar) -> bool:
+        """Update the streaming MACD with a new bar in O(1).
+        
+        Args:
+            bar: Mapping with a 'close' value.
+        
+        Returns:
+            True for buy, False for no action.
+        """
+        if self._stream is None:
+            self._stream = StreamingMACD(self.fast_period, self.slow_period, self.signal_period)
+        macd, signal, _ = self._stream.update(bar['close'])
+        return bool(macd > signal)
\ No newline at end of file
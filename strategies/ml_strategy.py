@@ -1,39 +1,187 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
+from analysis.cache import IndicatorCache
 from .base import Strategy
 import logging
 
 logger = logging.getLogger(__name__)
 
+FEATURES = ["ret_1", "ret_3", "ret_5", "ret_10", "volume_change", "volatility_10",
+            "sma_ratio_10", "sma_ratio_30", "volume_zscore_20", "rsi_14"]
+WARMUP = 30  # Bars needed before every feature is defined
+
+def build_features(data: pd.DataFrame) -> np.ndarray:
+    """Compute the feature matrix for every bar in one pass.
+
+    Args:
+        data: DataFrame with 'close' and 'volume' columns.
+
+    Returns:
+        float32 array of shape (bars, len(FEATURES)); warm-up rows contain NaN.
+    """
+    close = pd.Series(np.asarray(data['close'], dtype=np.float64))
+    volume = pd.Series(np.asarray(data['volume'], dtype=np.float64))
+    returns = close.pct_change()
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14).mean()
+    volume_mean = volume.rolling(20).mean()
+    volume_std = volume.rolling(20).std()
+    columns = [
+        returns,
+        close.pct_change(3),
+        close.pct_change(5),
+        close.pct_change(10),
+        volume.pct_change(),
+        returns.rolling(10).std(),
+        close / close.rolling(10).mean() - 1,
+        close / close.rolling(30).mean() - 1,
+        (volume - volume_mean) / volume_std.where(volume_std > 0),
+        100 - 100 / (1 + gain / loss.where(loss > 0)),
+    ]
+    features = np.column_stack([column.to_numpy() for column in columns]).astype(np.float32)
+    features[~np.isfinite(features)] = np.nan
+    return features
+
+def _fit_window(params: dict, X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray,
+                y_test: np.ndarray) -> tuple:
+    """Fit one walk-forward window and score it on the following bars."""
+    model = RandomForestClassifier(**params)
+    model.fit(X_train, y_train)
+    accuracy = float((model.predict(X_test) == y_test).mean()) if len(X_test) else np.nan
+    return model, accuracy
+
 class MLStrategy(Strategy):
     """Machine learning-based trading strategy using Random Forest."""
-    
-    def __init__(self):
-        """Initialize the ML model."""
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+
+    def __init__(self, n_estimators: int = 100, n_jobs: int = None, model_path: str = None):
+        """Initialize the ML model, loading a saved one if available.
+
+        Args:
+            n_estimators: Number of trees.
+            n_jobs: Worker processes for walk-forward training (defaults to all cores).
+            model_path: File the trained model is saved to and loaded from.
+        """
+        self.params = {"n_estimators": n_estimators, "random_state": 42}
+        self.model = RandomForestClassifier(**self.params)
         self.is_trained = False
-    
+        self.n_jobs = n_jobs or os.cpu_count()
+        self.model_path = model_path
+        self._features = None  # (fingerprint, matrix) of the last frame scored
+        self._bars = deque(maxlen=WARMUP + 1)
+        if model_path and os.path.exists(model_path):
+            self.load(model_path)
+
+    def features(self, data: pd.DataFrame) -> np.ndarray:
+        """Return the feature matrix for data, reusing it if the frame is unchanged."""
+        key = IndicatorCache.fingerprint([np.asarray(data['close'], dtype=np.float64),
+                                          np.asarray(data['volume'], dtype=np.float64)])
+        if self._features is None or self._features[0] != key:
+            self._features = (key, build_features(data))
+        return self._features[1]
+
+    def _training_set(self, data: pd.DataFrame) -> tuple:
+        X = self.features(data)
+        close = np.asarray(data['close'], dtype=np.float64)
+        y = np.zeros(len(close), dtype=np.int8)
+        y[:-1] = close[1:] > close[:-1]  # Buy if price increases
+        valid = ~np.isnan(X).any(axis=1)
+        valid[-1] = False  # The newest bar has no outcome yet
+        return X, y, valid
+
     def train(self, data: pd.DataFrame):
         """Train the ML model on historical data.
-        
+
         Args:
             data: DataFrame with 'close', 'volume' columns and target (1 for buy, 0 for hold/sell).
         """
         try:
-            features = data[['close', 'volume']].pct_change().dropna()
-            target = (data['close'].shift(-1) > data['close']).astype(int)[1:]  # Buy if price increases
-            self.model.fit(features, target)
+            X, y, valid = self._training_set(data)
+            self.model = RandomForestClassifier(n_jobs=-1, **self.params)
+            self.model.fit(X[valid], y[valid])
             self.is_trained = True
-            logger.info("Trained ML model with %d samples", len(features))
+            logger.info("Trained ML model with %d samples", valid.sum())
+            if self.model_path:
+                self.save(self.model_path)
         except Exception as e:
             logger.error("Failed to train ML model: %s", e)
-    
+
+    def walk_forward(self, data: pd.DataFrame, train_size: int = 1000, test_size: int = 200) -> pd.DataFrame:
+        """Train rolling windows in parallel and score each on the bars after it.
+
+        Features are computed once for the whole frame; each worker receives
+        only its window's slices. The model of the most recent window becomes
+        the live model.
+
+        Args:
+            data: DataFrame with 'close', 'volume' columns.
+            train_size: Training bars per window.
+            test_size: Out-of-sample bars after each window (also the step).
+
+        Returns:
+            DataFrame with one row per window: train_start, train_end,
+            test_end (bar timestamps) and out-of-sample accuracy.
+        """
+        X, y, valid = self._training_set(data)
+        rows = np.flatnonzero(valid)
+        starts = range(0, len(rows) - train_size + 1, test_size)
+        if not starts:
+            raise ValueError(f"Need at least {train_size} valid bars, got {len(rows)}")
+        windows = [(rows[i:i + train_size], rows[i + train_size:i + train_size + test_size]) for i in starts]
+        params = {**self.params, "n_jobs": 1}  # Parallelism comes from the process pool
+        with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(windows)),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_fit_window, params, X[train], y[train], X[test], y[test])
+                       for train, test in windows]
+            fitted = [future.result() for future in futures]
+        self.model = fitted[-1][0]
+        self.is_trained = True
+        if self.model_path:
+            self.save(self.model_path)
+        index = data.index
+        report = pd.DataFrame({
+            "train_start": [index[train[0]] for train, _ in windows],
+            "train_end": [index[train[-1]] for train, _ in windows],
+            "test_end": [index[test[-1]] if len(test) else pd.NaT for _, test in windows],
+            "accuracy": [accuracy for _, accuracy in fitted],
+        })
+        logger.info("Walk-forward trained %d windows, mean accuracy %.3f", len(report), report["accuracy"].mean())
+        return report
+
+    def save(self, path: str):
+        """Persist the trained model.
+
+        Args:
+            path: Destination file.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self.model, path)
+        logger.info("Saved ML model to %s", path)
+
+    def load(self, path: str):
+        """Load a previously saved model instead of retraining.
+
+        Args:
+            path: File written by save().
+        """
+        self.model = joblib.load(path)
+        self.is_trained = True
+        logger.info("Loaded ML model from %s", path)
+
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate signals using the trained ML model.
-        
+
         Args:
             data: DataFrame with 'close', 'volume' columns.
-        
+
         Returns:
             Series of boolean signals (True for buy, False for no action).
         """
@@ -41,11 +189,35 @@ class MLStrategy(Strategy):
             logger.warning("Model not trained; returning empty signals")
             return pd.Series([False] * len(data), index=data.index)
         try:
-            features = data[['close', 'volume']].pct_change().dropna()
-            predictions = self.model.predict(features)
-            signals = pd.Series(predictions, index=features.index).astype(bool)
-            logger.info("Generated %d ML signals", len(signals))
+            X = self.features(data)
+            valid = ~np.isnan(X).any(axis=1)
+            predictions = np.zeros(len(data), dtype=bool)
+            if valid.any():
+                predictions[valid] = self.model.predict(X[valid]).astype(bool)
+            signals = pd.Series(predictions, index=data.index)
+            logger.debug("Generated %d ML signals", len(signals))
             return signals
         except Exception as e:
             logger.error("Failed to generate ML signals: %s", e)
-            return pd.Series([False] * len(data), index=data.index)
\ No newline at end of file
+            return pd.Series([False] * len(data), index=data.index)
+
+    def update(self, bar) -> bool:
+        """Score only the newest bar.
+
+        Features are computed over the last WARMUP + 1 bars instead of the
+        whole history.
+
+        Args:
+            bar: Mapping with 'close' and 'volume' values.
+
+        Returns:
+            True for buy, False otherwise.
+        """
+        self._bars.append((bar['close'], bar['volume']))
+        if not self.is_trained or len(self._bars) < self._bars.maxlen:
+            return False
+        window = np.array(self._bars, dtype=np.float64)
+        features = build_features(pd.DataFrame({"close": window[:, 0], "volume": window[:, 1]}))[-1:]
+        if np.isnan(features).any():
+            return False
+        return bool(self.model.predict(features)[0])
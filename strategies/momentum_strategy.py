@@ -1,8 +1,13 @@
+from collections import deque
+import numpy as np
 import pandas as pd
+from .base import Strategy
 
-class MomentumStrategy:
+class MomentumStrategy(Strategy):
     """Momentum-based strategy for memecoin trading."""
     
+    cacheable = True
+    
     def __init__(self, lookback_period: int = 5, threshold: float = 0.05, profit_target: float = 0.5, stop_loss: float = 0.2):
         """Initialize with lookback period, threshold, and trade parameters.
         
@@ -16,12 +21,13 @@ class MomentumStrategy:
         self.threshold = threshold
         self.profit_target = profit_target
         self.stop_loss = stop_loss
+        self._closes = None
     
     def generate_signals(self, data: pd.DataFrame, entry_price: float = None) -> dict:
         """Generate buy/sell signals based on momentum and trade parameters.
         
         Args:
-            data: DataFrame with 'close' prices.
+            data: DataFrame or PriceBuffer with 'close' prices.
             entry_price: Entry price for tracking profit/loss (optional).
         
         Returns:
@@ -30,10 +36,67 @@ class MomentumStrategy:
         signals = {"buy": False, "sell": False}
         if len(data) < self.lookback_period:
             return signals
-        recent_change = (data['close'].iloc[-1] - data['close'].iloc[-self.lookback_period]) / data['close'].iloc[-self.lookback_period]
-        signals["buy"] = recent_change > self.threshold
+        close = np.asarray(data['close'])
+        recent_change = (close[-1] - close[-self.lookback_period]) / close[-self.lookback_period]
+        signals["buy"] = bool(recent_change > self.threshold)
         if entry_price:
-            current_price = data['close'].iloc[-1]
-            profit = (current_price - entry_price) / entry_price
-            signals["sell"] = profit >= self.profit_target or profit <= -self.stop_loss
-        return signals
\ No newline at end of file
+            signals["sell"] = self.exit_signal(close[-1], entry_price)
+        return signals
+
+    def update(self, bar) -> bool:
+        """Update with a new bar in O(1) and return the buy signal.
+        
+        Equivalent to generate_signals(history)["buy"] on the full bar history.
+        
+        Args:
+            bar: Mapping with a 'close' value (e.g., a DataFrame row).
+        
+        Returns:
+            True for buy, False otherwise.
+        """
+        if self._closes is None or self._closes.maxlen != self.lookback_period:
+            self._closes = deque(self._closes or (), maxlen=self.lookback_period)
+        current_price = bar['close']
+        self._closes.append(current_price)
+        if len(self._closes) < self.lookback_period:
+            return False
+        return bool((current_price - self._closes[0]) / self._closes[0] > self.threshold)
+
+    def exit_signal(self, price: float, entry_price: float) -> bool:
+        """Sell at the profit target or the stop loss.
+        
+        Args:
+            price: Latest price.
+            entry_price: Entry price of the open position.
+        
+        Returns:
+            True to sell.
+        """
+        profit = (price - entry_price) / entry_price
+        return bool(profit >= self.profit_target or profit <= -self.stop_loss)
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """Generate the buy condition for every bar (used for backtesting).
+
+        Args:
+            data: DataFrame with 'close' prices.
+
+        Returns:
+            Series of boolean signals (True for buy, False for no action).
+        """
+        recent_change = data['close'].pct_change(self.lookback_period - 1)
+        return (recent_change > self.threshold).astype(bool)
+
+    def signal_channels(self, data: pd.DataFrame) -> tuple:
+        """Return buy, sell and size arrays for every bar.
+
+        Sell signals depend on a live entry price, so the sell channel is empty.
+
+        Args:
+            data: DataFrame with 'close' prices.
+
+        Returns:
+            Tuple of (buy bool array, sell bool array, size float32 array).
+        """
+        buy = self.generate_signal_series(data).to_numpy(dtype=bool)
+        return buy, np.zeros(len(buy), dtype=bool), np.ones(len(buy), dtype=np.float32)
@@ -1,23 +1,53 @@
+import os
+from functools import partial
 import gym
 from gym import spaces
 import numpy as np
 import pandas as pd
 from stable_baselines3 import DQN
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 from .base import Strategy
+import logging
+
+logger = logging.getLogger(__name__)
+
+def build_observations(data: pd.DataFrame) -> np.ndarray:
+    """Precompute the observation for every bar.
+
+    Args:
+        data: DataFrame of numeric market columns.
+
+    Returns:
+        float32 array of shape (bars, numeric columns).
+    """
+    return np.ascontiguousarray(data.select_dtypes("number").to_numpy(dtype=np.float32))
 
 class TradingEnv(gym.Env):
     """Custom Gym environment for trading."""
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, observations: np.ndarray, close: np.ndarray):
+        """Initialize the environment from precomputed arrays.
+
+        Args:
+            observations: float32 observation matrix from build_observations.
+            close: Close price per bar.
+        """
         super(TradingEnv, self).__init__()
-        self.data = data
+        self.observations = observations
+        self.close = np.asarray(close, dtype=np.float64)
         self.current_step = 0
         self.action_space = spaces.Discrete(3)  # 0: hold, 1: buy, 2: sell
-        self.observation_space = spaces.Box(low=0, high=1, shape=(len(data.columns),), dtype=np.float32)
+        self.observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(observations.shape[1],),
+                                            dtype=np.float32)
         self.position = 0  # 0: no position, 1: long, -1: short
         self.cash = 10000
         self.asset = 0
 
+    @classmethod
+    def from_data(cls, data: pd.DataFrame) -> "TradingEnv":
+        """Build an environment from a DataFrame with a 'close' column."""
+        return cls(build_observations(data), data['close'].to_numpy())
+
     def reset(self):
         self.current_step = 0
         self.position = 0
@@ -28,40 +58,80 @@ class TradingEnv(gym.Env):
     def step(self, action):
         reward = 0
         done = False
+        price = self.close[self.current_step]
         if action == 1 and self.position == 0:  # Buy
             self.position = 1
-            self.asset = self.cash / self.data['close'].iloc[self.current_step]
+            self.asset = self.cash / price
             self.cash = 0
         elif action == 2 and self.position == 1:  # Sell
             self.position = 0
-            self.cash = self.asset * self.data['close'].iloc[self.current_step]
+            self.cash = self.asset * price
             self.asset = 0
             reward = (self.cash - 10000) / 10000  # Profit percentage
 
         self.current_step += 1
-        if self.current_step >= len(self.data):
+        if self.current_step >= len(self.close):
             done = True
 
         return self._get_observation(), reward, done, {}
 
     def _get_observation(self):
-        return self.data.iloc[self.current_step].values
+        # The terminal observation repeats the last bar
+        return self.observations[min(self.current_step, len(self.observations) - 1)]
 
 class RLStrategy(Strategy):
     """Reinforcement learning-based trading strategy using DQN."""
-    def __init__(self, data: pd.DataFrame):
-        self.env = DummyVecEnv([lambda: TradingEnv(data)])
-        self.model = DQN("MlpPolicy", self.env, verbose=1)
-        self.model.learn(total_timesteps=10000)
+    def __init__(self, model_path: str = None, n_envs: int = 4):
+        """Initialize the strategy, loading a saved model if available.
+
+        Args:
+            model_path: File the trained model is saved to and loaded from.
+            n_envs: Parallel environments (subprocesses) used for training.
+        """
+        self.model_path = model_path
+        self.n_envs = n_envs
+        self.model = None
+        if model_path and os.path.exists(model_path):
+            self.model = DQN.load(model_path)
+            logger.info("Loaded RL model from %s", model_path)
+
+    def train(self, data: pd.DataFrame, total_timesteps: int = 10000, checkpoint_dir: str = None,
+              checkpoint_freq: int = 10000):
+        """Train (or continue training) the DQN on n_envs parallel environments.
+
+        Args:
+            data: DataFrame with 'close' and other numeric columns.
+            total_timesteps: Environment steps to train for, summed over all envs.
+            checkpoint_dir: Directory for periodic checkpoints (none if None).
+            checkpoint_freq: Steps between checkpoints, summed over all envs.
+        """
+        make_env = partial(TradingEnv, build_observations(data), data['close'].to_numpy())
+        vec_env = SubprocVecEnv if self.n_envs > 1 else DummyVecEnv
+        env = vec_env([make_env] * self.n_envs)
+        try:
+            if self.model is None:
+                self.model = DQN("MlpPolicy", env, verbose=0)
+            else:
+                self.model.set_env(env)
+            callback = None
+            if checkpoint_dir:
+                callback = CheckpointCallback(save_freq=max(checkpoint_freq // self.n_envs, 1),
+                                              save_path=checkpoint_dir, name_prefix="rl_model")
+            self.model.learn(total_timesteps=total_timesteps, callback=callback, reset_num_timesteps=False)
+        finally:
+            env.close()
+        logger.info("Trained RL model for %d steps on %d envs", total_timesteps, self.n_envs)
+        if self.model_path:
+            self.model.save(self.model_path)
 
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
-        """Generate signals using the trained RL model."""
-        obs = self.env.reset()
-        signals = []
-        for _ in range(len(data)):
-            action, _states = self.model.predict(obs)
-            signals.append(action == 1)  # Buy if action is 1
-            obs, _, done, _ = self.env.step(action)
-            if done:
-                break
-        return pd.Series(signals, index=data.index)
\ No newline at end of file
+        """Generate signals using the trained RL model.
+
+        Observations do not depend on the agent's position, so the whole frame
+        is scored with one batched predict call.
+        """
+        if self.model is None:
+            logger.warning("Model not trained; returning empty signals")
+            return pd.Series([False] * len(data), index=data.index)
+        actions, _states = self.model.predict(build_observations(data), deterministic=True)
+        return pd.Series(np.asarray(actions) == 1, index=data.index)  # Buy if action is 1
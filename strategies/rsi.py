@@ -1,10 +1,13 @@
-import talib as ta
 import pandas as pd
+from analysis.cache import indicator_cache
+from analysis.streaming import StreamingRSI
 from .base import Strategy
 
 class RSIStrategy(Strategy):
     """RSI-based trading strategy."""
     
+    cacheable = True
+    
     def __init__(self, period: int = 14, overbought: float = 70, oversold: float = 30):
         """Initialize RSI strategy parameters.
         
@@ -16,6 +19,7 @@ class RSIStrategy(Strategy):
         self.period = period
         self.overbought = overbought
         self.oversold = oversold
+        self._stream = None
     
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
         """Generate signals based on RSI levels.
@@ -26,6 +30,19 @@ class RSIStrategy(Strategy):
         Returns:
             Series of boolean signals (True for buy, False for no action/sell).
         """
-        rsi = ta.RSI(data['close'], timeperiod=self.period)
+        rsi = indicator_cache.get("RSI", data['close'], timeperiod=self.period)
         signals = (rsi < self.oversold).astype(bool)
-        return signals
\ No newline at end of file
+        return signals
+    
+    def update(self, bar) -> bool:
+        """Update the streaming RSI with a new bar in O(1).
+        
+        Args:
+            bar: Mapping with a 'close' value.
+        
+        Returns:
+            True for buy, False for no action/sell.
+        """
+        if self._stream is None:
+            self._stream = StreamingRSI(self.period)
+        return bool(self._stream.update(bar['close']) < self.oversold)
\ No newline at end of file
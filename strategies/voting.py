@@ -1,30 +1,134 @@
+from collections import deque
+import numpy as np
 import pandas as pd
-from .base import Strategy
+from .base import Strategy, generate_signal_matrix
 from .ma_crossover import MACrossoverStrategy
 from .rsi import RSIStrategy
 from .macd import MACDStrategy
 
 class VotingStrategy(Strategy):
-    """Strategy combining multiple indicators via majority voting."""
-    
-    def __init__(self):
-        """Initialize component strategies."""
-        self.strategies = [
+    """Strategy combining multiple indicators via weighted voting.
+
+    With adaptive weighting each component's weight is scaled by its rolling
+    hit rate: the share of its recent buy signals that were followed by a
+    higher close on the next bar.
+    """
+
+    def __init__(self, strategies=None, weights=None, threshold: float = 0.5, adaptive: bool = False,
+                 window: int = 50):
+        """Initialize component strategies and weights.
+
+        Args:
+            strategies: Component strategy instances (MA crossover, RSI and
+                MACD with default parameters if None).
+            weights: Non-negative base weight per component, not all zero
+                (equal if None).
+            threshold: Buy when the weighted share of buy votes exceeds this;
+                0.5 with equal weights is a simple majority.
+            adaptive: Scale weights by each component's rolling hit rate.
+            window: Number of bars in the hit rate window.
+        
+        Raises:
+            ValueError: If weights do not match the components, are negative
+                or are all zero.
+        """
+        self.strategies = strategies if strategies is not None else [
             MACrossoverStrategy(),
             RSIStrategy(),
             MACDStrategy()
         ]
-    
+        self.weights = np.ones(len(self.strategies)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(self.weights) != len(self.strategies):
+            raise ValueError("Need one weight per component strategy")
+        if (self.weights < 0).any() or not self.weights.any():
+            raise ValueError("Weights must be non-negative and not all zero")
+        self.threshold = threshold
+        self.adaptive = adaptive
+        self.window = window
+        self._votes = None
+        self._last_close = None
+        self._history = None
+        self._calls = None
+        self._hits = None
+
+    def hit_rate_weights(self, buy: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """Compute causal per-bar adaptive weights for a buy matrix.
+
+        The weight at bar t only uses outcomes known by bar t. Hit rates use a
+        Laplace prior, so components without recent buy signals weigh 0.5.
+
+        Args:
+            buy: Boolean (bars, components) buy matrix.
+            close: Close price per bar.
+
+        Returns:
+            Array of shape (bars, components) with base weight times hit rate.
+        """
+        rose = np.zeros(len(close), dtype=bool)
+        rose[:-1] = close[1:] > close[:-1]
+        hits = buy & rose[:, None]
+        # Bar t sees the outcomes of bars t - window .. t - 1
+        hit_sums = np.zeros((len(close) + 1, buy.shape[1]))
+        call_sums = np.zeros_like(hit_sums)
+        hit_sums[1:] = np.cumsum(hits, axis=0)
+        call_sums[1:] = np.cumsum(buy, axis=0)
+        t = np.arange(len(close))
+        start = np.maximum(t - self.window, 0)
+        hit_rate = (hit_sums[t] - hit_sums[start] + 1) / (call_sums[t] - call_sums[start] + 2)
+        return self.weights * hit_rate
+
     def generate_signals(self, data: pd.DataFrame) -> pd.Series:
-        """Generate signals based on majority vote.
-        
+        """Generate signals based on a weighted vote.
+
+        Component signals come from the shared signal cache, so components
+        already evaluated on the same bars are not recomputed.
+
         Args:
             data: DataFrame with 'close' column.
-        
+
         Returns:
             Series of boolean signals (True for buy, False for no action).
         """
-        votes = [strategy.generate_signals(data) for strategy in self.strategies]
-        vote_sum = sum(votes)
-        signals = (vote_sum > len(self.strategies) / 2).astype(bool)
-        return signals
\ No newline at end of file
+        matrix = generate_signal_matrix(data, self.strategies)
+        if self.adaptive:
+            weights = self.hit_rate_weights(matrix.buy, np.asarray(data['close'], dtype=np.float64))
+            # Bars whose adaptive weights all decayed to zero fall back to equal weights
+            weights = np.where(weights.sum(axis=1, keepdims=True) > 0, weights, 1.0)
+            score = (matrix.buy * weights).sum(axis=1) / weights.sum(axis=1)
+        else:
+            score = matrix.buy @ self.weights / self.weights.sum()
+        return pd.Series(score > self.threshold, index=data.index)
+
+    def update(self, bar) -> bool:
+        """Update every component with a new bar and return the weighted vote.
+
+        Hit rates are kept as running sums over the last window resolved bars,
+        so an update costs one streaming update per component.
+
+        Args:
+            bar: Mapping with the fields the components need (e.g., 'close').
+
+        Returns:
+            True for buy, False otherwise.
+        """
+        if self._history is None:
+            self._history = deque()
+            self._calls = np.zeros(len(self.strategies))
+            self._hits = np.zeros(len(self.strategies))
+        close = bar['close']
+        if self._votes is not None:
+            # This close resolves the previous bar's votes
+            hits = self._votes & (close > self._last_close)
+            self._history.append((self._votes, hits))
+            self._calls += self._votes
+            self._hits += hits
+            if len(self._history) > self.window:
+                old_votes, old_hits = self._history.popleft()
+                self._calls -= old_votes
+                self._hits -= old_hits
+        votes = np.array([bool(strategy.update(bar)) for strategy in self.strategies])
+        weights = self.weights * (self._hits + 1) / (self._calls + 2) if self.adaptive else self.weights
+        if not weights.sum() > 0:
+            weights = np.ones_like(weights)
+        self._votes, self._last_close = votes, close
+        return bool(votes @ weights / weights.sum() > self.threshold)
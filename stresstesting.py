@@ -1,19 +1,135 @@
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-from backtesting import Backtester
+from backtesting import Backtester, INITIAL_CASH, buy_signals, simulate
 import logging
 
 logger = logging.getLogger(__name__)
 
+SCENARIOS = ("bootstrap", "rug_pull", "flash_crash", "vol_regime")
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+def bootstrap(close: np.ndarray, rng: np.random.Generator, n: int, block_size: int = 10):
+    """Rebuild paths from blocks of historical log returns drawn with replacement.
+
+    Returns:
+        Tuple of (price factors, volume factors), each of shape (n, bars).
+    """
+    returns = np.nan_to_num(np.diff(np.log(close)))
+    m = len(returns)
+    block_size = max(1, min(block_size, m))
+    starts = rng.integers(0, m - block_size + 1, (n, -(-m // block_size)))
+    idx = (starts[..., None] + np.arange(block_size)).reshape(n, -1)[:, :m]
+    paths = close[0] * np.exp(np.concatenate([np.zeros((n, 1)), np.cumsum(returns[idx], axis=1)], axis=1))
+    return paths / close, np.ones((n, len(close)))
+
+def rug_pull(close: np.ndarray, rng: np.random.Generator, n: int, depth=(0.8, 0.99), duration=(1, 10)):
+    """Drain liquidity at a random bar: price falls by depth over a few bars and never recovers.
+
+    Returns:
+        Tuple of (price factors, volume factors), each of shape (n, bars).
+    """
+    t = np.arange(len(close))
+    offset = rng.integers(1, len(close), n)[:, None]
+    length = rng.integers(duration[0], duration[1] + 1, n)[:, None]
+    drop = rng.uniform(*depth, n)[:, None]
+    progress = np.clip((t - offset + 1) / length, 0, 1)
+    return 1 - drop * progress, np.where(t >= offset, 1 - drop, 1.0)
+
+def flash_crash(close: np.ndarray, rng: np.random.Generator, n: int, depth=(0.3, 0.7), recovery=(5, 60)):
+    """Crash by depth at a random bar and recover linearly over the following bars.
+
+    Returns:
+        Tuple of (price factors, volume factors), each of shape (n, bars).
+    """
+    t = np.arange(len(close))
+    offset = rng.integers(1, len(close), n)[:, None]
+    length = rng.integers(recovery[0], recovery[1] + 1, n)[:, None]
+    drop = rng.uniform(*depth, n)[:, None]
+    shape = np.where(t >= offset, np.clip(1 - (t - offset) / length, 0, 1), 0.0)
+    return 1 - drop * shape, np.ones((n, len(close)))
+
+def vol_regime(close: np.ndarray, rng: np.random.Generator, n: int, multipliers=(0.5, 1.0, 2.0, 4.0),
+               regime_length: int = 60):
+    """Scale return volatility by a randomly drawn multiplier per regime of bars.
+
+    Returns:
+        Tuple of (price factors, volume factors), each of shape (n, bars).
+    """
+    returns = np.nan_to_num(np.diff(np.log(close)))
+    m = len(returns)
+    regimes = rng.choice(multipliers, (n, -(-m // regime_length)))
+    scale = np.repeat(regimes, regime_length, axis=1)[:, :m]
+    excess = (returns - returns.mean()) * (scale - 1)  # Extra deviation around the mean return
+    factor = np.exp(np.concatenate([np.zeros((n, 1)), np.cumsum(excess, axis=1)], axis=1))
+    return factor, np.ones((n, len(close)))
+
+GENERATORS = {
+    "bootstrap": bootstrap,
+    "rug_pull": rug_pull,
+    "flash_crash": flash_crash,
+    "vol_regime": vol_regime,
+}
+
+# Per-worker copy of the base frame, set by _attach_data.
+_data = None
+
+def _attach_data(data: pd.DataFrame):
+    """Give a worker process the base frame once instead of with every task."""
+    global _data
+    _data = data
+
+def _path_metrics(equity: np.ndarray, stop_drawdown: float) -> tuple:
+    """Return (max drawdown, bars until the stop drawdown was first hit or NaN)."""
+    drawdown = 1 - equity / np.maximum.accumulate(equity)
+    stopped = np.flatnonzero(drawdown >= stop_drawdown)
+    return float(drawdown.max()), float(stopped[0]) if len(stopped) else np.nan
+
+def _run_paths(strategy, scenario: str, seed, n: int, stop_drawdown: float) -> list:
+    """Generate n stressed paths of the shared frame and backtest each one."""
+    rng = np.random.default_rng(seed)
+    close = _data["close"].to_numpy(dtype=np.float64)
+    factors, volume_factors = GENERATORS[scenario](close, rng, n)
+    rows = []
+    for factor, volume_factor in zip(factors, volume_factors):
+        path = _data.copy()
+        for column in PRICE_COLUMNS:
+            if column in path:
+                path[column] = path[column].to_numpy(dtype=np.float64) * factor
+        if "volume" in path:
+            path["volume"] = path["volume"].to_numpy(dtype=np.float64) * volume_factor
+        signals = np.asarray(buy_signals(strategy, path), dtype=bool)
+        result = simulate(signals, path)
+        max_drawdown, time_to_stop = _path_metrics(result["equity_curve"].to_numpy(), stop_drawdown)
+        rows.append({"scenario": scenario, "pnl": result["final_value"] - INITIAL_CASH,
+                     "max_drawdown": max_drawdown, "time_to_stop": time_to_stop})
+    return rows
+
 class StressTester:
     """Tests strategy resilience under extreme conditions."""
-    
+
+    def __init__(self, max_workers: int = None, paths_per_task: int = 50, stop_drawdown: float = 0.2):
+        """Initialize the worker pool settings.
+
+        Args:
+            max_workers: Number of worker processes (defaults to all cores).
+            paths_per_task: Paths generated and backtested per task.
+            stop_drawdown: Equity drawdown that counts as being stopped out.
+        """
+        self.max_workers = max_workers or os.cpu_count()
+        self.paths_per_task = paths_per_task
+        self.stop_drawdown = stop_drawdown
+
     def test(self, data: pd.DataFrame, strategy) -> dict:
         """Simulate a flash crash.
-        
+
         Args:
             data: Historical data.
             strategy: Strategy instance.
-        
+
         Returns:
             Dictionary with stress test results.
         """
@@ -22,8 +138,67 @@ class StressTester:
         stressed_data["close"] *= 0.8
         stressed_data["high"] *= 0.8
         stressed_data["low"] *= 0.8
-        
+
         backtester = Backtester()
         results = backtester.run(stressed_data, strategy)
         logger.info("Stress test completed with flash crash scenario")
-        return results
\ No newline at end of file
+        return results
+
+    def run(self, data: pd.DataFrame, strategy, scenarios=SCENARIOS, n_paths: int = 1000,
+            seed: int = None) -> pd.DataFrame:
+        """Backtest a strategy on Monte Carlo paths of each scenario.
+
+        Paths are generated inside the worker processes from per-task seeds,
+        so only the base frame (once per worker) and the metrics cross process
+        boundaries, and results are reproducible for a given seed.
+
+        Args:
+            data: Historical data with 'close' and optional 'open'/'high'/'low'/'volume'.
+            strategy: Strategy instance.
+            scenarios: Scenario names from SCENARIOS.
+            n_paths: Paths per scenario.
+            seed: Random seed.
+
+        Returns:
+            DataFrame with one row per path: scenario, pnl, max_drawdown and
+            time_to_stop (bars until the stop drawdown, NaN if never reached).
+        """
+        for scenario in scenarios:
+            if scenario not in GENERATORS:
+                raise ValueError(f"Unknown scenario: {scenario}")
+        tasks = [(scenario, min(self.paths_per_task, n_paths - start))
+                 for scenario in scenarios for start in range(0, n_paths, self.paths_per_task)]
+        seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+        logger.info("Stress testing %d paths over %d scenarios on %d workers",
+                    n_paths * len(scenarios), len(scenarios), self.max_workers)
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_attach_data, initargs=(data,),
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            chunks = pool.map(_run_paths, itertools.repeat(strategy), [s for s, _ in tasks], seeds,
+                              [n for _, n in tasks], itertools.repeat(self.stop_drawdown))
+            return pd.DataFrame([row for chunk in chunks for row in chunk])
+
+    def summarize(self, results: pd.DataFrame, confidence: float = 0.95) -> pd.DataFrame:
+        """Summarize path results into tail-risk statistics per scenario.
+
+        Args:
+            results: Output of run().
+            confidence: Confidence level for the PnL VaR and CVaR.
+
+        Returns:
+            DataFrame indexed by scenario with mean/median PnL, VaR, CVaR,
+            median and worst drawdown, stop probability and median time-to-stop.
+        """
+        def stats(group: pd.DataFrame) -> pd.Series:
+            pnl = group["pnl"]
+            var = pnl.quantile(1 - confidence)
+            return pd.Series({
+                "mean_pnl": pnl.mean(),
+                "median_pnl": pnl.median(),
+                "var": -var,
+                "cvar": -pnl[pnl <= var].mean(),
+                "median_drawdown": group["max_drawdown"].median(),
+                "worst_drawdown": group["max_drawdown"].max(),
+                "stop_probability": group["time_to_stop"].notna().mean(),
+                "median_time_to_stop": group["time_to_stop"].median(),
+            })
+        return pd.DataFrame({scenario: stats(group) for scenario, group in results.groupby("scenario")}).T
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import talib as ta
+from analysis.cache import IndicatorCache, indicator_cache
+from analysis.streaming import StreamingATR, StreamingEMA, StreamingMACD, StreamingRSI, StreamingSMA
+from analysis.technical import TechnicalAnalyzer
+from strategies.base import signal_cache
+from strategies.voting import VotingStrategy
+
+def make_prices(n: int = 300) -> pd.DataFrame:
+    """Build a random-walk OHLC frame."""
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"high": close * 1.01, "low": close * 0.99, "close": close}, index=index)
+
+def test_cache_hits_and_matches_talib():
+    """Cached indicators match TA-Lib and repeat calls are hits."""
+    cache = IndicatorCache()
+    data = make_prices()
+    first = cache.get("SMA", data["close"], timeperiod=10)
+    second = cache.get("SMA", data["close"].copy(), timeperiod=10)
+    np.testing.assert_allclose(first, ta.SMA(data["close"].to_numpy(), timeperiod=10), equal_nan=True)
+    assert first.index.equals(data.index)
+    assert second.equals(first)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_cache_key_includes_params_and_values():
+    """Different params or data produce separate entries."""
+    cache = IndicatorCache()
+    data = make_prices()
+    cache.get("RSI", data["close"], timeperiod=14)
+    cache.get("RSI", data["close"], timeperiod=7)
+    cache.get("RSI", data["close"] * 2, timeperiod=14)
+    assert cache.stats()["misses"] == 3
+
+def test_cache_evicts_least_recently_used():
+    """Entries are evicted once the memory cap is exceeded."""
+    data = make_prices(100)
+    cache = IndicatorCache(max_bytes=2 * 100 * 8)
+    cache.get("SMA", data["close"], timeperiod=5)
+    cache.get("SMA", data["close"], timeperiod=10)
+    cache.get("SMA", data["close"], timeperiod=5)  # refresh
+    cache.get("SMA", data["close"], timeperiod=20)  # evicts timeperiod=10
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["nbytes"] <= cache.max_bytes
+    cache.get("SMA", data["close"], timeperiod=5)
+    assert cache.stats()["hits"] == 2
+
+def test_strategies_share_cache():
+    """Repeated strategy and analyzer calls on one frame hit the shared cache."""
+    indicator_cache.clear()
+    signal_cache.clear()
+    data = make_prices()
+    VotingStrategy().generate_signals(data)
+    misses = indicator_cache.stats()["misses"]
+    VotingStrategy().generate_signals(data)  # Served from the signal cache
+    TechnicalAnalyzer().calculate_rsi(data)
+    stats = indicator_cache.stats()
+    assert stats["misses"] == misses
+    assert stats["hits"] == 1
+
+def test_streaming_indicators_match_talib():
+    """Streaming indicators reproduce the TA-Lib batch results bar by bar."""
+    data = make_prices()
+    high, low, close = (data[col].to_numpy() for col in ("high", "low", "close"))
+    cases = [
+        (StreamingSMA(10), (close,), ta.SMA(close, timeperiod=10)),
+        (StreamingEMA(10), (close,), ta.EMA(close, timeperiod=10)),
+        (StreamingRSI(14), (close,), ta.RSI(close, timeperiod=14)),
+        (StreamingATR(14), (high, low, close), ta.ATR(high, low, close, timeperiod=14)),
+    ]
+    for indicator, inputs, expected in cases:
+        streamed = [indicator.update(*values) for values in zip(*inputs)]
+        np.testing.assert_allclose(streamed, expected, rtol=1e-9, equal_nan=True)
+    macd = StreamingMACD(12, 26, 9)
+    streamed = np.array([macd.update(x) for x in close])
+    np.testing.assert_allclose(streamed, np.column_stack(ta.MACD(close, 12, 26, 9)), rtol=1e-9, equal_nan=True)
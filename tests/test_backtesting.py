@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting import Backtester, BatchBacktester
+from strategies.ma_crossover import MACrossoverStrategy
+from strategies.base import Strategy, generate_signal_matrix
+from strategies.momentum_strategy import MomentumStrategy
+from strategies.rsi import RSIStrategy
+from strategies.voting import VotingStrategy
+
+def make_ohlcv(n: int = 500, seed: int = 7) -> pd.DataFrame:
+    """Build a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    opens = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(opens, close) * (1 + rng.uniform(0, 0.01, n))
+    low = np.minimum(opens, close) * (1 - rng.uniform(0, 0.01, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"open": opens, "high": high, "low": low, "close": close,
+                         "volume": rng.uniform(100, 1000, n)}, index=index)
+
+@pytest.mark.parametrize("strategy", [MACrossoverStrategy(short_period=5, long_period=20), RSIStrategy()])
+def test_vector_engine_matches_backtrader(strategy):
+    """Vector engine final value matches the backtrader path."""
+    data = make_ohlcv()
+    expected = Backtester().run(data, strategy)["final_value"]
+    result = Backtester(engine="vector").run(data, strategy)
+    assert result["final_value"] == pytest.approx(expected, rel=1e-9)
+    assert len(result["equity_curve"]) == len(data)
+
+class FixedSignals(Strategy):
+    def __init__(self, signals):
+        self.signals = signals
+
+    def generate_signals(self, data):
+        return pd.Series(self.signals, index=data.index)
+
+def test_rejected_order_does_not_block_later_fills():
+    """After an unaffordable order, later orders the remaining cash covers still fill."""
+    price = np.r_[np.full(5, 200000.0), np.full(10, 100.0), np.full(5, 60000.0), np.full(10, 50.0)]
+    data = pd.DataFrame({"open": price, "high": price * 1.01, "low": price * 0.99, "close": price, "volume": 1.0},
+                        index=pd.date_range("2024-01-01", periods=len(price), freq="min"))
+    signals = np.ones(len(price), dtype=bool)
+    signals[[4, 14, 19]] = False  # No orders across the price jumps
+    expected = Backtester().run(data, FixedSignals(signals))["final_value"]
+    result = Backtester(engine="vector").run(data, FixedSignals(signals))["final_value"]
+    assert result == pytest.approx(expected, rel=1e-9)
+    assert result < 5000  # One 60000 order filled after the 200000 ones were rejected
+
+def test_unknown_engine():
+    """Unknown engine names are rejected."""
+    with pytest.raises(ValueError):
+        Backtester(engine="gpu")
+
+def test_batch_backtester_matches_single_runs(tmp_path):
+    """Batch results match single backtests and interrupted runs resume."""
+    datasets = {"tokenA": make_ohlcv(seed=1), "tokenB": make_ohlcv(seed=2)}
+    strategies = {"ma": MACrossoverStrategy(short_period=5, long_period=20), "rsi": RSIStrategy()}
+    checkpoint = str(tmp_path / "results.csv")
+    progress = []
+    partial = BatchBacktester(max_workers=2, checkpoint=checkpoint).run(
+        {"tokenA": datasets["tokenA"]}, strategies, progress=lambda done, total: progress.append((done, total)))
+    assert progress == [(1, 1)]
+    results = BatchBacktester(max_workers=2, checkpoint=checkpoint).run(
+        datasets, strategies, progress=lambda done, total: progress.append((done, total)))
+    assert progress[-1] == (1, 1)  # Only tokenB was left to run
+    assert list(results[["token", "strategy"]].itertuples(index=False, name=None)) == [
+        ("tokenA", "ma"), ("tokenA", "rsi"), ("tokenB", "ma"), ("tokenB", "rsi")]
+    assert results["error"].isna().all()
+    for row in results.itertuples():
+        expected = Backtester(engine="vector").run(datasets[row.token], strategies[row.strategy])
+        assert row.final_value == pytest.approx(expected["final_value"])
+    assert len(partial) == 2
+    pooled = BatchBacktester(max_workers=2).run(datasets, strategies)  # Spawned workers
+    assert pooled["final_value"].tolist() == pytest.approx(results["final_value"].tolist())
+
+def test_batch_backtester_runs_single_token_in_process(monkeypatch):
+    """One pending token is backtested without starting a process pool."""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr("backtesting.ProcessPoolExecutor", no_pool)
+    data = make_ohlcv(seed=3)
+    strategy = RSIStrategy()
+    results = BatchBacktester(max_workers=4).run({"token": data}, [strategy])
+    assert results["final_value"].iloc[0] == pytest.approx(
+        Backtester(engine="vector").run(data, strategy)["final_value"])
+
+def test_signal_matrix_feeds_backtester_and_voting():
+    """One signal matrix reproduces per-strategy backtests and the majority vote."""
+    data = make_ohlcv()
+    strategies = [MACrossoverStrategy(short_period=5, long_period=20), RSIStrategy(oversold=45),
+                  MomentumStrategy(lookback_period=3, threshold=0.005)]
+    matrix = generate_signal_matrix(data, strategies)
+    assert matrix.buy.shape == matrix.sell.shape == matrix.size.shape == (len(data), 3)
+    assert matrix.votes().dtype == np.int8
+    assert matrix.names == ["MACrossoverStrategy", "RSIStrategy", "MomentumStrategy"]
+    final_values = Backtester(engine="vector").run_many(data, strategies)
+    for strategy, final_value in zip(strategies, final_values):
+        assert final_value == pytest.approx(Backtester(engine="vector").run(data, strategy)["final_value"])
+    voting = VotingStrategy()
+    voting.strategies = strategies
+    assert voting.generate_signals(data).tolist() == (matrix.buy.sum(axis=1) >= 2).tolist()
@@ -1,5 +1,18 @@
+import asyncio
+import tempfile
+import time
 import unittest
+from aiohttp import web
+import numpy as np
+import pandas as pd
+from data.bars import BarAggregator, aggregate_trades
+from data.buffer import PriceBuffer
 from data.historical import HistoricalDataFetcher
+from data.onchain import OnchainDataFetcher
+from data.realtime import PriceBatcher, RealtimeDataFetcher
+from data.store import TradeStore
+from data.subscription import LogSubscriber, WalletCursor
+from data.transport import AsyncHTTPClient, GraphQLError, RPCError, TokenBucket
 from config import Config
 
 class TestDataFetching(unittest.TestCase):
@@ -8,8 +21,393 @@ class TestDataFetching(unittest.TestCase):
         self.fetcher = HistoricalDataFetcher(self.config)
 
     def test_get_data(self):
-        df = self.fetcher.get_data("EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm", "raydium")
+        df = asyncio.run(self.fetcher.get_data("EKpQGSJtjMFqKZ9KQanSqYXRcF8fBopzLHYxdM65zcjm", "raydium"))
         self.assertFalse(df.empty)
 
+class TestPriceBuffer(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2024-01-01", periods=10, freq="min")
+        self.data = pd.DataFrame({"close": np.arange(10.0), "volume": np.arange(10.0) * 2}, index=index)
+
+    def test_keeps_last_capacity_bars(self):
+        buffer = PriceBuffer(capacity=4)
+        buffer.extend(self.data.iloc[:3])
+        buffer.extend(self.data.iloc[3:])
+        self.assertEqual(len(buffer), 4)
+        np.testing.assert_array_equal(buffer["close"], [6, 7, 8, 9])
+        self.assertTrue(buffer.index.equals(self.data.index[-4:]))
+
+    def test_view_is_zero_copy(self):
+        buffer = PriceBuffer(capacity=4)
+        for timestamp, row in self.data.iterrows():
+            buffer.append(timestamp, row["close"], volume=row["volume"])
+        view = buffer.view(3)
+        np.testing.assert_array_equal(view["close"], [7, 8, 9])
+        np.testing.assert_array_equal(view["high"], view["close"])
+        self.assertTrue(np.shares_memory(view.to_numpy(), buffer._values))
+
+class TestBars(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        seconds = np.sort(rng.integers(0, 900, 400))
+        index = pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(seconds, unit="s")
+        self.trades = pd.DataFrame({"close": rng.uniform(1, 2, 400), "volume": rng.uniform(0, 10, 400)},
+                                   index=index)
+
+    def test_time_bars(self):
+        bars = aggregate_trades(self.trades, "time", "1min")
+        expected = self.trades["close"].resample("1min").ohlc().dropna()
+        np.testing.assert_allclose(bars[["open", "high", "low", "close"]], expected)
+        self.assertTrue(bars.index.equals(expected.index.rename("timestamp")))
+        self.assertAlmostEqual(bars["volume"].sum(), self.trades["volume"].sum())
+
+    def test_tick_and_volume_bars(self):
+        self.assertEqual(len(aggregate_trades(self.trades, "tick", 50)), 8)
+        bars = aggregate_trades(self.trades, "volume", 100.0)
+        self.assertEqual(len(bars), int(self.trades["volume"].iloc[:-1].sum() // 100.0) + 1)
+        self.assertAlmostEqual(bars["volume"].sum(), self.trades["volume"].sum())
+
+    def test_incremental_matches_batch(self):
+        for kind, size in (("time", "1min"), ("tick", 7), ("volume", 50.0)):
+            aggregator = BarAggregator(kind, size)
+            bars = [aggregator.update(t, row["close"], row["volume"]) for t, row in self.trades.iterrows()]
+            bars = [bar for bar in bars if bar] + [aggregator.flush()]
+            streamed = pd.DataFrame(bars).set_index("timestamp")
+            batch = aggregate_trades(self.trades, kind, size)
+            np.testing.assert_allclose(streamed, batch)
+            self.assertTrue(streamed.index.equals(batch.index))
+
+class FakeHTTP:
+    def __init__(self):
+        self.requests = []
+
+    async def get_json(self, url, params=None, headers=None):
+        ids = params["ids"].split(",")
+        self.requests.append(ids)
+        return {"data": {token: {"id": token, "price": float(i)} for i, token in enumerate(ids)
+                         if token != "unknown"}}
+
+class TestPriceBatching(unittest.TestCase):
+    def setUp(self):
+        self.fetcher = RealtimeDataFetcher(Config())
+        self.fetcher.http = FakeHTTP()
+
+    def test_get_prices_chunks_requests(self):
+        tokens = [f"token{i}" for i in range(250)] + ["unknown"]
+        prices = asyncio.run(self.fetcher.get_prices(tokens))
+        self.assertEqual([len(ids) for ids in self.fetcher.http.requests], [100, 100, 51])
+        self.assertEqual(len(prices), 250)
+        self.assertNotIn("unknown", prices)
+
+    def test_batcher_coalesces_concurrent_requests(self):
+        batcher = PriceBatcher(self.fetcher.get_prices, window=0.01)
+
+        async def run():
+            return await asyncio.gather(*(batcher.get(f"token{i}") for i in range(150)), batcher.get("unknown"))
+
+        prices = asyncio.run(run())
+        self.assertEqual(len(self.fetcher.http.requests), 2)
+        self.assertEqual(prices[0], 0.0)
+        self.assertIsNone(prices[-1])
+
+class FakeBitquery:
+    def __init__(self, trades, page_size=1000):
+        self.trades = trades
+        self.page_size = page_size
+        self.variables = []
+
+    async def graphql(self, url, query, variables=None, headers=None):
+        self.variables.append(variables)
+        since, till = pd.Timestamp(variables["since"]), pd.Timestamp(variables["till"])
+        trades = sorted((t, p) for t, p in self.trades if since <= pd.Timestamp(t) < till)
+        if "descending" in query:
+            trades.reverse()
+        trades = trades[variables["offset"]:variables["offset"] + self.page_size]
+        return {"Solana": {"DEXTrades": [{"Block": {"Time": t}, "Transaction": {"Signature": "%s/%s" % (t, p)},
+                                          "Instruction": {"Index": 0}, "Trade": {"Price": p, "Amount": 1.0}}
+                                         for t, p in trades]}}
+
+class TestTradeStore(unittest.TestCase):
+    def setUp(self):
+        self.store = TradeStore(tempfile.mkdtemp())
+        self.fetcher = HistoricalDataFetcher(Config(), store=self.store)
+        self.fetcher.http = FakeBitquery([("2024-01-01T23:59:00Z", 1.0), ("2024-01-02T00:01:00Z", 2.0)])
+
+    def test_incremental_fetch_merges_with_store(self):
+        first = asyncio.run(self.fetcher.get_data("token"))
+        self.assertEqual(list(first["close"]), [1.0, 2.0])
+        self.fetcher.http.trades.append(("2024-01-02T00:02:00Z", 3.0))
+        second = asyncio.run(self.fetcher.get_data("token"))
+        self.assertEqual(list(second["close"]), [1.0, 2.0, 3.0])
+        self.assertEqual(self.fetcher.http.variables[-1]["since"], "2024-01-02T00:01:00+00:00")
+        self.assertEqual(self.store.high_water("token", "raydium"), pd.Timestamp("2024-01-02T00:02:00Z"))
+
+    def test_backfill_pages_windows_into_store(self):
+        minutes = pd.date_range("2024-01-01T00:00:00Z", periods=25, freq="5min")
+        self.fetcher.http = FakeBitquery([(t.isoformat(), float(i)) for i, t in enumerate(minutes)], page_size=2)
+        self.fetcher.PAGE_SIZE = 2
+        count = asyncio.run(self.fetcher.backfill("token", start=minutes[0], end=minutes[-1] + pd.Timedelta("1min"),
+                                                  window=pd.Timedelta("30min"), concurrency=3))
+        self.assertEqual(count, 25)
+        stored = self.store.read("token", "raydium")
+        self.assertEqual(list(stored["close"]), [float(i) for i in range(25)])
+        self.assertGreater(max(v["offset"] for v in self.fetcher.http.variables), 0)
+        asyncio.run(self.fetcher.backfill("token", start=minutes[0], end=minutes[-1] + pd.Timedelta("1min")))
+        self.assertEqual(len(self.store.read("token", "raydium")), 25)
+
+    def test_failed_window_cancels_the_others(self):
+        class FailingBitquery(FakeBitquery):
+            async def graphql(self, url, query, variables=None, headers=None):
+                if variables["since"].startswith("2024-01-01T00:00"):
+                    raise RuntimeError("window failed")
+                await asyncio.Event().wait()  # The other windows never finish on their own
+
+        self.fetcher.http = FailingBitquery([])
+
+        async def run():
+            with self.assertRaises(RuntimeError):
+                async for _ in self.fetcher.iter_pages("token", start="2024-01-01T00:00:00Z",
+                                                       end="2024-01-01T03:00:00Z", concurrency=3):
+                    pass
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+        self.assertEqual(asyncio.run(run()), [])
+
+    def test_dedupes_on_trade_id(self):
+        index = pd.DatetimeIndex(["2024-01-01T00:00:00Z"] * 3 + ["2024-01-01T00:01:00Z"], name="timestamp")
+        trades = pd.DataFrame({"close": [1.0, 1.0, 1.0, 2.0], "volume": [5.0] * 4,
+                               "trade_id": ["a:0", "a:1", "b:0", "c:0"]}, index=index)
+        self.store.write("token", "raydium", trades.iloc[:3])
+        self.store.write("token", "raydium", trades.iloc[1:])  # Overlapping refetch
+        stored = self.store.read("token", "raydium")
+        self.assertEqual(len(stored), 4)
+        self.assertEqual(stored["volume"].sum(), 20.0)
+        self.assertEqual(list(stored["close"]), [1.0, 1.0, 1.0, 2.0])
+
+    def test_read_range(self):
+        asyncio.run(self.fetcher.get_data("token"))
+        self.assertEqual(len(self.store.read("token", "raydium", start="2024-01-02")), 1)
+        self.assertTrue(self.store.read("other", "raydium").empty)
+
+class TestAsyncHTTPClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.hits = 0
+
+        async def flaky(request):
+            self.hits += 1
+            if self.hits < 3:
+                return web.Response(status=503)
+            return web.json_response({"ok": True})
+
+        async def graphql(request):
+            body = await request.json()
+            if body["variables"].get("fail"):
+                return web.json_response({"errors": [{"message": "bad query"}]})
+            return web.json_response({"data": {"echo": body["variables"]}})
+
+        app = web.Application()
+        app.router.add_get("/flaky", flaky)
+        app.router.add_post("/graphql", graphql)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.base = "http://127.0.0.1:%d" % site._server.sockets[0].getsockname()[1]
+        self.client = AsyncHTTPClient(backoff=0.01)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_retries_with_backoff(self):
+        self.assertEqual(await self.client.get_json(self.base + "/flaky"), {"ok": True})
+        self.assertEqual(self.hits, 3)
+
+    async def test_graphql(self):
+        self.assertEqual(await self.client.graphql(self.base + "/graphql", "query { echo }", {"a": 1}),
+                         {"echo": {"a": 1}})
+        with self.assertRaises(GraphQLError):
+            await self.client.graphql(self.base + "/graphql", "query { echo }", {"fail": True})
+
+    async def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(10):
+            await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+class TestOnchainDataFetcher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.batches = []
+        self.signatures = [{"signature": "sig%d" % i, "blockTime": 1700000000 + i} for i in range(45)]
+
+        async def rpc(request):
+            calls = await request.json()
+            if isinstance(calls, dict) or calls[0]["method"] == "getSignaturesForAddress":
+                call = calls if isinstance(calls, dict) else calls[0]
+                if call["params"][0] == "bad":
+                    return web.json_response([{"jsonrpc": "2.0", "id": 0, "error": {"message": "invalid"}}])
+                return web.json_response([{"jsonrpc": "2.0", "id": 0, "result": self.signatures}])
+            self.batches.append(len(calls))
+            replies = [{"jsonrpc": "2.0", "id": call["id"], "result": {"meta": {"postTokenBalances": [
+                {"uiTokenAmount": {"uiAmount": float(call["params"][0][3:])}}]}}} for call in calls]
+            return web.json_response(replies[::-1])  # Out of order on purpose
+
+        app = web.Application()
+        app.router.add_post("/", rpc)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        config = Config()
+        config.SOLANA_RPC_URL = "http://127.0.0.1:%d/" % site._server.sockets[0].getsockname()[1]
+        self.http = AsyncHTTPClient(backoff=0.01)
+        self.fetcher = OnchainDataFetcher(config, self.http, batch_size=20, cache_size=50)
+
+    async def asyncTearDown(self):
+        await self.http.close()
+        await self.runner.cleanup()
+
+    async def test_batches_preserve_order(self):
+        df = await self.fetcher.get_data("token")
+        self.assertEqual(sorted(self.batches), [5, 20, 20])
+        self.assertEqual(df["close"].tolist(), [float(i) for i in range(45)])
+
+    async def test_overlapping_polls_hit_cache(self):
+        await self.fetcher.get_data("token")
+        self.signatures = self.signatures[5:] + [{"signature": "sig%d" % i, "blockTime": 1700000000 + i}
+                                                 for i in range(45, 50)]
+        df = await self.fetcher.get_data("token")
+        self.assertEqual(self.batches[3:], [5])
+        self.assertEqual(len(df), 45)
+        self.assertLessEqual(len(self.fetcher._parsed), 50)
+
+    async def test_rpc_error(self):
+        with self.assertRaises(RPCError):
+            await self.http.json_rpc(self.fetcher.rpc_url, [("getSignaturesForAddress", ["bad"])])
+        self.assertTrue((await self.fetcher.get_data("bad")).empty)
+
+class TestLogSubscriber(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.connections = 0
+        self.subscribed = []
+
+        async def ws(request):
+            self.connections += 1
+            socket = web.WebSocketResponse()
+            await socket.prepare(request)
+            for i in range(2):
+                message = await socket.receive_json()
+                self.subscribed.append(message["params"][0]["mentions"][0])
+                await socket.send_json({"jsonrpc": "2.0", "id": message["id"], "result": 100 + i})
+            for slot, (sub_id, signature, err) in enumerate([(100, "a%d" % self.connections, None),
+                                                             (101, "b", {"fail": 1}),
+                                                             (101, "c%d" % self.connections, None)]):
+                await socket.send_json({"jsonrpc": "2.0", "method": "logsNotification", "params": {
+                    "result": {"context": {"slot": slot},
+                               "value": {"signature": signature, "err": err, "logs": []}},
+                    "subscription": sub_id}})
+            await socket.close()  # Drop the connection to force a reconnect
+            return socket
+
+        app = web.Application()
+        app.router.add_get("/", ws)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = "ws://127.0.0.1:%d/" % site._server.sockets[0].getsockname()[1]
+        self.notified = []
+        self.backfills = 0
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def on_signature(self, wallet, signature, slot):
+        self.notified.append((wallet, signature))
+
+    async def backfill(self):
+        self.backfills += 1
+
+    async def run_for(self, subscriber, seconds):
+        task = asyncio.create_task(subscriber.run())
+        await asyncio.sleep(seconds)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_notifications_and_reconnect(self):
+        subscriber = LogSubscriber(self.url, ["w1", "w2"], self.on_signature, self.backfill,
+                                   reconnect_delay=0.01, max_delay=0.02)
+        await self.run_for(subscriber, 0.3)
+        self.assertGreaterEqual(self.connections, 2)
+        self.assertEqual(self.subscribed[:4], ["w1", "w2", "w1", "w2"])
+        self.assertEqual(self.notified[:4], [("w1", "a1"), ("w2", "c1"), ("w1", "a2"), ("w2", "c2")])
+        # Gaps are backfilled after every subscribe and every disconnect
+        self.assertGreaterEqual(self.backfills, self.connections)
+
+    async def test_slow_handler_does_not_block_reading(self):
+        release = asyncio.Event()
+
+        async def slow(wallet, signature, slot):
+            self.notified.append((wallet, signature))
+            await release.wait()
+
+        subscriber = LogSubscriber(self.url, ["w1", "w2"], slow, self.backfill, workers=2,
+                                   reconnect_delay=0.01, max_delay=0.02)
+        task = asyncio.create_task(subscriber.run())
+        await asyncio.sleep(0.1)
+        # Both workers are stuck, yet the socket kept being read and reconnected
+        self.assertEqual(self.notified, [("w1", "a1"), ("w2", "c1")])
+        self.assertGreaterEqual(self.connections, 2)
+        release.set()
+        await asyncio.sleep(0.05)
+        self.assertGreater(len(self.notified), 2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_polls_while_server_down(self):
+        await self.runner.cleanup()
+        subscriber = LogSubscriber(self.url, ["w1"], self.on_signature, self.backfill,
+                                   reconnect_delay=0.01, max_delay=0.02)
+        await self.run_for(subscriber, 0.2)
+        self.assertEqual(self.notified, [])
+        self.assertGreaterEqual(self.backfills, 3)
+
+class TestWalletCursor(unittest.IsolatedAsyncioTestCase):
+    async def test_out_of_order_failures_are_retried(self):
+        cursor = WalletCursor(["w"])
+        handled, failing = [], {"s1"}
+
+        async def handler(wallet, signature):
+            await asyncio.sleep({"s1": 0.02, "s2": 0.01}.get(signature, 0.0))  # Finish newest first
+            if signature in failing:
+                raise RuntimeError("rpc timeout")
+            handled.append(signature)
+
+        results = await asyncio.gather(*(cursor.process(handler, "w", signature, slot)
+                                         for slot, signature in enumerate(["s1", "s2", "s3"], 1)))
+        self.assertEqual(results, [False, True, True])
+        self.assertEqual(cursor.signatures["w"], "s3")  # Not moved back to s2 or s1
+        self.assertEqual(list(cursor.failed), [("w", "s1")])
+        await cursor.process(handler, "w", "s0", 0)  # A late, older signature
+        self.assertEqual(cursor.signatures["w"], "s3")
+        failing.clear()
+        self.assertEqual(await cursor.retry(handler), 1)
+        self.assertEqual(handled[-1], "s1")
+        self.assertEqual(cursor.failed, {})
+        self.assertEqual(cursor.signatures["w"], "s3")
+
+    async def test_gives_up_after_max_attempts(self):
+        cursor = WalletCursor(["w"], max_attempts=2)
+
+        async def handler(wallet, signature):
+            raise RuntimeError("bad transaction")
+
+        await cursor.process(handler, "w", "s", 1)
+        self.assertEqual(await cursor.retry(handler), 0)
+        self.assertEqual(cursor.failed, {})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+import pandas as pd
+from sqlalchemy import text
+from database import DatabaseManager, PortfolioValue, TradeLog
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.config = SimpleNamespace(DATABASE_URL="sqlite:///" + os.path.join(self.dir.name, "bot.db"))
+        self.db = DatabaseManager(self.config, flush_interval=0.05, batch_size=100)
+
+    def tearDown(self):
+        self.db.close()
+        self.dir.cleanup()
+
+    def test_logging_does_not_block(self):
+        insert, release, batches = self.db._insert, threading.Event(), []
+
+        def blocked(pending):
+            release.wait()
+            batches.append(len(pending))
+            insert(pending)
+
+        self.db._insert = blocked
+        for i in range(1000):
+            self.db.log_trade("SOL", "buy", 1.0, 100.0 + i, "order%d" % i)
+        self.assertEqual(batches, [])  # Every call returned while the writer was stuck
+        release.set()
+        trades = self.db.get_trades_df("SOL")
+        self.assertEqual(sum(batches), 1000)
+        self.assertLessEqual(len(batches), 1000 // self.db.batch_size + 2)
+        self.assertEqual(len(trades), 1000)
+        self.assertEqual(trades["price"].tolist(), [100.0 + i for i in range(1000)])
+
+    def test_flush_interval(self):
+        self.db.log_portfolio_value(10000.0)
+        time.sleep(0.3)
+        with self.db.Session() as session:
+            self.assertEqual(session.query(PortfolioValue).count(), 1)
+
+    def test_close_flushes_queue(self):
+        for i in range(10):
+            self.db.log_trade("WIF", "sell", 2.0, 1.5, "order%d" % i)
+        self.db.close()
+        db = DatabaseManager(self.config)
+        try:
+            trades = db.get_trades_df(start="2000-01-01")
+            self.assertEqual(len(trades), 10)
+            self.assertTrue((trades["asset"] == "WIF").all())
+        finally:
+            db.close()
+
+    def test_failed_writes_are_retried(self):
+        self.db.close()
+        self.db = DatabaseManager(self.config, flush_interval=0.01, retry_delay=0.01)
+        insert, failures = self.db._insert, []
+
+        def flaky(pending):
+            if len(failures) < 2:
+                failures.append(len(pending))
+                raise RuntimeError("database is locked")
+            insert(pending)
+
+        self.db._insert = flaky
+        for i in range(5):
+            self.db.log_trade("SOL", "buy", 1.0, 1.0, "order%d" % i)
+        self.assertTrue(self.db.flush(timeout=5))
+        self.assertEqual(len(failures), 2)
+        self.assertEqual(len(self.db.get_trades_df()), 5)
+
+    def test_flush_honors_retry_backoff(self):
+        self.db.close()
+        self.db = DatabaseManager(self.config, flush_interval=0.01, retry_delay=0.5)
+        insert, attempts, down = self.db._insert, [], [True]
+
+        def flaky(pending):
+            attempts.append(len(pending))
+            if down[0]:
+                raise RuntimeError("database is locked")
+            insert(pending)
+
+        self.db._insert = flaky
+        self.db.log_trade("SOL", "buy", 1.0, 1.0, "order")
+        while not attempts:
+            time.sleep(0.005)
+        self.assertFalse(self.db.flush(timeout=0.1))
+        self.assertEqual(len(attempts), 1)  # The flush did not cut the backoff short
+        down[0] = False
+        self.assertTrue(self.db.flush(timeout=5))
+        self.assertEqual(len(attempts), 2)
+
+    def test_flush_after_close_fails_fast(self):
+        self.db.log_trade("SOL", "buy", 1.0, 1.0, "order")
+        self.db.close()
+        with self.assertRaises(RuntimeError):
+            self.db.flush()
+        self.assertEqual(len(self.db.get_trades_df()), 1)
+
+def year_of_trades(n: int = 5000) -> list:
+    timestamps = pd.date_range("2024-01-01", "2024-12-31", periods=n)
+    return [(TradeLog, {"asset": "SOL" if i % 2 else "WIF", "side": "buy", "quantity": 1.0, "price": float(i),
+                        "order_id": str(i), "timestamp": ts.to_pydatetime()}) for i, ts in enumerate(timestamps)]
+
+class TestTradeQueries(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.config = SimpleNamespace(DATABASE_URL="sqlite:///" + os.path.join(self.dir.name, "bot.db"))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_wal_and_index(self):
+        db = DatabaseManager(self.config)
+        try:
+            with db.engine.connect() as connection:
+                self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+                plan = connection.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM trades WHERE asset = 'SOL' AND timestamp >= '2024-03-01'"
+                )).fetchall()
+            self.assertIn("ix_trades_asset_timestamp", str(plan))
+        finally:
+            db.close()
+
+    def test_indexes_added_to_existing_database(self):
+        path = self.config.DATABASE_URL[len("sqlite:///"):]
+        with sqlite3.connect(path) as connection:  # Schema from before the indexes existed
+            connection.execute("CREATE TABLE trades (id INTEGER PRIMARY KEY, asset VARCHAR, side VARCHAR, "
+                               "quantity FLOAT, price FLOAT, order_id VARCHAR, timestamp DATETIME)")
+            connection.execute("CREATE TABLE portfolio_values (id INTEGER PRIMARY KEY, value FLOAT, timestamp DATETIME)")
+        db = DatabaseManager(self.config)
+        try:
+            with db.engine.connect() as connection:
+                indexes = {row[0] for row in connection.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"))}
+                plan = connection.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM trades WHERE asset = 'SOL' AND timestamp >= '2024-03-01'"
+                )).fetchall()
+            self.assertIn("ix_trades_asset_timestamp", indexes)
+            self.assertIn("ix_portfolio_values_timestamp", indexes)
+            self.assertIn("ix_trades_asset_timestamp", str(plan))
+        finally:
+            db.close()
+
+    def test_streams_range_in_chunks(self):
+        db = DatabaseManager(self.config)
+        try:
+            db._write(year_of_trades())
+            chunks = list(db.get_trades("SOL", "2024-03-01", "2024-05-31", chunk_size=100))
+            trades = pd.concat(chunks, ignore_index=True)
+            self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+            self.assertGreater(len(chunks), 1)
+            self.assertTrue((trades["asset"] == "SOL").all())
+            self.assertTrue(trades["timestamp"].is_monotonic_increasing)
+            self.assertEqual(trades["timestamp"].min().month, 3)
+            self.assertEqual(trades["timestamp"].max().month, 5)
+        finally:
+            db.close()
+
+    def test_monthly_partitions(self):
+        db = DatabaseManager(self.config, partition_by_month=True)
+        try:
+            db._write(year_of_trades())
+            tables = [name for name in db._partitions.tables]
+            self.assertEqual(len(tables), 12)
+            self.assertEqual([t.name for t in db._trade_tables(pd.Timestamp("2024-03-15"), pd.Timestamp("2024-04-02"))],
+                             ["trades_2024_03", "trades_2024_04"])
+            partitioned = db.get_trades_df("WIF", "2024-03-15", "2024-04-02")
+            self.assertTrue(partitioned["timestamp"].between("2024-03-15", "2024-04-02").all())
+            self.assertEqual(len(db.get_trades_df()), 5000)
+        finally:
+            db.close()
+
+if __name__ == '__main__':
+    unittest.main()
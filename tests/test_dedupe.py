@@ -0,0 +1,35 @@
+from dedupe import ExpiringDedupe
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_duplicates_within_ttl():
+    clock = FakeClock()
+    seen = ExpiringDedupe(ttl=60, clock=clock)
+    assert seen.add("mint")
+    clock.now = 59
+    assert not seen.add("mint")
+    clock.now = 61
+    assert "mint" not in seen
+    assert seen.add("mint")
+
+def test_memory_stays_bounded():
+    clock = FakeClock()
+    seen = ExpiringDedupe(ttl=3600, max_size=100, clock=clock)
+    for i in range(10000):
+        clock.now = i
+        seen.add("sig%d" % i)
+    assert len(seen) <= 100
+    assert not seen.add("sig9999")
+    assert seen.add("sig0")  # Evicted
+
+def test_discard_allows_retry():
+    seen = ExpiringDedupe(ttl=60, clock=FakeClock())
+    assert seen.add("sig")
+    seen.discard("sig")
+    assert "sig" not in seen
+    assert seen.add("sig")
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from optimization import parameters
+from optimization.parameters import ParameterOptimizer
+from strategies.base import signal_cache
+from strategies.ma_crossover import MACrossoverStrategy
+from strategies.momentum_strategy import MomentumStrategy
+
+def make_prices(n: int = 300) -> pd.DataFrame:
+    """Build a random-walk price frame."""
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"close": close, "volume": rng.uniform(100, 1000, n)}, index=index)
+
+def test_grid_search_ranks_valid_combinations():
+    """Grid search scores every valid combination and ranks by final value."""
+    grid = {"short_period": [5, 10, 30], "long_period": [10, 30]}
+    results = ParameterOptimizer(max_workers=2, chunk_size=2).optimize(make_prices(), MACrossoverStrategy, grid)
+    assert len(results) == 3  # (5, 10), (5, 30), (10, 30)
+    assert (results["short_period"] < results["long_period"]).all()
+    assert results["final_value"].is_monotonic_decreasing
+
+def test_random_search_samples():
+    """Random search evaluates n_iter combinations."""
+    results = ParameterOptimizer(max_workers=2).optimize(make_prices(), MomentumStrategy, n_iter=5, seed=1)
+    assert len(results) == 5
+    assert {"lookback_period", "threshold", "final_value", "trades"} <= set(results.columns)
+
+def test_trades_count_accepted_fills():
+    """Orders the cash cannot cover are not counted as trades."""
+    data = make_prices()
+    data["close"] = 30000.0 + np.arange(len(data))  # Each 0.1 unit order costs ~3000
+    results = ParameterOptimizer(max_workers=1).optimize(data, MomentumStrategy,
+                                                         {"lookback_period": [3], "threshold": [-1.0]})
+    assert results["trades"].tolist() == [3]
+
+def test_sweep_leaves_signal_cache_alone(monkeypatch):
+    """Scoring a chunk does not evict live strategies' cached signals."""
+    signal_cache.clear()
+    misses = signal_cache.misses
+    monkeypatch.setattr(parameters, "_frame", make_prices())
+    rows = parameters._score_chunk(MomentumStrategy, [{"lookback_period": 3, "threshold": 0.01}])
+    assert len(rows) == 1
+    assert signal_cache.misses == misses and signal_cache.nbytes == 0
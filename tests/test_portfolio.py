@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from portfolio import Portfolio
+
+def test_ticks_match_full_mark():
+    """Incremental tick updates agree with a vectorized mark of the book."""
+    portfolio = Portfolio(10000.0, capacity=2)
+    rng = np.random.default_rng(0)
+    assets = ["a%d" % i for i in range(10)]
+    for asset in assets:
+        portfolio.update(asset, rng.uniform(-5, 5), rng.uniform(1, 10))
+    for _ in range(1000):
+        portfolio.on_tick(assets[rng.integers(10)], rng.uniform(1, 10))
+    value, exposure, unrealized = portfolio.value, portfolio.exposure, portfolio.unrealized_pnl
+    assert portfolio.mark({}) == pytest.approx(value)
+    assert portfolio.exposure == pytest.approx(exposure)
+    assert portfolio.unrealized_pnl == pytest.approx(unrealized)
+
+def test_realized_and_unrealized_pnl():
+    portfolio = Portfolio(1000.0)
+    portfolio.update("SOL", 10, 10.0)
+    portfolio.update("SOL", 10, 20.0)
+    portfolio.update("SOL", -5, 30.0)
+    assert portfolio.realized_pnl == pytest.approx(75.0)  # 5 * (30 - 15)
+    portfolio.on_tick("SOL", 25.0)
+    assert portfolio.unrealized_pnl == pytest.approx(150.0)  # 15 * (25 - 15)
+    assert portfolio.value == pytest.approx(1000.0 + 75.0 + 150.0)
+    portfolio.update("SOL", -20, 25.0)  # Flip to a 5 unit short
+    assert portfolio.positions == {"SOL": -5}
+    assert portfolio.unrealized_pnl == pytest.approx(0.0)
+    assert portfolio.exposure == pytest.approx(125.0)
+
+def test_calculate_value_and_replay():
+    portfolio = Portfolio(1000.0)
+    portfolio.update("SOL", 2, 100.0)
+    portfolio.update("WIF", 100, 2.0)
+    prices = pd.DataFrame({"SOL": [100.0, 110.0], "WIF": [2.0, 3.0]})
+    assert portfolio.calculate_value(prices) == pytest.approx(600.0 + 220.0 + 300.0)
+    replayed = Portfolio.replay(1000.0, portfolio.fills)
+    assert replayed.positions == portfolio.positions
+    assert replayed.capital == portfolio.capital
+    assert replayed.mark({"SOL": 110.0, "WIF": 3.0}) == pytest.approx(portfolio.value)
@@ -0,0 +1,79 @@
+import sys
+import numpy as np
+import pytest
+from risk_management import RiskManager
+
+def random_book(n: int = 300, bars: int = 100, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    prices = rng.uniform(0.001, 10, n)
+    return {
+        "prices": prices,
+        "quantities": rng.uniform(0, 100, n),
+        "entry_prices": prices * rng.uniform(0.8, 1.2, n),
+        "atr": prices * rng.uniform(0.01, 0.2, n),
+        "returns": rng.normal(0, 0.05, (bars, n)),
+    }
+
+def test_matches_scalar_methods():
+    risk = RiskManager()
+    book = random_book(20)
+    report = risk.evaluate(10000.0, **book)
+    for i in range(20):
+        assert report["sizes"][i] == pytest.approx(risk.calculate_position_size(10000.0, book["atr"][i]))
+        assert report["stops"][i] == pytest.approx(risk.set_stop_loss(book["entry_prices"][i], book["atr"][i]))
+
+def test_short_position_stops():
+    """Short stops sit above entry and trigger when the price rises to them."""
+    risk = RiskManager(stop_atr_multiple=2.0)
+    report = risk.evaluate(10000.0, prices=[10.0, 10.0, 13.0], quantities=[5.0, -5.0, -5.0],
+                           entry_prices=[10.0, 10.0, 10.0], atr=[1.0, 1.0, 1.0])
+    assert report["stops"].tolist() == [8.0, 12.0, 12.0]
+    assert report["stop_hit"].tolist() == [False, False, True]
+    assert risk.set_stop_loss(10.0, 1.0, quantity=-5.0) == 12.0
+
+def test_correlation_adjusted_exposure():
+    risk = RiskManager()
+    book = random_book(30)
+    report = risk.evaluate(10000.0, **book)
+    positions = book["quantities"] * book["prices"]
+    correlation = np.corrcoef(book["returns"], rowvar=False)
+    assert report["adjusted_exposure"] == pytest.approx(np.sqrt(positions @ correlation @ positions))
+    assert report["adjusted_exposure"] < report["exposure"]
+    pnl = book["returns"] @ positions
+    assert report["var"] == pytest.approx(-np.quantile(pnl, 0.05))
+
+def test_drawdown_kill_switch():
+    risk = RiskManager(max_drawdown=0.2)
+    book = random_book(5)
+    assert not risk.evaluate(10000.0, **book)["halted"]
+    assert risk.evaluate(12000.0, **book)["drawdown"] == 0
+    report = risk.evaluate(9500.0, **book)
+    assert report["halted"]
+    assert report["drawdown"] == pytest.approx(1 - 9500 / 12000)
+    assert not report["sizes"].any()
+    assert risk.evaluate(12000.0, **book)["halted"]  # Stays halted until reset
+    risk.reset()
+    assert not risk.evaluate(12000.0, **book)["halted"]
+
+def count_calls(function, *args, **kwargs) -> int:
+    """Count Python and builtin function calls made while running function."""
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event in ("call", "c_call"):
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        function(*args, **kwargs)
+    finally:
+        sys.setprofile(None)
+    return calls
+
+def test_hundreds_of_positions_per_tick():
+    """The work per tick is a fixed number of array operations, whatever the book size."""
+    risk = RiskManager()
+    small, large = random_book(5), random_book(500)
+    risk.evaluate(10000.0, **large)  # Warm up lazy imports
+    assert count_calls(risk.evaluate, 10000.0, **large) == count_calls(risk.evaluate, 10000.0, **small)
@@ -0,0 +1,76 @@
+import asyncio
+import pandas as pd
+from scheduler import TrackingScheduler
+from strategies.momentum_strategy import MomentumStrategy
+from tracker import Tracker
+
+class FakeFetcher:
+    """Fetcher that records how many calls overlap."""
+
+    def __init__(self, age_seconds: float = 0):
+        self.age_seconds = age_seconds
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def get_data(self, token_address):
+        self.active += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        timestamp = pd.Timestamp.now() - pd.Timedelta(seconds=self.age_seconds)
+        return pd.DataFrame({"close": [1.0], "volume": [100.0]}, index=[timestamp])
+
+def test_concurrency_is_bounded():
+    """Polls across many tokens never exceed the concurrency limit."""
+    async def run():
+        fetcher = FakeFetcher()
+        scheduler = TrackingScheduler(Tracker(fetcher), max_concurrency=3, min_interval=0.01, max_interval=0.02)
+        for i in range(20):
+            scheduler.track(f"token{i}", [MomentumStrategy()], duration_hours=0.2 / 3600)
+        await asyncio.gather(*scheduler.tasks.values())
+        return fetcher, scheduler
+
+    fetcher, scheduler = asyncio.run(run())
+    assert 1 < fetcher.peak <= 3
+    assert len(scheduler.results) == 20 and not scheduler.tasks
+
+def test_dead_token_stops_tracking():
+    """A token flagged dead finishes after its first poll."""
+    async def run():
+        fetcher = FakeFetcher(age_seconds=7200)
+        scheduler = TrackingScheduler(Tracker(fetcher), min_interval=0.01, max_interval=0.01)
+        await scheduler.track("dead", [MomentumStrategy()], duration_hours=1)
+        return fetcher
+
+    assert asyncio.run(run()).calls == 1
+
+def test_cancel_and_shutdown():
+    """Tracking tasks can be cancelled individually or all at once."""
+    async def run():
+        scheduler = TrackingScheduler(Tracker(FakeFetcher()), min_interval=0.01, max_interval=0.01)
+        first = scheduler.track("a", [MomentumStrategy()], duration_hours=1)
+        scheduler.track("b", [MomentumStrategy()], duration_hours=1)
+        assert scheduler.track("a", [], duration_hours=1) is first
+        await asyncio.sleep(0.05)
+        scheduler.cancel("a")
+        await asyncio.sleep(0)
+        await scheduler.shutdown()
+        return first, scheduler
+
+    first, scheduler = asyncio.run(run())
+    assert first.cancelled() and not scheduler.tasks
+
+def test_results_are_bounded():
+    """Only the most recently finished tokens keep their results."""
+    async def run():
+        scheduler = TrackingScheduler(Tracker(FakeFetcher(age_seconds=7200)), min_interval=0.01, max_interval=0.01,
+                                      max_results=5)
+        tasks = [scheduler.track(f"token{i}", [MomentumStrategy()], duration_hours=1) for i in range(20)]
+        results = await asyncio.gather(*tasks)
+        return scheduler, results
+
+    scheduler, results = asyncio.run(run())
+    assert len(scheduler.results) == 5
+    assert results == [[]] * 20
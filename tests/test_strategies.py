@@ -1,6 +1,14 @@
 import pytest
+import numpy as np
 import pandas as pd
+from strategies.base import SignalCache, generate_signal_matrix, signal_cache
+from strategies.custom_strategy import CustomStrategy, ExpressionError, validate_expression
 from strategies.ma_crossover import MACrossoverStrategy
+from strategies.macd import MACDStrategy
+from strategies.ml_strategy import MLStrategy
+from strategies.momentum_strategy import MomentumStrategy
+from strategies.rsi import RSIStrategy
+from strategies.voting import VotingStrategy
 
 def test_ma_crossover_signals():
     """Test MA Crossover strategy signals."""
@@ -8,4 +16,179 @@ def test_ma_crossover_signals():
     strategy = MACrossoverStrategy(short_period=2, long_period=5)
     signals = strategy.generate_signals(data)
     assert len(signals) == len(data)
-    assert signals.iloc[-1] == True  # Uptrend should signal buy
\ No newline at end of file
+    assert signals.iloc[-1] == True  # Uptrend should signal buy
+
+@pytest.mark.parametrize("strategy", [
+    MACrossoverStrategy(short_period=5, long_period=20),
+    RSIStrategy(period=14, oversold=45),
+    MACDStrategy(),
+])
+def test_update_matches_generate_signals(strategy):
+    """Incremental updates reproduce the batch signals bar by bar."""
+    rng = np.random.default_rng(5)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))})
+    expected = strategy.generate_signals(data)
+    streamed = [strategy.update(bar) for _, bar in data.iterrows()]
+    assert streamed == expected.tolist()
+
+def test_momentum_update_matches_generate_signals():
+    """Momentum updates match generate_signals over the growing history."""
+    rng = np.random.default_rng(6)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.05, 60)))})
+    strategy = MomentumStrategy(lookback_period=5, threshold=0.05)
+    for i in range(len(data)):
+        streamed = strategy.update(data.iloc[i])
+        expected = strategy.generate_signals(data.iloc[:i + 1], entry_price=100.0)
+        assert streamed == expected["buy"]
+        assert strategy.exit_signal(data["close"].iloc[i], 100.0) == expected["sell"]
+
+def test_default_update_reevaluates_recent_bars():
+    """Strategies without streaming indicators still support update."""
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 150)))
+    data = pd.DataFrame({"close": close, "high": close * 1.01, "low": close * 0.99})
+    strategy = CustomStrategy("sma(5) > sma(20) and atr(14) > 0")
+    expected = strategy.generate_signals(data)
+    assert [strategy.update(bar) for _, bar in data.iterrows()] == expected.tolist()
+    bounded = CustomStrategy("sma(50) > 0")
+    bounded.update_window = 30  # Only the last 30 bars are kept, fewer than the warm-up
+    assert not any(bounded.update(bar) for _, bar in data.iterrows())
+
+def test_ml_strategy_walk_forward_and_persistence(tmp_path):
+    """Walk-forward training persists a model whose live scores match batch scores."""
+    rng = np.random.default_rng(11)
+    n = 700
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+                         "volume": rng.uniform(100, 1000, n)},
+                        index=pd.date_range("2024-01-01", periods=n, freq="min"))
+    path = str(tmp_path / "model.joblib")
+    strategy = MLStrategy(n_estimators=10, n_jobs=2, model_path=path)
+    assert strategy.features(data).dtype == np.float32
+    assert strategy.features(data) is strategy.features(data)
+    report = strategy.walk_forward(data, train_size=300, test_size=100)
+    assert len(report) == 4
+    assert report["accuracy"].between(0, 1).all()
+    signals = MLStrategy(model_path=path).generate_signals(data)
+    assert len(signals) == len(data)
+    assert not signals.iloc[:30].any()
+    live = MLStrategy(model_path=path)
+    updates = [live.update(row) for _, row in data.iloc[-100:].iterrows()]
+    assert updates[31:] == signals.iloc[-69:].tolist()
+
+def test_rl_strategy_trains_and_reloads(tmp_path):
+    """RL training happens outside the constructor and the saved model reloads."""
+    pytest.importorskip("stable_baselines3")
+    from strategies.rl_strategy import RLStrategy, TradingEnv
+    rng = np.random.default_rng(3)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200))),
+                         "volume": rng.uniform(100, 1000, 200)})
+    env = TradingEnv.from_data(data)
+    assert env.reset().dtype == np.float32
+    path = str(tmp_path / "dqn.zip")
+    strategy = RLStrategy(model_path=path, n_envs=2)
+    assert not strategy.generate_signals(data).any()
+    strategy.train(data, total_timesteps=200)
+    signals = RLStrategy(model_path=path).generate_signals(data)
+    assert len(signals) == len(data)
+    assert signals.tolist() == strategy.generate_signals(data).tolist()
+
+def test_adaptive_voting_update_matches_generate_signals():
+    """Weighted adaptive votes agree between batch and streaming evaluation."""
+    rng = np.random.default_rng(8)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))})
+    def components():
+        return [MACrossoverStrategy(short_period=5, long_period=20), RSIStrategy(oversold=45), MACDStrategy()]
+    batch = VotingStrategy(components(), weights=[2, 1, 1], adaptive=True, window=20, threshold=0.4)
+    live = VotingStrategy(components(), weights=[2, 1, 1], adaptive=True, window=20, threshold=0.4)
+    expected = batch.generate_signals(data)
+    assert [live.update(bar) for _, bar in data.iterrows()] == expected.tolist()
+    assert expected.any() and not expected.all()
+
+def test_voting_zero_weights():
+    """All-zero weights are rejected; adaptive weights that vanish fall back to equal weights."""
+    with pytest.raises(ValueError):
+        VotingStrategy(weights=[0, 0, 0])
+    rng = np.random.default_rng(14)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200)))})
+    adaptive = VotingStrategy(adaptive=True)
+    adaptive.hit_rate_weights = lambda buy, close: np.zeros(buy.shape)
+    assert adaptive.generate_signals(data).tolist() == VotingStrategy().generate_signals(data).tolist()
+
+def test_component_signals_are_shared():
+    """Identical components on the same bars are computed once."""
+    rng = np.random.default_rng(9)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))})
+    signal_cache.clear()
+    VotingStrategy().generate_signals(data)
+    misses = signal_cache.misses
+    VotingStrategy(weights=[1, 2, 3], adaptive=True).generate_signals(data)
+    assert signal_cache.misses == misses
+    VotingStrategy([RSIStrategy(period=7)] + VotingStrategy().strategies).generate_signals(data)
+    assert signal_cache.misses == misses + 1
+
+def test_cache_key_normalises_numpy_parameters():
+    """Numpy-typed parameters are part of the key and match plain Python values."""
+    rng = np.random.default_rng(10)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))})
+    fast = MACrossoverStrategy(np.int64(5), np.int64(20))
+    slow = MACrossoverStrategy(np.int64(30), np.int64(100))
+    assert fast.cache_key() == MACrossoverStrategy(5, 20).cache_key() != slow.cache_key()
+    signal_cache.clear()
+    generate_signal_matrix(data, [fast])
+    matrix = generate_signal_matrix(data, [slow])
+    assert matrix.buy[:, 0].tolist() == MACrossoverStrategy(30, 100).generate_signals(data).tolist()
+
+def test_signal_cache_is_bounded_by_bytes():
+    rng = np.random.default_rng(11)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 1000)))})
+    cache = SignalCache(max_bytes=3 * 6000)
+    for period in range(2, 10):
+        generate_signal_matrix(data, [RSIStrategy(period=period)], cache=cache)
+    assert cache.nbytes <= cache.max_bytes and len(cache._entries) == 3
+
+def test_custom_expression_matches_hand_written():
+    """Compiled expressions reproduce equivalent hand-written strategies."""
+    rng = np.random.default_rng(12)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+    data = pd.DataFrame({"close": close, "high": close * 1.01, "low": close * 0.99})
+    custom = CustomStrategy("sma(5) > sma(20)").generate_signals(data)
+    assert custom.tolist() == MACrossoverStrategy(5, 20).generate_signals(data).tolist()
+    rsi = RSIStrategy(oversold=45).generate_signals(data)
+    assert CustomStrategy("rsi(14) < 45").generate_signals(data).tolist() == rsi.tolist()
+    both = CustomStrategy("rsi(14) < 45 and not (sma(5) <= sma(20)) or atr(14) / close > 1")
+    assert both.generate_signals(data).tolist() == (custom & rsi).tolist()
+
+@pytest.mark.parametrize("expression", ["not (sma(50) > close)", "close > 0 or not (sma(50) > close)"])
+def test_custom_expression_false_during_warm_up(expression):
+    """Negating or or-ing an undefined indicator never produces signals."""
+    rng = np.random.default_rng(13)
+    data = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))})
+    signals = CustomStrategy(expression).generate_signals(data)
+    assert not signals.iloc[:49].any()
+    assert signals.iloc[49:].any()
+
+def test_custom_expression_shares_subexpressions():
+    program = CustomStrategy("sma(10) > sma(50) and close > sma(10) and 30 < rsi(14) < 70")._program
+    indicators = [step for step in program.steps if step[0] == "indicator"]
+    assert len(indicators) == 3
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('echo hi')",
+    "close.__class__",
+    "open('x')",
+    "sma(10)",
+    "sma(period=10) > 1",
+    "sma(0) > 1",
+    "rsi(14) < 30 and",
+    "lambda: 1",
+    "[x for x in close]",
+    "sma(10.5) > 1",
+    "rsi(1) < 30",
+    "highest(1) > close",
+    "macd(1, 26, 9) > 0",
+    "rsi(14) and close > 1",
+])
+def test_custom_expression_rejects_invalid(expression):
+    assert validate_expression(expression) is not None
+    with pytest.raises(ExpressionError):
+        CustomStrategy(expression)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from stresstesting import SCENARIOS, StressTester, bootstrap, flash_crash, rug_pull, vol_regime
+from strategies.momentum_strategy import MomentumStrategy
+
+def make_prices(n: int = 300) -> pd.DataFrame:
+    """Build a random-walk price frame."""
+    rng = np.random.default_rng(5)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    index = pd.date_range("2024-01-01", periods=n, freq="min")
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+                         "volume": rng.uniform(100, 1000, n)}, index=index)
+
+@pytest.mark.parametrize("generator", [bootstrap, rug_pull, flash_crash, vol_regime])
+def test_generators_shape(generator):
+    close = make_prices()["close"].to_numpy()
+    factors, volume = generator(close, np.random.default_rng(0), 20)
+    assert factors.shape == volume.shape == (20, len(close))
+    assert (factors > 0).all()
+    assert np.allclose(factors[:, 0], 1)  # Every path starts from the real first bar
+
+def test_rug_pull_never_recovers():
+    close = make_prices()["close"].to_numpy()
+    factors, volume = rug_pull(close, np.random.default_rng(1), 50)
+    assert (factors[:, -1] <= 0.2 + 1e-9).all()
+    assert (volume[:, -1] < 0.2 + 1e-9).all()
+
+def test_run_distributions_are_reproducible():
+    tester = StressTester(max_workers=2, paths_per_task=7, stop_drawdown=0.01)
+    data = make_prices()
+    strategy = MomentumStrategy(lookback_period=3, threshold=0.01)
+    results = tester.run(data, strategy, n_paths=20, seed=42)
+    assert len(results) == 20 * len(SCENARIOS)
+    assert (results.groupby("scenario").size() == 20).all()
+    assert (results["max_drawdown"] >= 0).all()
+    pd.testing.assert_frame_equal(results, tester.run(data, strategy, n_paths=20, seed=42))
+    summary = tester.summarize(results)
+    assert set(summary.index) == set(SCENARIOS)
+    assert (summary["cvar"] >= summary["var"] - 1e-9).all()
+    assert summary.loc["rug_pull", "median_pnl"] < summary.loc["bootstrap", "median_pnl"]
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from ui.app import app
+
+class TestBuilder(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_validate(self):
+        response = self.client.post("/builder/validate", json={"expression": "rsi(14) < 30 and sma(10) > sma(50)"})
+        self.assertEqual(response.get_json(), {"valid": True, "error": None})
+        response = self.client.post("/builder/validate", json={"expression": "exec('1')"})
+        self.assertFalse(response.get_json()["valid"])
+        self.assertIn("exec", response.get_json()["error"])
+
+    def test_backtest_rejects_invalid_expression(self):
+        response = self.client.post("/builder/backtest", json={"expression": "close +", "token": "abc"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Syntax error", response.get_json()["error"])
+
+    def test_backtest_rejects_bad_input(self):
+        for body in [{"expression": "rsi(1) < 30", "token": "abc"}, {"expression": 5, "token": "abc"},
+                     {"expression": "rsi(14) < 30", "token": ["abc"]}]:
+            response = self.client.post("/builder/backtest", json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.get_json())
+
+    def test_backtest_fetch_failure(self):
+        with mock.patch("ui.app._load_bars", side_effect=OSError("network down")):
+            response = self.client.post("/builder/backtest", json={"expression": "rsi(14) < 30", "token": "abc"})
+        self.assertEqual(response.status_code, 502)
+
+    def test_backtest(self):
+        close = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, 200)))
+        bars = pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 1.0})
+
+        async def load(token):
+            return bars
+
+        with mock.patch("ui.app._load_bars", load):
+            response = self.client.post("/builder/backtest", json={"expression": "roc(1) > 0", "token": "abc"})
+        body = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body["bars"], 200)
+        self.assertEqual(body["signals"], int((np.diff(close) > 0).sum()))
+        self.assertLessEqual(body["trades"], body["signals"])
+
+if __name__ == '__main__':
+    unittest.main()
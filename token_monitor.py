@@ -5,8 +5,12 @@ from solana.publickey import PublicKey
 from config import Config
 from data.historical import HistoricalDataFetcher
 from data.realtime import RealtimeDataFetcher
+from data.subscription import LogSubscriber, WalletCursor
 from tracker import Tracker
+from scheduler import TrackingScheduler
+from dedupe import ExpiringDedupe
 from analyzer import Analyzer
+from backtesting import Backtester, BatchBacktester, INITIAL_CASH
 from analysis.sentiment import SentimentStream
 import logging
 from datetime import datetime
@@ -17,7 +21,9 @@ class TokenMonitor:
     """Monitors trusted wallets for new token purchases and tracks those tokens."""
     
     def __init__(self, config: Config, historical_fetcher: HistoricalDataFetcher, 
-                 realtime_fetcher: RealtimeDataFetcher, strategies, tracker: Tracker, analyzer: Analyzer):
+                 realtime_fetcher: RealtimeDataFetcher, strategies, tracker: Tracker, analyzer: Analyzer,
+                 track_hours: int = 24, max_concurrency: int = 50, poll_interval: float = 30,
+                 ws_url: str = None):
         """Initialize with configuration and components.
         
         Args:
@@ -27,6 +33,11 @@ class TokenMonitor:
             strategies: List of strategy instances.
             tracker: Tracker instance.
             analyzer: Analyzer instance.
+            track_hours: Maximum hours to track each new token.
+            max_concurrency: Maximum number of token polls in flight at once.
+            poll_interval: Seconds between trusted wallet polls.
+            ws_url: Solana RPC websocket URL; trusted wallets are subscribed to
+                over it instead of polled (polling only if None).
         """
         self.config = config
         self.historical_fetcher = historical_fetcher
@@ -34,9 +45,18 @@ class TokenMonitor:
         self.strategies = strategies
         self.tracker = tracker
         self.analyzer = analyzer
+        self.track_hours = track_hours
+        self.poll_interval = poll_interval
+        self.scheduler = TrackingScheduler(tracker, max_concurrency=max_concurrency)
+        self.batch_backtester = BatchBacktester(max_workers=1)  # One token at a time, in-process
         self.solana_client = AsyncClient(self.config.SOLANA_RPC_URL)
-        self.last_signatures = {wallet: None for wallet in self.config.TRUSTED_WALLETS}
+        self.cursor = WalletCursor(self.config.TRUSTED_WALLETS)
+        self.subscriber = LogSubscriber(ws_url, self.config.TRUSTED_WALLETS, self.handle_signature,
+                                        self.fetch_wallet_transactions, max_delay=poll_interval) if ws_url else None
         self.tracked_tokens = set()
+        # Every wallet that bought a token reports it; act on each signature and mint once
+        self.seen_signatures = ExpiringDedupe(ttl=3600)
+        self.seen_mints = ExpiringDedupe(ttl=track_hours * 3600, max_size=10000)
         self.active_positions = []
         self.sentiment_stream = SentimentStream(config, self.tracked_tokens)
         self.stream_thread = threading.Thread(target=self.sentiment_stream.filter)
@@ -44,5 +64,125 @@ class TokenMonitor:
     
     async def run(self):
         """Run the token monitor."""
+        retry = asyncio.create_task(self.retry_failed())
+        try:
+            if self.subscriber:
+                await self.subscriber.run()
+            while True:
+                await self.fetch_wallet_transactions()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            retry.cancel()
+            await self.scheduler.shutdown()
+    
+    async def retry_failed(self):
+        """Periodically retry signatures whose handling failed."""
         while True:
-            await self.fetch_wallet
\ No newline at end of file
+            await asyncio.sleep(self.poll_interval)
+            if self.cursor.failed:
+                await self.cursor.retry(self.check_transaction)
+    
+    async def fetch_wallet_transactions(self):
+        """Check trusted wallets for new signatures and handle any new tokens."""
+        for wallet in self.config.TRUSTED_WALLETS:
+            try:
+                response = await self.solana_client.get_signatures_for_address(
+                    PublicKey(wallet), until=self.cursor.signatures[wallet], limit=20)
+                signatures = response["result"]
+            except Exception as e:
+                logger.error("Failed to fetch transactions for wallet %s: %s", wallet, e)
+                continue
+            for sig in reversed(signatures):  # Oldest first, so the cursor moves forward
+                await self.cursor.process(self.check_transaction, wallet, sig["signature"], sig.get("slot"))
+    
+    async def handle_signature(self, wallet: str, signature: str, slot: int = None):
+        """Handle a pushed transaction notification for a trusted wallet.
+        
+        Failures are kept for retry_failed, and the polling cursor never moves
+        back to an older slot.
+        
+        Args:
+            wallet: Trusted wallet address.
+            signature: Transaction signature.
+            slot: Slot of the transaction.
+        """
+        await self.cursor.process(self.check_transaction, wallet, signature, slot)
+    
+    async def check_transaction(self, wallet: str, signature: str):
+        """Fetch a wallet transaction and start tracking any token it bought.
+        
+        Args:
+            wallet: Trusted wallet address.
+            signature: Transaction signature.
+        """
+        if signature in self.seen_signatures:
+            return
+        tx = await self.solana_client.get_transaction(signature)
+        token_address = self.extract_token_purchase(tx, wallet)
+        if token_address and self.seen_mints.add(token_address):
+            try:
+                await self.handle_new_token(token_address)
+            except Exception:
+                self.seen_mints.discard(token_address)  # Let a retry of the signature handle it
+                raise
+        # Mark the signature seen only once processed, so transient errors are retried
+        self.seen_signatures.add(signature)
+    
+    def extract_token_purchase(self, tx: dict, wallet: str) -> str:
+        """Return the mint a wallet received in a transaction, if any.
+        
+        Args:
+            tx: get_transaction response.
+            wallet: Trusted wallet address.
+        
+        Returns:
+            Token mint address, or None if the wallet's balance of no token increased.
+        """
+        result = tx.get("result")
+        if not result or result["meta"].get("err"):
+            return None
+        pre = {(b["mint"], b.get("owner")): b["uiTokenAmount"]["uiAmount"] or 0
+               for b in result["meta"].get("preTokenBalances", [])}
+        for balance in result["meta"].get("postTokenBalances", []):
+            if balance.get("owner") != wallet:
+                continue
+            amount = balance["uiTokenAmount"]["uiAmount"] or 0
+            if amount > pre.get((balance["mint"], wallet), 0):
+                return balance["mint"]
+        return None
+    
+    async def handle_new_token(self, token_address: str):
+        """Backtest a newly bought token and start tracking it.
+        
+        The token stays in tracked_tokens only while it is being tracked.
+        
+        Args:
+            token_address: Token mint address.
+        """
+        self.tracked_tokens.add(token_address)
+        logger.info("New token %s detected at %s", token_address, datetime.now())
+        historical_data = await self.historical_fetcher.get_bars(token_address)
+        if historical_data.empty:
+            logger.warning("No historical data for token %s", token_address)
+            self.tracked_tokens.discard(token_address)
+            return
+        scores = await asyncio.to_thread(self.batch_backtester.run, {token_address: historical_data}, self.strategies)
+        for row in scores.itertuples():
+            logger.info("Backtest profit for %s with %s: $%.2f", token_address, row.strategy, row.profit)
+        task = self.scheduler.track(token_address, self.strategies, self.track_hours)
+        task.add_done_callback(lambda _: self.tracked_tokens.discard(token_address))
+    
+    async def backtest_token(self, token_address: str, data, strategy) -> float:
+        """Backtest a strategy on a token's history.
+        
+        Args:
+            token_address: Token mint address.
+            data: DataFrame with historical data.
+            strategy: Strategy instance.
+        
+        Returns:
+            Profit over the initial cash.
+        """
+        results = await asyncio.to_thread(Backtester(engine="vector").run, data, strategy)
+        logger.debug("Backtested %s: %s", token_address, results["final_value"])
+        return results["final_value"] - INITIAL_CASH
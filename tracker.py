@@ -1,5 +1,9 @@
+import copy
+import numpy as np
 import pandas as pd
-from data.realtime import RealtimeDataFetcher
+from data.realtime import RealtimeDataFetcher, PriceBatcher
+from data.buffer import PriceBuffer
+from analysis.streaming import StreamingSMA
 import asyncio
 import logging
 import time
@@ -9,19 +13,25 @@ logger = logging.getLogger(__name__)
 class Tracker:
     """Tracks tokens in real-time and determines when they are 'dead'."""
     
-    def __init__(self, data_fetcher: RealtimeDataFetcher):
+    def __init__(self, data_fetcher: RealtimeDataFetcher, history_size: int = 1440,
+                 price_batcher: PriceBatcher = None):
         """Initialize with a real-time data fetcher.
         
         Args:
             data_fetcher: Instance of RealtimeDataFetcher.
+            history_size: Number of bars kept per tracked token.
+            price_batcher: Shares bulk price requests across tracked tokens (optional).
         """
         self.data_fetcher = data_fetcher
+        self.history_size = history_size
+        self.price_batcher = price_batcher
     
-    def is_token_dead(self, data: pd.DataFrame) -> bool:
+    def is_token_dead(self, data: pd.DataFrame, volume_ma: float = None) -> bool:
         """Determine if the token is 'dead' based on activity and volume.
         
         Args:
-            data: DataFrame with recent token data.
+            data: DataFrame or PriceBuffer with recent token data.
+            volume_ma: Precomputed 24-bar volume mean (computed from data if None).
         
         Returns:
             True if the token is considered dead, False otherwise.
@@ -30,43 +40,74 @@ class Tracker:
             return True
         last_timestamp = data.index[-1]
         no_activity = (pd.Timestamp.now() - last_timestamp).total_seconds() > 3600
-        volume_ma = data['volume'].rolling(window=24).mean().iloc[-1]
+        if volume_ma is None:
+            volume_ma = np.asarray(data['volume'])[-24:].mean() if len(data) >= 24 else np.nan
         low_volume = volume_ma < 10
-        price_change = (data['close'].iloc[-1] - data['close'].iloc[-24]) / data['close'].iloc[-24] if len(data) >= 24 else 0
+        close = np.asarray(data['close'])
+        price_change = (close[-1] - close[-24]) / close[-24] if len(data) >= 24 else 0
         stable_price = abs(price_change) < 0.01
         return no_activity or (low_volume and stable_price)
     
-    async def track_token(self, token_address: str, strategies, duration_hours: int, entry_price: float = None):
+    async def track_token(self, token_address: str, strategies, duration_hours: int, entry_price: float = None,
+                          semaphore: asyncio.Semaphore = None, poll_interval=None):
         """Track the token and simulate trades.
         
+        Strategies are copied so their streaming indicators are private to this
+        token, then updated once per new bar.
+        
         Args:
             token_address: Token mint address.
             strategies: List of strategy instances.
             duration_hours: Maximum hours to track.
             entry_price: Entry price for tracking profit/loss (optional).
+            semaphore: Limits concurrent fetches across tracked tokens (optional).
+            poll_interval: Callable (history, volume_ma) -> seconds until the next
+                poll; polls every 60 seconds if None.
         
         Returns:
             List of trades executed during tracking.
         """
         start_time = time.time()
         trades = []
-        data_history = pd.DataFrame()
+        data_history = PriceBuffer(self.history_size)
+        strategies = [copy.deepcopy(strategy) for strategy in strategies]
+        volume_ma = StreamingSMA(24)
         while time.time() - start_time < duration_hours * 3600:
-            data = self.data_fetcher.get_data(token_address)
+            data = await self._fetch(token_address, semaphore)
             if not data.empty:
-                data_history = pd.concat([data_history, data])
+                data_history.extend(data)
+                bar = data.iloc[-1]
+                volume_ma.update(bar['volume'])
+                price = bar['close']
                 for strategy in strategies:
-                    signals = strategy.generate_signals(data_history, entry_price)
-                    if signals["buy"] and not entry_price:
-                        entry_price = data['close'].iloc[-1]
+                    buy = strategy.update(bar)
+                    if buy and not entry_price:
+                        entry_price = price
                         trades.append({"time": time.time(), "action": "buy", "price": entry_price})
                         logger.info("Simulated buy for %s at $%.4f", token_address, entry_price)
-                    elif signals["sell"] and entry_price:
-                        trades.append({"time": time.time(), "action": "sell", "price": data['close'].iloc[-1]})
-                        logger.info("Simulated sell for %s at $%.4f", token_address, data['close'].iloc[-1])
+                    elif entry_price and strategy.exit_signal(price, entry_price):
+                        trades.append({"time": time.time(), "action": "sell", "price": price})
+                        logger.info("Simulated sell for %s at $%.4f", token_address, price)
                         break
-                if self.is_token_dead(data_history):
+                if self.is_token_dead(data_history, volume_ma.value):
                     logger.info("Token %s appears dead. Stopping tracking.", token_address)
                     break
-            await asyncio.sleep(60)
-        return trades
\ No newline at end of file
+            await asyncio.sleep(poll_interval(data_history, volume_ma.value) if poll_interval else 60)
+        return trades
+    
+    async def _fetch(self, token_address: str, semaphore: asyncio.Semaphore = None) -> pd.DataFrame:
+        """Fetch the latest bar for a token.
+        
+        The batched price lookup happens outside the semaphore so one bulk request
+        can cover every token polling in the same window.
+        """
+        args = (token_address,)
+        if self.price_batcher is not None:
+            price = await self.price_batcher.get(token_address)
+            if price is None:
+                return pd.DataFrame()
+            args += (price,)
+        if semaphore is None:
+            return await self.data_fetcher.get_data(*args)
+        async with semaphore:
+            return await self.data_fetcher.get_data(*args)
\ No newline at end of file
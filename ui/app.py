@@ -1,5 +1,11 @@
-from flask import Flask, render_template
+import asyncio
+from flask import Flask, jsonify, render_template, request
 from config import Config
+from backtesting import INITIAL_CASH, simulate
+from data.historical import HistoricalDataFetcher
+from data.transport import default_client
+from strategies.base import generate_signal_matrix
+from strategies.custom_strategy import CustomStrategy, ExpressionError, validate_expression
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +33,46 @@ def builder():
     """Render the custom strategy builder page."""
     return render_template("builder.html")
 
+@app.route("/builder/validate", methods=["POST"])
+def validate_strategy():
+    """Check a strategy expression and report the first error."""
+    expression = (request.get_json(silent=True) or {}).get("expression", "")
+    error = validate_expression(expression)
+    return jsonify({"valid": error is None, "error": error})
+
+@app.route("/builder/backtest", methods=["POST"])
+def backtest_strategy():
+    """Backtest a strategy expression on a token's history."""
+    body = request.get_json(silent=True) or {}
+    try:
+        strategy = CustomStrategy(body.get("expression", ""))
+    except ExpressionError as e:
+        return jsonify({"error": str(e)}), 400
+    token = body.get("token")
+    if not token or not isinstance(token, str):
+        return jsonify({"error": "A token address is required"}), 400
+    try:
+        data = asyncio.run(_load_bars(token))
+    except Exception as e:
+        logger.error("Failed to load history for %s: %s", token, e)
+        return jsonify({"error": "Could not fetch history for token %s" % token}), 502
+    if data.empty:
+        return jsonify({"error": "No historical data for token %s" % token}), 404
+    try:
+        matrix = generate_signal_matrix(data, [strategy])
+    except ExpressionError as e:  # E.g., the data lacks a series the expression uses
+        return jsonify({"error": str(e)}), 400
+    result = simulate(matrix.buy[:, 0], data, matrix.size[:, 0])
+    return jsonify({"final_value": result["final_value"], "profit": result["final_value"] - INITIAL_CASH,
+                    "signals": int(matrix.buy.sum()), "trades": result["trades"], "bars": len(data)})
+
+async def _load_bars(token: str):
+    http = default_client()
+    try:
+        return await HistoricalDataFetcher(Config(), http).get_bars(token)
+    finally:
+        await http.close()
+
 @app.route("/social")
 def social():
     """Render the social trading page."""
@@ -0,0 +1,26 @@
+function postJSON(url, body) {
+    return fetch(url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(body)
+    }).then(response => response.json());
+}
+
+const expression = document.getElementById("expression");
+const result = document.getElementById("result");
+
+expression.addEventListener("input", () => {
+    postJSON("/builder/validate", { expression: expression.value }).then(body => {
+        result.textContent = body.valid ? "" : body.error;
+    });
+});
+
+document.getElementById("builder").addEventListener("submit", event => {
+    event.preventDefault();
+    result.textContent = "Backtesting...";
+    const token = document.getElementById("token").value;
+    postJSON("/builder/backtest", { expression: expression.value, token: token }).then(body => {
+        result.textContent = body.error ? body.error :
+            `Profit $${body.profit.toFixed(2)} from ${body.trades} trades (${body.signals} signals) over ${body.bars} bars`;
+    });
+});